@@ -0,0 +1,42 @@
+"""Add job_analyses table for cached ATS analysis
+
+Revision ID: 002_job_analyses
+Revises: 001_followup_override
+Create Date: 2025-10-14 10:00:00.000000
+
+Stores ATS job-description analyses keyed by (content hash, analyzer version)
+so job detail reads no longer re-run spaCy on every request.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '002_job_analyses'
+down_revision = '001_followup_override'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create job_analyses table"""
+    op.create_table(
+        'job_analyses',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('content_hash', sa.String(64), nullable=False),
+        sa.Column('analyzer_version', sa.String(20), nullable=False),
+        sa.Column('analysis', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now()),
+    )
+    op.create_index(
+        'idx_job_analysis_hash_version',
+        'job_analyses',
+        ['content_hash', 'analyzer_version'],
+        unique=True
+    )
+
+
+def downgrade():
+    """Drop job_analyses table"""
+    op.drop_index('idx_job_analysis_hash_version', table_name='job_analyses')
+    op.drop_table('job_analyses')
@@ -0,0 +1,38 @@
+"""Add skills table and packed skill ID arrays on jobs
+
+Revision ID: 003_skill_ids
+Revises: 002_job_analyses
+Create Date: 2025-10-16 10:00:00.000000
+
+Canonical skills get stable integer IDs; each job stores its required
+skills as a sorted uint32 array next to its keywords.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '003_skill_ids'
+down_revision = '002_job_analyses'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create skills table and add the skill ID column to jobs"""
+    op.create_table(
+        'skills',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('name', sa.String(255), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now()),
+    )
+    op.create_index('idx_skill_name', 'skills', ['name'], unique=True)
+
+    op.add_column('jobs', sa.Column('skill_ids', sa.LargeBinary(), nullable=True))
+
+
+def downgrade():
+    """Drop the skill ID column and skills table"""
+    op.drop_column('jobs', 'skill_ids')
+    op.drop_index('idx_skill_name', table_name='skills')
+    op.drop_table('skills')
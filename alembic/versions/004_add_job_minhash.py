@@ -0,0 +1,29 @@
+"""Add MinHash signature column to jobs
+
+Revision ID: 004_job_minhash
+Revises: 003_skill_ids
+Create Date: 2025-10-16 14:00:00.000000
+
+Stores each job description's MinHash signature so the near-duplicate
+index can be loaded without re-shingling every description. Rows left
+NULL here are backfilled the first time the index loads.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '004_job_minhash'
+down_revision = '003_skill_ids'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add jobs.minhash"""
+    op.add_column('jobs', sa.Column('minhash', sa.LargeBinary(), nullable=True))
+
+
+def downgrade():
+    """Drop jobs.minhash"""
+    op.drop_column('jobs', 'minhash')
@@ -0,0 +1,34 @@
+"""Add system_state key/value table
+
+Revision ID: 005_system_state
+Revises: 004_job_minhash
+Create Date: 2025-10-17 09:00:00.000000
+
+Generic JSON key/value table for state that has to survive restarts,
+starting with the Gmail history checkpoint used by incremental inbox sync.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '005_system_state'
+down_revision = '004_job_minhash'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create system_state"""
+    op.create_table(
+        'system_state',
+        sa.Column('key', sa.String(length=100), nullable=False),
+        sa.Column('value', sa.JSON(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('key')
+    )
+
+
+def downgrade():
+    """Drop system_state"""
+    op.drop_table('system_state')
@@ -0,0 +1,36 @@
+"""Add label to email_tracking
+
+Revision ID: 006_email_label
+Revises: 005_system_state
+Create Date: 2025-10-18 09:00:00.000000
+
+User-confirmed classification per tracked email. Labeled rows are the
+training set for the email response classifier; classification keeps
+holding whatever the scan decided.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '006_email_label'
+down_revision = '005_system_state'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add label column to email_tracking"""
+    op.add_column(
+        'email_tracking',
+        sa.Column(
+            'label',
+            sa.Enum('INTERVIEW', 'REJECTION', 'INFO_REQUEST', 'OFFER', 'OTHER', name='responsetype'),
+            nullable=True
+        )
+    )
+
+
+def downgrade():
+    """Remove label column from email_tracking"""
+    op.drop_column('email_tracking', 'label')
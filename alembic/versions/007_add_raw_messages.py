@@ -0,0 +1,39 @@
+"""Add raw_messages store
+
+Revision ID: 007_raw_messages
+Revises: 006_email_label
+Create Date: 2025-10-18 14:00:00.000000
+
+Compressed Gmail message resources keyed by gmail_id, so emails can be
+parsed, classified and matched again without refetching them. Only the
+first 5,000 characters of a body are kept in email_tracking.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '007_raw_messages'
+down_revision = '006_email_label'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create raw_messages"""
+    op.create_table(
+        'raw_messages',
+        sa.Column('gmail_id', sa.String(length=255), nullable=False),
+        sa.Column('thread_id', sa.String(length=255), nullable=True),
+        sa.Column('format', sa.String(length=20), nullable=False),
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('raw_size', sa.Integer(), nullable=True),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.Column('stored_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('gmail_id')
+    )
+
+
+def downgrade():
+    """Drop raw_messages"""
+    op.drop_table('raw_messages')
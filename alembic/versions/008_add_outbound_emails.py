@@ -0,0 +1,55 @@
+"""Add outbound_emails outbox
+
+Revision ID: 008_outbound_emails
+Revises: 007_raw_messages
+Create Date: 2025-10-18 18:00:00.000000
+
+Durable queue for outgoing email. Follow-ups are written here and sent by
+an async worker with rate limiting and retries; the unique idempotency key
+keeps a follow-up from being queued (and sent) twice.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '008_outbound_emails'
+down_revision = '007_raw_messages'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create outbound_emails"""
+    op.create_table(
+        'outbound_emails',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('idempotency_key', sa.String(length=255), nullable=False),
+        sa.Column('kind', sa.String(length=50), nullable=True),
+        sa.Column('application_id', sa.Integer(), nullable=True),
+        sa.Column('to_address', sa.String(length=255), nullable=False),
+        sa.Column('subject', sa.String(length=500), nullable=True),
+        sa.Column('body', sa.Text(), nullable=True),
+        sa.Column('thread_id', sa.String(length=255), nullable=True),
+        sa.Column(
+            'status',
+            sa.Enum('PENDING', 'SENDING', 'SENT', 'FAILED', name='outboxstatus'),
+            nullable=False
+        ),
+        sa.Column('attempts', sa.Integer(), nullable=True),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('gmail_message_id', sa.String(length=255), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['application_id'], ['applications.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('idempotency_key')
+    )
+    op.create_index('idx_outbox_due', 'outbound_emails', ['status', 'next_attempt_at'])
+
+
+def downgrade():
+    """Drop outbound_emails"""
+    op.drop_index('idx_outbox_due', table_name='outbound_emails')
+    op.drop_table('outbound_emails')
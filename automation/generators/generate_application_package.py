@@ -17,6 +17,10 @@ import json
 
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
+# Repository root, for the shared phrase matcher
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from backend.core.phrase_matcher import PhraseMatcher
 
 
 class ApplicationPackageGenerator:
@@ -34,6 +38,12 @@ class ApplicationPackageGenerator:
         # Load configuration
         self.config = self.load_config()
 
+        # All skill dictionaries compiled once, labelled with (category, skill)
+        self.skills_matcher = PhraseMatcher()
+        for category, skills in self.config['skills_categories'].items():
+            for skill in skills:
+                self.skills_matcher.add(skill, (category, skill))
+
     def load_config(self) -> Dict:
         """Load generator configuration"""
         config_path = Path(__file__).parent.parent.parent / 'config/generator_config.json'
@@ -90,11 +100,12 @@ class ApplicationPackageGenerator:
         # Convert to lowercase for analysis
         desc_lower = job_description.lower()
 
-        # Extract skills from each category
+        # Extract skills from each category (one pass over the description)
+        found = self.skills_matcher.labels(desc_lower)
         for category, skills in self.config['skills_categories'].items():
             found_skills = []
             for skill in skills:
-                if skill.lower() in desc_lower:
+                if (category, skill) in found:
                     found_skills.append(skill)
                     analysis['skills_required'].append(skill)
 
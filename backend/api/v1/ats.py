@@ -2,19 +2,44 @@
 ATS Optimization API endpoints
 """
 
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
 from fastapi.responses import FileResponse
-from typing import Dict, Any, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Any, Optional, List
 import tempfile
+import time
+import uuid
 import os
 from pathlib import Path
+from pydantic import BaseModel, Field
 
+from backend.models.models import Job
+from backend.services.analysis_cache import job_analysis_cache
 from backend.services.ats_optimizer import ats_optimizer
+from backend.services.job_ranker import job_ranker
+from backend.services.resume_cache import resume_cache
+from backend.services.ats_executor import ats_executor, ATSBusyError
+from backend.core.database import get_db
+from backend.core.config import settings
 from backend.core.logging import get_logger
 
 logger = get_logger(__name__)
 router = APIRouter()
 
+class BatchAnalyzeRequest(BaseModel):
+    descriptions: List[str] = Field(..., min_length=1)
+    n_process: Optional[int] = Field(default=None, ge=1)
+    batch_size: Optional[int] = Field(default=None, ge=1)
+
+@router.get("/status")
+async def get_ats_status() -> Dict[str, Any]:
+    """Report whether the ATS models are loaded and how long loading took"""
+    return {
+        **ats_optimizer.get_load_status(),
+        "workers": ats_executor.get_stats(),
+        "resume_cache": resume_cache.get_stats()
+    }
+
 @router.post("/analyze-job")
 async def analyze_job_description(
     job_description: str = Form(...)
@@ -24,7 +49,7 @@ async def analyze_job_description(
     This is the foundation for ATS optimization
     """
     try:
-        analysis = ats_optimizer.analyze_job_description(job_description)
+        analysis = await ats_executor.analyze_job(job_description)
 
         return {
             "status": "success",
@@ -34,10 +59,46 @@ async def analyze_job_description(
             "message": f"Found {len(analysis['keywords'])} keywords and {len(analysis['required_skills'])} required skills"
         }
 
+    except ATSBusyError:
+        raise
     except Exception as e:
         logger.error(f"Job analysis failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/analyze-batch")
+async def analyze_job_descriptions_batch(
+    request: BatchAnalyzeRequest
+) -> Dict[str, Any]:
+    """
+    Analyze many job descriptions in a single batched spaCy pass
+    Used for re-scoring the whole job backlog instead of one call per job
+    """
+    if len(request.descriptions) > settings.ATS_MAX_BATCH_DESCRIPTIONS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large (max {settings.ATS_MAX_BATCH_DESCRIPTIONS} descriptions)"
+        )
+
+    try:
+        analyses = await ats_executor.analyze_many(
+            request.descriptions,
+            n_process=request.n_process,
+            batch_size=request.batch_size
+        )
+
+        return {
+            "status": "success",
+            "count": len(analyses),
+            "analyses": analyses,
+            "message": f"Analyzed {len(analyses)} job descriptions"
+        }
+
+    except ATSBusyError:
+        raise
+    except Exception as e:
+        logger.error(f"Batch job analysis failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/optimize-resume")
 async def optimize_resume(
     resume_file: UploadFile = File(...),
@@ -48,27 +109,25 @@ async def optimize_resume(
     Returns ATS score and recommendations
     """
     try:
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=resume_file.filename) as tmp:
-            content = await resume_file.read()
-            tmp.write(content)
-            tmp_path = tmp.name
+        # Parsed once per distinct file, then served from the resume cache
+        content = await resume_file.read()
+        parsed_resume = await resume_cache.get_or_parse(content, resume_file.filename)
 
         # Analyze job description
-        job_analysis = ats_optimizer.analyze_job_description(job_description)
+        job_analysis = await ats_executor.analyze_job(job_description)
 
         # Optimize resume
-        optimization_report = ats_optimizer.optimize_resume(
-            tmp_path,
-            job_analysis
+        optimization_report = await ats_executor.optimize_resume(
+            resume_file.filename,
+            job_analysis,
+            parsed_resume
         )
 
-        # Clean up temp file
-        os.unlink(tmp_path)
-
         return {
             "status": "success",
             "current_score": optimization_report['current_score'],
+            "optimized_score": optimization_report['optimized_score'],
+            "best_edit": optimization_report['best_edit'],
             "missing_keywords": optimization_report['missing_keywords'][:10],
             "recommendations": optimization_report['recommendations'],
             "keyword_density": optimization_report['keyword_density'],
@@ -76,10 +135,10 @@ async def optimize_resume(
             "message": f"Current ATS score: {optimization_report['current_score']}/100"
         }
 
+    except ATSBusyError:
+        raise
     except Exception as e:
         logger.error(f"Resume optimization failed: {e}")
-        if 'tmp_path' in locals():
-            os.unlink(tmp_path)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/generate-optimized")
@@ -92,22 +151,22 @@ async def generate_optimized_resume(
     Returns downloadable optimized resume
     """
     try:
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=resume_file.filename) as tmp:
-            content = await resume_file.read()
-            tmp.write(content)
-            tmp_path = tmp.name
+        content = await resume_file.read()
+        parsed_resume = await resume_cache.get_or_parse(content, resume_file.filename)
 
         # Generate output path
-        output_path = tmp_path.replace('.', '_optimized.')
+        output_path = str(
+            Path(tempfile.gettempdir()) / f"{uuid.uuid4().hex}_optimized_{Path(resume_file.filename).name}"
+        )
 
         # Analyze job description
-        job_analysis = ats_optimizer.analyze_job_description(job_description)
+        job_analysis = await ats_executor.analyze_job(job_description)
 
         # Create optimized resume
-        optimization_report = ats_optimizer.optimize_resume(
-            tmp_path,
+        optimization_report = await ats_executor.optimize_resume(
+            resume_file.filename,
             job_analysis,
+            parsed_resume,
             output_path
         )
 
@@ -122,10 +181,10 @@ async def generate_optimized_resume(
             filename=f"optimized_{resume_file.filename}"
         )
 
+    except ATSBusyError:
+        raise
     except Exception as e:
         logger.error(f"Resume generation failed: {e}")
-        if 'tmp_path' in locals():
-            os.unlink(tmp_path)
         if 'output_path' in locals() and Path(output_path).exists():
             os.unlink(output_path)
         raise HTTPException(status_code=500, detail=str(e))
@@ -133,37 +192,78 @@ async def generate_optimized_resume(
 @router.post("/score")
 async def calculate_ats_score(
     resume_file: UploadFile = File(...),
-    job_description: str = Form(...)
+    job_description: Optional[str] = Form(None),
+    job_id: Optional[int] = Form(None),
+    db: AsyncSession = Depends(get_db)
 ) -> Dict[str, Any]:
     """
     Calculate ATS compatibility score for resume
+    Against a stored job (job_id, matched on its skill ID array) or a pasted job_description
     """
-    try:
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=resume_file.filename) as tmp:
-            content = await resume_file.read()
-            tmp.write(content)
-            tmp_path = tmp.name
+    if job_id is None and not job_description:
+        raise HTTPException(status_code=400, detail="Provide job_id or job_description")
 
-        # Analyze both
-        job_analysis = ats_optimizer.analyze_job_description(job_description)
-        resume_text = ats_optimizer._read_resume(tmp_path)
-        resume_analysis = ats_optimizer._analyze_resume(resume_text)
+    try:
+        # Analyze both (the resume side is cached by file content)
+        content = await resume_file.read()
+        if job_id is not None:
+            job = await db.get(Job, job_id)
+            if job is None:
+                raise HTTPException(status_code=404, detail="Job not found")
+            job_analysis = await job_analysis_cache.scoring_analysis(db, job)
+            if job_analysis is None:
+                raise HTTPException(status_code=400, detail="Job has no description to score against")
+        else:
+            job_analysis = await ats_executor.analyze_job(job_description)
+        resume_analysis = (await resume_cache.get_or_parse(content, resume_file.filename))['analysis']
 
         # Calculate score
         score = ats_optimizer._calculate_ats_score(resume_analysis, job_analysis)
 
-        # Clean up
-        os.unlink(tmp_path)
-
         return {
             "ats_score": score,
             "pass_likelihood": "High" if score >= 70 else "Medium" if score >= 50 else "Low",
             "message": f"ATS Score: {score}/100 - {'Good chance of passing' if score >= 70 else 'Needs improvement'}"
         }
 
+    except (ATSBusyError, HTTPException):
+        raise
     except Exception as e:
         logger.error(f"ATS scoring failed: {e}")
-        if 'tmp_path' in locals():
-            os.unlink(tmp_path)
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/rank-jobs")
+async def rank_jobs_for_resume(
+    resume_file: UploadFile = File(...),
+    top_k: int = Form(10),
+    db: AsyncSession = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Rank every open job against a resume in one vectorized pass
+    Returns the top_k jobs by ATS score
+    """
+    top_k = max(1, min(top_k, settings.MAX_API_PAGE_SIZE))
+
+    try:
+        content = await resume_file.read()
+        resume_analysis = (await resume_cache.get_or_parse(content, resume_file.filename))['analysis']
+
+        await job_ranker.ensure_built(db)
+
+        started = time.perf_counter()
+        ranked = job_ranker.rank(resume_analysis, top_k=top_k)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        return {
+            "status": "success",
+            "jobs_ranked": len(job_ranker.jobs),
+            "ranking_ms": round(elapsed_ms, 2),
+            "results": ranked,
+            "message": f"Ranked {len(job_ranker.jobs)} open jobs in {elapsed_ms:.1f}ms"
+        }
+
+    except ATSBusyError:
+        raise
+    except Exception as e:
+        logger.error(f"Job ranking failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
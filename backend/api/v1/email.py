@@ -2,13 +2,19 @@
 Email API endpoints - Real email automation
 """
 
+import asyncio
+
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Dict, Any, List
 from datetime import datetime, timedelta
 
 from backend.core.database import get_db
+from backend.models.models import EmailTracking, OutboundEmail, ResponseType
+from backend.services.email_classifier import email_classifier
+from backend.services.email_outbox import email_outbox
 from backend.services.email_service import email_service
+from backend.services.raw_message_store import raw_message_store
 from backend.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -18,20 +24,21 @@ router = APIRouter()
 async def scan_emails(
     background_tasks: BackgroundTasks,
     days_back: int = 30,
+    incremental: bool = True,
     db: AsyncSession = Depends(get_db)
 ) -> Dict[str, Any]:
     """
     Scan inbox for job application responses
     This endpoint triggers the email automation that eliminates manual checking
+    incremental=false ignores the sync checkpoint and rescans the last days_back days
     """
     try:
         # Run scan in background for better performance
-        results = await email_service.scan_for_job_responses(db, days_back)
+        summary = await email_service.scan_for_job_responses(db, days_back, incremental=incremental)
 
         return {
             "status": "success",
-            "emails_processed": len(results),
-            "results": results,
+            **summary,
             "message": "Email scan completed. Database updated automatically."
         }
 
@@ -63,6 +70,7 @@ async def get_recent_responses(
             "date": email.received_date.isoformat() if email.received_date else None,
             "classification": email.classification.value if email.classification else None,
             "confidence": email.confidence_score,
+            "label": email.label.value if email.label else None,
             "application_id": email.application_id,
             "action_required": email.action_required
         }
@@ -103,9 +111,91 @@ async def get_email_stats(db: AsyncSession = Depends(get_db)) -> Dict[str, Any]:
         "total_emails": total_emails,
         "classifications": classifications,
         "action_required": action_required,
+        "raw_store": await raw_message_store.get_stats(db),
         "message": "Email automation is working and tracking responses"
     }
 
+@router.post("/reprocess")
+async def reprocess_emails(db: AsyncSession = Depends(get_db)) -> Dict[str, Any]:
+    """
+    Re-run parsing, classification and application matching over every stored
+    message without contacting Gmail (e.g. after retraining the classifier)
+    """
+    try:
+        summary = await email_service.reprocess_stored(db)
+
+        return {
+            "status": "success",
+            **summary,
+            "message": "Stored emails reprocessed. Application statuses were not changed."
+        }
+
+    except Exception as e:
+        logger.error(f"Email reprocess failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.put("/{email_id}/label")
+async def label_email(
+    email_id: int,
+    label: ResponseType,
+    db: AsyncSession = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Confirm or correct an email's classification
+    Labeled emails are the training data for the email classifier
+    """
+    email = await db.get(EmailTracking, email_id)
+    if email is None:
+        raise HTTPException(status_code=404, detail="Email not found")
+
+    email.label = label
+    await db.commit()
+
+    return {
+        "id": email.id,
+        "classification": email.classification.value if email.classification else None,
+        "label": label.value
+    }
+
+@router.get("/classifier")
+async def get_classifier_status() -> Dict[str, Any]:
+    """Whether scans use the trained classifier or the keyword heuristic"""
+    # Pick up a model retrained by another worker; joblib.load blocks, so off the loop
+    await asyncio.to_thread(email_classifier.reload_if_changed)
+    return email_classifier.get_stats()
+
+@router.post("/classifier/train")
+async def train_classifier(db: AsyncSession = Depends(get_db)) -> Dict[str, Any]:
+    """Retrain the email classifier on every labeled email"""
+    try:
+        meta = await email_classifier.train_from_db(db)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "status": "success",
+        **meta,
+        "message": "Email classifier retrained; the next scan uses it."
+    }
+
+@router.get("/outbox")
+async def get_outbox_stats(db: AsyncSession = Depends(get_db)) -> Dict[str, Any]:
+    """Outgoing email queue depth, send counts, latency and throttling"""
+    return await email_outbox.get_stats(db)
+
+@router.post("/outbox/{outbox_id}/retry")
+async def retry_outbound_email(outbox_id: int, db: AsyncSession = Depends(get_db)) -> Dict[str, Any]:
+    """Put a FAILED outgoing email back in the queue"""
+    email = await db.get(OutboundEmail, outbox_id)
+    if not email:
+        raise HTTPException(status_code=404, detail="Outbound email not found")
+    if not email_outbox.requeue(email):
+        raise HTTPException(status_code=400, detail=f"Only FAILED emails can be retried (status: {email.status.value})")
+
+    await db.commit()
+    email_outbox.notify()
+    return {"id": email.id, "status": email.status.value}
+
 @router.post("/setup-gmail")
 async def setup_gmail_auth():
     """
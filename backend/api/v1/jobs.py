@@ -2,6 +2,8 @@
 Jobs API endpoints for managing job postings
 """
 
+import asyncio
+
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, or_, and_
@@ -13,11 +15,13 @@ from backend.core.database import get_db
 from backend.models.models import Job, Company, Application, Priority, ApplicationStatus
 from backend.core.logging import get_logger
 from backend.core.config import settings
-from backend.services.ats_optimizer import ATSOptimizer
+from backend.services.analysis_cache import job_analysis_cache
+from backend.services.keyword_index import keyword_index
+from backend.services.job_ranker import job_ranker
+from backend.services.job_similarity import job_similarity_index
 
 logger = get_logger(__name__)
 router = APIRouter()
-ats_optimizer = ATSOptimizer()
 
 class JobCreate(BaseModel):
     company_name: str
@@ -30,6 +34,7 @@ class JobCreate(BaseModel):
     salary_max: Optional[int] = None
     priority: Priority = Priority.MEDIUM
     auto_analyze: bool = True
+    allow_duplicate: bool = False  # Create even if a near-duplicate posting exists
 
 class JobUpdate(BaseModel):
     title: Optional[str] = None
@@ -46,8 +51,20 @@ async def create_job(
     job_data: JobCreate,
     db: AsyncSession = Depends(get_db)
 ):
-    """Create a new job posting with optional ATS analysis"""
+    """Create a new job posting with optional ATS analysis (near-duplicates are rejected with 409)"""
     try:
+        # The same posting often arrives from several boards with slightly different text
+        await job_similarity_index.ensure_loaded(db)
+        signature = await asyncio.to_thread(job_similarity_index.signature, job_data.job_description)
+        duplicate = job_similarity_index.find_duplicate(signature)
+        if duplicate and not job_data.allow_duplicate:
+            duplicate_id, similarity = duplicate
+            raise HTTPException(status_code=409, detail={
+                "message": "A near-duplicate job already exists",
+                "duplicate_of": duplicate_id,
+                "similarity": round(similarity, 3)
+            })
+
         # Check or create company
         company_result = await db.execute(
             select(Company).where(Company.name == job_data.company_name)
@@ -74,22 +91,25 @@ async def create_job(
             salary_max=job_data.salary_max,
             priority=job_data.priority,
             posted_date=datetime.now().date(),
-            status="new"                                # Fixed: use status
+            status="new",                               # Fixed: use status
+            minhash=job_similarity_index.encode(signature)
         )
 
         db.add(new_job)
         await db.commit()
         await db.refresh(new_job)
 
-        # Auto-analyze job description if requested
+        # Keep corpus-wide keyword IDF, ranking matrices and similarity buckets in step with the jobs table
+        keyword_index.add_document(new_job.job_description)
+        job_ranker.invalidate()
+        job_similarity_index.add(new_job.id, signature)
+
+        # Auto-analyze job description if requested (cached by description hash)
         analysis = None
         if job_data.auto_analyze:
             try:
-                analysis = ats_optimizer.analyze_job_description(job_data.job_description)  # Fixed
-                # Store keywords in job record
-                if analysis.get('keywords'):
-                    new_job.keywords = analysis['keywords'][:10]  # Store as list
-                    await db.commit()
+                analysis = await job_analysis_cache.refresh_job(db, new_job)
+                await db.commit()
             except Exception as e:
                 logger.warning(f"ATS analysis failed: {e}")
 
@@ -98,9 +118,12 @@ async def create_job(
             "job_id": new_job.id,
             "company": company.name,
             "message": "Job created successfully",
+            "duplicate_of": duplicate[0] if duplicate else None,
             "ats_analysis": analysis
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to create job: {e}")
         await db.rollback()
@@ -213,11 +236,11 @@ async def get_job_details(
         )
         application = app_result.scalar_one_or_none()
 
-        # Run ATS analysis
+        # ATS analysis comes from the cache; spaCy only runs for never-seen descriptions
         ats_analysis = None
         if job.job_description:
             try:
-                ats_analysis = ats_optimizer.analyze_job_description(job.job_description)
+                ats_analysis = await job_analysis_cache.get_or_analyze(db, job.job_description)
             except Exception as e:
                 logger.warning(f"ATS analysis failed: {e}")
 
@@ -250,6 +273,57 @@ async def get_job_details(
         logger.error(f"Failed to get job details: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/{job_id}/similar")
+async def get_similar_jobs(
+    job_id: int,
+    min_similarity: Optional[float] = Query(default=None, ge=0.0, le=1.0),
+    limit: int = Query(default=10, le=100, description="Max 100 items"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Jobs whose descriptions are similar to this one (MinHash/LSH estimate)"""
+    try:
+        limit = min(limit, settings.MAX_API_PAGE_SIZE)
+        exists = await db.execute(select(Job.id).where(Job.id == job_id))
+        if exists.scalar_one_or_none() is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+
+        await job_similarity_index.ensure_loaded(db)
+        matches = job_similarity_index.query(
+            job_similarity_index.signature_of(job_id), min_similarity, limit, exclude=job_id
+        )
+
+        rows = {}
+        if matches:
+            result = await db.execute(
+                select(Job, Company).join(Company, Job.company_id == Company.id)
+                .where(Job.id.in_([match_id for match_id, _ in matches]))
+            )
+            rows = {job.id: (job, company) for job, company in result.all()}
+
+        duplicate_threshold = settings.JOB_DUPLICATE_THRESHOLD
+        return {
+            "job_id": job_id,
+            "count": len(rows),
+            "similar_jobs": [
+                {
+                    "id": match_id,
+                    "title": rows[match_id][0].title,
+                    "company": rows[match_id][1].name,
+                    "url": rows[match_id][0].job_url,
+                    "status": rows[match_id][0].status,
+                    "similarity": round(similarity, 3),
+                    "near_duplicate": similarity >= duplicate_threshold
+                }
+                for match_id, similarity in matches if match_id in rows
+            ]
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to find similar jobs: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.put("/{job_id}")
 async def update_job(
     job_id: int,
@@ -267,10 +341,13 @@ async def update_job(
             raise HTTPException(status_code=404, detail="Job not found")
 
         # Update fields
+        description_changed = False
         if update_data.title:
             job.title = update_data.title
-        if update_data.job_description:
+        if update_data.job_description and update_data.job_description != job.job_description:
+            previous_description = job.job_description
             job.job_description = update_data.job_description
+            description_changed = True
         if update_data.location:
             job.location = update_data.location
         if update_data.remote_type is not None:
@@ -286,11 +363,28 @@ async def update_job(
 
         job.updated_at = datetime.now()
 
+        # Only a new description invalidates the analysis
+        signature = None
+        if description_changed:
+            signature = await asyncio.to_thread(job_similarity_index.signature, job.job_description)
+            job.minhash = job_similarity_index.encode(signature)
+            try:
+                await job_analysis_cache.refresh_job(db, job)
+            except Exception as e:
+                logger.warning(f"ATS analysis failed: {e}")
+
         await db.commit()
+        job_ranker.invalidate()
+        if description_changed:
+            # In-memory indexes follow the committed row, never a rolled-back one
+            keyword_index.replace_document(previous_description, job.job_description)
+            if job_similarity_index.get_stats()['loaded']:
+                job_similarity_index.add(job.id, signature)
 
         return {
             "status": "success",
-            "message": "Job updated successfully"
+            "message": "Job updated successfully",
+            "reanalyzed": description_changed
         }
 
     except HTTPException:
@@ -326,6 +420,7 @@ async def delete_job(
             job.status = "closed"
             job.updated_at = datetime.now()
             await db.commit()
+            job_ranker.invalidate()
 
             return {
                 "status": "success",
@@ -344,6 +439,9 @@ async def delete_job(
 
             await db.delete(job)
             await db.commit()
+            keyword_index.remove_document(job.job_description)
+            job_ranker.invalidate()
+            job_similarity_index.remove(job_id)
 
             return {
                 "status": "success",
@@ -34,6 +34,24 @@ class Settings(BaseSettings):
     GMAIL_CREDENTIALS_FILE: Optional[str] = None
     GMAIL_TOKEN_FILE: Optional[str] = None
     GMAIL_SCOPES: Optional[str] = None
+    GMAIL_API_ENDPOINT: Optional[str] = Field(default=None, env="GMAIL_API_ENDPOINT")  # e.g. a local fake Gmail for tests
+    GMAIL_BATCH_SIZE: int = Field(default=100, env="GMAIL_BATCH_SIZE")  # Sub-requests per batch call (Gmail allows 100)
+    GMAIL_BATCH_RETRIES: int = Field(default=2, env="GMAIL_BATCH_RETRIES")  # Extra rounds for rate-limited/5xx items
+    GMAIL_RETRY_BACKOFF: float = Field(default=0.5, env="GMAIL_RETRY_BACKOFF")  # Seconds before the first retry round, doubling
+    GMAIL_MAX_CONCURRENCY: int = Field(default=4, env="GMAIL_MAX_CONCURRENCY")  # Gmail calls in flight (one client thread each)
+    GMAIL_HTTP_TIMEOUT: int = Field(default=30, env="GMAIL_HTTP_TIMEOUT")  # Seconds per Gmail HTTP request
+    GMAIL_TWO_PHASE_FETCH: bool = Field(default=True, env="GMAIL_TWO_PHASE_FETCH")  # Headers first, full bodies only for candidates
+    GMAIL_LIST_PAGE_SIZE: int = Field(default=100, env="GMAIL_LIST_PAGE_SIZE")  # messages.list page size (max 500)
+    GMAIL_PIPELINE_QUEUE_SIZE: int = Field(default=4, env="GMAIL_PIPELINE_QUEUE_SIZE")  # Pages buffered between scan stages
+    GMAIL_COMMIT_CHUNK: int = Field(default=200, env="GMAIL_COMMIT_CHUNK")  # Emails per commit during a scan
+    GMAIL_SCAN_RESULTS_LIMIT: int = Field(default=100, env="GMAIL_SCAN_RESULTS_LIMIT")  # Per-email results returned by a scan
+    GMAIL_FAILED_MESSAGE_RETRIES: int = Field(default=3, env="GMAIL_FAILED_MESSAGE_RETRIES")  # Later scans that retry a message which failed to fetch or process
+    GMAIL_STORE_RAW_MESSAGES: bool = Field(default=True, env="GMAIL_STORE_RAW_MESSAGES")  # Keep fetched messages for offline reprocessing
+    RAW_MESSAGE_COMPRESSION_LEVEL: int = Field(default=6, env="RAW_MESSAGE_COMPRESSION_LEVEL")  # zlib level, 1 (fast) - 9 (small)
+    EMAIL_REPROCESS_BATCH_SIZE: int = Field(default=500, env="EMAIL_REPROCESS_BATCH_SIZE")  # Stored messages read per reprocess step
+    EMAIL_CLASSIFY_BATCH_SIZE: int = Field(default=64, env="EMAIL_CLASSIFY_BATCH_SIZE")  # Fetched emails classified per call during a scan
+    EMAIL_THREAD_CONTEXT_MESSAGES: int = Field(default=3, env="EMAIL_THREAD_CONTEXT_MESSAGES")  # Newest messages per thread classified in a batch
+    EMAIL_CLASSIFIER_MIN_EXAMPLES: int = Field(default=50, env="EMAIL_CLASSIFIER_MIN_EXAMPLES")  # Labeled emails needed before the model replaces the heuristic
 
     @property
     def gmail_scopes_list(self) -> List[str]:
@@ -81,6 +99,9 @@ class Settings(BaseSettings):
     )
     MAX_APPLICATIONS_PER_DAY: int = 10
 
+    # Local data (indexes and caches that can be rebuilt from the database)
+    DATA_DIR: str = Field(default="data", env="DATA_DIR")
+
     # Redis Settings (for task queue)
     REDIS_URL: str = Field(default="redis://localhost:6379", env="REDIS_URL")
     CELERY_BROKER_URL: str = Field(default="redis://localhost:6379/0", env="CELERY_BROKER_URL")
@@ -89,6 +110,21 @@ class Settings(BaseSettings):
     # Automation Settings
     AUTO_FOLLOW_UP_DAYS: str = Field(default="7,14,21", env="AUTO_FOLLOW_UP_DAYS")
     ATS_MINIMUM_SCORE: int = Field(default=70, env="ATS_MINIMUM_SCORE")
+    ATS_WARM_ON_STARTUP: bool = Field(default=False, env="ATS_WARM_ON_STARTUP")  # Load spaCy in the lifespan hook
+    ATS_BATCH_N_PROCESS: int = Field(default=1, env="ATS_BATCH_N_PROCESS")  # spaCy worker processes for batch analysis
+    ATS_BATCH_SIZE: int = Field(default=64, env="ATS_BATCH_SIZE")
+    ATS_MAX_BATCH_DESCRIPTIONS: int = Field(default=1000, env="ATS_MAX_BATCH_DESCRIPTIONS")
+    ATS_KEYWORD_INDEX_BUCKETS: int = Field(default=2 ** 22, env="ATS_KEYWORD_INDEX_BUCKETS")  # Hashed IDF table size
+    ATS_ANALYSIS_CACHE_SIZE: int = Field(default=512, env="ATS_ANALYSIS_CACHE_SIZE")  # In-process LRU entries
+    ATS_WORKER_PROCESSES: int = Field(default=2, env="ATS_WORKER_PROCESSES")  # 0 runs ATS work in threads instead
+    ATS_MAX_PENDING_TASKS: int = Field(default=16, env="ATS_MAX_PENDING_TASKS")  # Running + queued before 503
+    RESUME_CACHE_SIZE: int = Field(default=64, env="RESUME_CACHE_SIZE")  # Parsed resumes kept in memory
+    RESUME_CACHE_PERSIST: bool = Field(default=False, env="RESUME_CACHE_PERSIST")  # Also keep parsed resumes under DATA_DIR
+    RESUME_CACHE_DISK_ENTRIES: int = Field(default=500, env="RESUME_CACHE_DISK_ENTRIES")
+    JOB_MINHASH_PERMUTATIONS: int = Field(default=128, env="JOB_MINHASH_PERMUTATIONS")  # Signature length per job
+    JOB_LSH_BANDS: int = Field(default=32, env="JOB_LSH_BANDS")  # Must divide JOB_MINHASH_PERMUTATIONS
+    JOB_DUPLICATE_THRESHOLD: float = Field(default=0.85, env="JOB_DUPLICATE_THRESHOLD")  # Estimated Jaccard for a near-duplicate
+    JOB_SIMILAR_THRESHOLD: float = Field(default=0.5, env="JOB_SIMILAR_THRESHOLD")  # Default floor for /jobs/{id}/similar (LSH recall drops below ~0.45)
     EMAIL_CHECK_INTERVAL_MINUTES: int = Field(default=30, env="EMAIL_CHECK_INTERVAL_MINUTES")
     JOB_AGGREGATION_INTERVAL_HOURS: int = Field(default=6, env="JOB_AGGREGATION_INTERVAL_HOURS")
 
@@ -96,6 +132,15 @@ class Settings(BaseSettings):
     TEST_RECIPIENT_OVERRIDE: Optional[str] = None
     LIVE_SEND_MODE: bool = False
 
+    # Outbound email queue
+    OUTBOX_RATE_PER_MINUTE: float = Field(default=20, env="OUTBOX_RATE_PER_MINUTE")  # Sustained sends per minute (token bucket)
+    OUTBOX_BURST: int = Field(default=5, env="OUTBOX_BURST")  # Sends allowed back to back after a quiet period
+    OUTBOX_MAX_ATTEMPTS: int = Field(default=5, env="OUTBOX_MAX_ATTEMPTS")  # Then the email is marked FAILED
+    OUTBOX_RETRY_BASE_SECONDS: float = Field(default=30, env="OUTBOX_RETRY_BASE_SECONDS")  # First retry delay, doubling per attempt
+    OUTBOX_POLL_SECONDS: float = Field(default=5, env="OUTBOX_POLL_SECONDS")  # Worker wake-up when nothing was enqueued
+    OUTBOX_BATCH_SIZE: int = Field(default=20, env="OUTBOX_BATCH_SIZE")  # Due emails claimed per worker pass
+    OUTBOX_SENDING_LEASE_SECONDS: int = Field(default=300, env="OUTBOX_SENDING_LEASE_SECONDS")  # SENDING rows older than this are abandoned
+
     # API Pagination Limits (prevent memory exhaustion)
     MAX_API_PAGE_SIZE: int = Field(default=100, env="MAX_API_PAGE_SIZE")
     DEFAULT_API_PAGE_SIZE: int = Field(default=50, env="DEFAULT_API_PAGE_SIZE")
@@ -0,0 +1,149 @@
+"""
+Phrase Matcher - Find every dictionary phrase in a text in one pass
+
+Replaces `any(kw in text for kw in LIST)` scans. The phrases are folded
+into a trie and compiled into a single regular expression, so matching
+walks the text once and the cost per position is bounded by phrase
+length rather than dictionary size. Hits keep substring semantics: every
+occurrence is reported with its offsets, including overlapping phrases
+such as 'java' inside 'javascript'.
+
+Standard library only, so standalone scripts can use it without the API stack.
+"""
+
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Set
+
+
+class PhraseMatch(NamedTuple):
+    start: int
+    end: int
+    phrase: str
+
+
+class PhraseMatcher:
+    """Compiled multi-pattern substring matcher with optional labels per phrase"""
+
+    def __init__(self, phrases: Optional[Iterable[str]] = None, case_sensitive: bool = False):
+        self.case_sensitive = case_sensitive
+        self._labels: Dict[str, List[Any]] = {}
+        self._regex = None
+        self._prefixes: Dict[str, List[str]] = {}
+
+        for phrase in phrases or []:
+            self.add(phrase)
+
+    @classmethod
+    def from_groups(cls, groups: Mapping[Any, Iterable[str]], **kwargs) -> 'PhraseMatcher':
+        """Build a matcher whose phrases are labelled with their group key"""
+        matcher = cls(**kwargs)
+        for label, phrases in groups.items():
+            for phrase in phrases:
+                matcher.add(phrase, label)
+        return matcher
+
+    def add(self, phrase: str, label: Any = None):
+        """Add a phrase (labelled with itself unless a label is given)"""
+        key = self._normalize(phrase)
+        if not key:
+            return
+        labels = self._labels.setdefault(key, [])
+        label = phrase if label is None else label
+        if label not in labels:
+            labels.append(label)
+        self._regex = None
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def _normalize(self, text: str) -> str:
+        return text if self.case_sensitive else text.lower()
+
+    # ------------------------------------------------------------------
+    # Compilation
+    # ------------------------------------------------------------------
+
+    def _compile(self):
+        trie: Dict[str, dict] = {}
+        for phrase in self._labels:
+            node = trie
+            for char in phrase:
+                node = node.setdefault(char, {})
+            node[''] = True
+
+        # Each start position yields its longest phrase; the shorter phrases
+        # that are prefixes of it are recovered from this table
+        self._prefixes = {}
+        for phrase in self._labels:
+            node = trie
+            found = []
+            for i, char in enumerate(phrase, 1):
+                node = node[char]
+                if '' in node:
+                    found.append(phrase[:i])
+            self._prefixes[phrase] = found
+
+        pattern = self._trie_pattern(trie) if trie else r'(?!)'
+        self._regex = re.compile(f'(?=({pattern}))', re.DOTALL)
+
+    def _trie_pattern(self, node: dict) -> str:
+        branches = [
+            re.escape(char) + self._trie_pattern(child)
+            for char, child in sorted(node.items()) if char
+        ]
+        if not branches:
+            return ''
+
+        terminal = '' in node
+        if len(branches) == 1 and not terminal:
+            return branches[0]
+
+        # Greedy '?' prefers the longer continuation, so matches are longest-first
+        group = '(?:' + '|'.join(branches) + ')'
+        return group + '?' if terminal else group
+
+    @property
+    def regex(self):
+        if self._regex is None:
+            self._compile()
+        return self._regex
+
+    # ------------------------------------------------------------------
+    # Matching
+    # ------------------------------------------------------------------
+
+    def find_all(self, text: str) -> List[PhraseMatch]:
+        """
+        Every occurrence of every phrase, ordered by start offset
+        Offsets index the text as matched (lowercased when case-insensitive)
+        """
+        text = self._normalize(text)
+        hits = []
+        for match in self.regex.finditer(text):
+            start = match.start()
+            for phrase in self._prefixes[match.group(1)]:
+                hits.append(PhraseMatch(start, start + len(phrase), phrase))
+        return hits
+
+    def matched(self, text: str) -> Set[str]:
+        """Distinct phrases that occur in the text"""
+        text = self._normalize(text)
+        found = set()
+        for match in self.regex.finditer(text):
+            found.update(self._prefixes[match.group(1)])
+        return found
+
+    def labels(self, text: str) -> Set[Any]:
+        """Labels of every phrase that occurs in the text"""
+        return {label for phrase in self.matched(text) for label in self._labels[phrase]}
+
+    def count_by_label(self, text: str) -> Counter:
+        """Number of distinct phrases found per label"""
+        counts = Counter()
+        for phrase in self.matched(text):
+            counts.update(self._labels[phrase])
+        return counts
+
+    def contains_any(self, text: str) -> bool:
+        return self.regex.search(self._normalize(text)) is not None
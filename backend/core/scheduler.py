@@ -51,6 +51,15 @@ class JobScheduler:
                 replace_existing=True
             )
 
+            # Persist incremental keyword IDF updates every 10 minutes
+            self.scheduler.add_job(
+                self._flush_keyword_index,
+                IntervalTrigger(minutes=10),
+                id="keyword_index_flush",
+                name="Keyword Index Flush",
+                replace_existing=True
+            )
+
             self.scheduler.start()
             logger.info("Scheduler started with background jobs")
 
@@ -99,6 +108,14 @@ class JobScheduler:
         except Exception as e:
             logger.error(f"Follow-up check failed: {e}")
 
+    async def _flush_keyword_index(self):
+        """Background task to persist the keyword document-frequency index"""
+        try:
+            from backend.services.keyword_index import keyword_index
+            await asyncio.to_thread(keyword_index.flush)
+        except Exception as e:
+            logger.error(f"Keyword index flush failed: {e}")
+
 # Global scheduler instance
 scheduler = JobScheduler()
 
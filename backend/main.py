@@ -3,9 +3,11 @@ Job Search Automation Platform - Main API
 Real automation, not just file copying
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import uvicorn
 
 # Import routers
@@ -20,8 +22,10 @@ from backend.api.v1 import (
 )
 
 # Import core services
+from backend.core.config import settings
 from backend.core.database import engine, Base
 from backend.core.logging import setup_logging
+from backend.services.ats_executor import ats_executor, ATSBusyError
 
 # Setup logging
 logger = setup_logging()
@@ -39,15 +43,49 @@ async def lifespan(app: FastAPI):
 
     logger.info("Database initialized")
 
+    # Load the keyword IDF index (rebuilt from the jobs table if it drifted)
+    from backend.core.database import AsyncSessionLocal
+    from backend.services.keyword_index import keyword_index
+    try:
+        async with AsyncSessionLocal() as db:
+            await keyword_index.sync(db)
+    except Exception as e:
+        logger.error(f"Keyword index sync failed: {e}")
+
+    # Load job MinHash signatures (backfilling any that are missing) for duplicate checks
+    from backend.services.job_similarity import job_similarity_index
+    try:
+        async with AsyncSessionLocal() as db:
+            await job_similarity_index.ensure_loaded(db)
+    except Exception as e:
+        logger.error(f"Job similarity index load failed: {e}")
+
+    # CPU-bound ATS work runs in worker processes that preload their own models;
+    # without workers the models load on first use unless warming is requested
+    ats_executor.start()
+    if settings.ATS_WARM_ON_STARTUP and not ats_executor.is_running:
+        from backend.services.ats_optimizer import ats_optimizer
+        load_time = await asyncio.to_thread(ats_optimizer.warm)
+        logger.info(f"ATS models warmed in {load_time:.2f}s")
+
     # Start background tasks
     from backend.core.scheduler import start_scheduler
     scheduler = await start_scheduler()
 
+    # Outgoing email (follow-ups) is queued in the DB and sent by this worker
+    from backend.services.email_outbox import email_outbox
+    email_outbox.start()
+
     yield
 
     # Shutdown
     logger.info("Shutting down Job Search Automation Platform")
     scheduler.shutdown()
+    await email_outbox.stop()
+    ats_executor.shutdown()
+    from backend.services.email_service import email_service
+    email_service.transport.shutdown()
+    keyword_index.flush()
 
 # Create FastAPI app
 app = FastAPI(
@@ -67,6 +105,16 @@ app.add_middleware(
 )
 
 
+@app.exception_handler(ATSBusyError)
+async def ats_busy_handler(request: Request, exc: ATSBusyError):
+    """Backpressure: tell clients when to retry instead of queueing without bound"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
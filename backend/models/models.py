@@ -4,7 +4,7 @@ Database models for real job search automation
 
 from sqlalchemy import (
     Column, Integer, String, Text, DateTime, Boolean,
-    ForeignKey, JSON, Float, Date, Enum, Index
+    ForeignKey, JSON, Float, Date, Enum, Index, LargeBinary
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -42,6 +42,14 @@ class ResponseType(enum.Enum):
     OTHER = "OTHER"
 
 
+class OutboxStatus(enum.Enum):
+    """Outbound email delivery state"""
+    PENDING = "PENDING"  # Waiting for its next attempt
+    SENDING = "SENDING"  # Handed to Gmail, outcome not recorded yet
+    SENT = "SENT"
+    FAILED = "FAILED"  # Gave up; never retried automatically
+
+
 class Company(Base):
     """Company information with research data"""
     __tablename__ = "companies"
@@ -96,6 +104,8 @@ class Job(Base):
     fit_score = Column(Integer)  # 0-100
     keywords = Column(JSON)  # Extracted keywords
     missing_keywords = Column(JSON)  # Keywords we don't have
+    skill_ids = Column(LargeBinary)  # Sorted uint32 IDs of required skills (see skill_dictionary)
+    minhash = Column(LargeBinary)  # MinHash signature of job_description (see job_similarity)
 
     # Status tracking
     priority = Column(Enum(Priority), default=Priority.MEDIUM)
@@ -122,6 +132,37 @@ class Job(Base):
     )
 
 
+class Skill(Base):
+    """Canonical skill names with stable integer IDs for compact skill arrays"""
+    __tablename__ = "skills"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(255), nullable=False)  # Normalized canonical form
+
+    created_at = Column(DateTime, default=func.now())
+
+    __table_args__ = (
+        Index("idx_skill_name", "name", unique=True),
+    )
+
+
+class JobAnalysis(Base):
+    """Cached ATS analysis of a job description, keyed by content hash"""
+    __tablename__ = "job_analyses"
+
+    id = Column(Integer, primary_key=True)
+    content_hash = Column(String(64), nullable=False)  # sha256 of the description text
+    analyzer_version = Column(String(20), nullable=False)  # ATSOptimizer.ANALYZER_VERSION
+    analysis = Column(JSON, nullable=False)
+
+    created_at = Column(DateTime, default=func.now())
+
+    # One analysis per description per analyzer version
+    __table_args__ = (
+        Index("idx_job_analysis_hash_version", "content_hash", "analyzer_version", unique=True),
+    )
+
+
 class Application(Base):
     """Application tracking with automation data"""
     __tablename__ = "applications"
@@ -203,6 +244,7 @@ class EmailTracking(Base):
     # Classification (automated)
     classification = Column(Enum(ResponseType))
     confidence_score = Column(Float)  # How sure we are
+    label = Column(Enum(ResponseType))  # Confirmed by the user; training data for the classifier
 
     # Action tracking
     processed = Column(Boolean, default=False)
@@ -331,6 +373,61 @@ class TemplatePerformance(Base):
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
 
+class SystemState(Base):
+    """Persisted key/value state such as sync checkpoints, one JSON document per key"""
+    __tablename__ = "system_state"
+
+    key = Column(String(100), primary_key=True)
+    value = Column(JSON, nullable=False)
+
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+
+class OutboundEmail(Base):
+    """Durable outbox: emails are queued here and sent by the outbox worker"""
+    __tablename__ = "outbound_emails"
+
+    id = Column(Integer, primary_key=True)
+    idempotency_key = Column(String(255), unique=True, nullable=False)  # One row (and send) per key
+    kind = Column(String(50))  # e.g. 'followup'; decides what happens after a send
+    application_id = Column(Integer, ForeignKey("applications.id"))
+
+    # Message
+    to_address = Column(String(255), nullable=False)
+    subject = Column(String(500))
+    body = Column(Text)
+    thread_id = Column(String(255))
+
+    # Delivery
+    status = Column(Enum(OutboxStatus), default=OutboxStatus.PENDING, nullable=False)
+    attempts = Column(Integer, default=0)
+    next_attempt_at = Column(DateTime, default=func.now())
+    last_error = Column(Text)
+    gmail_message_id = Column(String(255))
+
+    # Timestamps
+    created_at = Column(DateTime, default=func.now())
+    sent_at = Column(DateTime)
+
+    __table_args__ = (
+        Index("idx_outbox_due", "status", "next_attempt_at"),
+    )
+
+
+class RawMessage(Base):
+    """Gmail message resource as fetched (zlib-compressed JSON), for offline reprocessing"""
+    __tablename__ = "raw_messages"
+
+    gmail_id = Column(String(255), primary_key=True)
+    thread_id = Column(String(255))
+    format = Column(String(20), nullable=False)  # 'full' or 'metadata' (headers only)
+    content_hash = Column(String(64), nullable=False)  # sha256 of the uncompressed JSON
+    raw_size = Column(Integer)  # Uncompressed bytes
+    data = Column(LargeBinary, nullable=False)
+
+    stored_at = Column(DateTime, default=func.now())
+
+
 class AnalyticsEvent(Base):
     """Track everything for analysis"""
     __tablename__ = "analytics_events"
@@ -0,0 +1,231 @@
+"""
+Job Analysis Cache
+Content-addressed cache for ATS job-description analysis
+
+Analyses are keyed by sha256(description) + ATSOptimizer.ANALYZER_VERSION,
+persisted in the job_analyses table and fronted by an in-process LRU.
+A job detail read is one dictionary lookup (warm) or one indexed query (cold);
+spaCy only runs when a description has never been analyzed before.
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+
+from backend.core.config import settings
+from backend.core.logging import get_logger
+from backend.models.models import Job, JobAnalysis
+from backend.services.ats_optimizer import ats_optimizer
+from backend.services.ats_executor import ats_executor
+from backend.services.skill_dictionary import skill_dictionary
+
+logger = get_logger(__name__)
+
+
+class JobAnalysisCache:
+    """Two-level (memory LRU + database) cache of job description analyses"""
+
+    def __init__(self, max_entries: int = None):
+        self.max_entries = max_entries or settings.ATS_ANALYSIS_CACHE_SIZE
+        self._entries: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self.stats = {'memory_hits': 0, 'db_hits': 0, 'misses': 0}
+
+    @staticmethod
+    def content_hash(description: str) -> str:
+        """Hash of the description text used as the cache key"""
+        return hashlib.sha256(description.encode('utf-8')).hexdigest()
+
+    def _key(self, description: str) -> Tuple[str, str]:
+        return self.content_hash(description), ats_optimizer.ANALYZER_VERSION
+
+    def _remember(self, key: Tuple[str, str], analysis: Dict[str, Any]):
+        """Insert into the LRU, evicting the least recently used entry"""
+        self._entries[key] = analysis
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get(self, db: AsyncSession, description: str) -> Optional[Dict[str, Any]]:
+        """Return the cached analysis for a description, or None"""
+        key = self._key(description)
+
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.stats['memory_hits'] += 1
+            return self._entries[key]
+
+        result = await db.execute(
+            select(JobAnalysis.analysis).where(
+                JobAnalysis.content_hash == key[0],
+                JobAnalysis.analyzer_version == key[1]
+            )
+        )
+        analysis = result.scalar_one_or_none()
+        if analysis is None:
+            return None
+
+        self.stats['db_hits'] += 1
+        self._remember(key, analysis)
+        return analysis
+
+    async def put(self, db: AsyncSession, description: str, analysis: Dict[str, Any]):
+        """
+        Persist an analysis (caller commits)
+        Uses a savepoint so a concurrent insert of the same key doesn't fail the request
+        """
+        key = self._key(description)
+        self._remember(key, analysis)
+
+        try:
+            async with db.begin_nested():
+                db.add(JobAnalysis(
+                    content_hash=key[0],
+                    analyzer_version=key[1],
+                    analysis=analysis
+                ))
+        except IntegrityError:
+            logger.debug(f"Analysis {key[0][:12]} already cached by another request")
+
+    async def get_or_analyze(self, db: AsyncSession, description: str) -> Dict[str, Any]:
+        """Read-through lookup: run the analyzer and store the result only on a miss"""
+        analysis = await self.get(db, description)
+        if analysis is not None:
+            return analysis
+
+        self.stats['misses'] += 1
+        analysis = await ats_executor.analyze_job(description)
+        await self.put(db, description, analysis)
+        await db.commit()
+        return analysis
+
+    async def get_or_analyze_many(self, db: AsyncSession, descriptions: List[str],
+                                  chunk_size: int = 500) -> List[Dict[str, Any]]:
+        """
+        Bulk read-through lookup used when scoring many jobs at once
+        Cached rows are fetched with chunked IN queries; all misses are analyzed
+        together in one batched pass on the ATS workers
+        """
+        version = ats_optimizer.ANALYZER_VERSION
+        hashes = [self.content_hash(description) for description in descriptions]
+        analyses: Dict[str, Dict[str, Any]] = {}
+
+        for content_hash in hashes:
+            cached = self._entries.get((content_hash, version))
+            if cached is not None:
+                self.stats['memory_hits'] += 1
+                analyses[content_hash] = cached
+
+        cold_hashes = list(dict.fromkeys(h for h in hashes if h not in analyses))
+        for start in range(0, len(cold_hashes), chunk_size):
+            result = await db.execute(
+                select(JobAnalysis.content_hash, JobAnalysis.analysis).where(
+                    JobAnalysis.content_hash.in_(cold_hashes[start:start + chunk_size]),
+                    JobAnalysis.analyzer_version == version
+                )
+            )
+            for content_hash, analysis in result.all():
+                self.stats['db_hits'] += 1
+                analyses[content_hash] = analysis
+                self._remember((content_hash, version), analysis)
+
+        missing = {
+            content_hash: description
+            for content_hash, description in zip(hashes, descriptions)
+            if content_hash not in analyses
+        }
+        if missing:
+            self.stats['misses'] += len(missing)
+            fresh = await ats_executor.analyze_many(list(missing.values()))
+            for (content_hash, description), analysis in zip(missing.items(), fresh):
+                analyses[content_hash] = analysis
+                await self.put(db, description, analysis)
+            await db.commit()
+
+        return [analyses[content_hash] for content_hash in hashes]
+
+    async def refresh_job(self, db: AsyncSession, job: Job) -> Optional[Dict[str, Any]]:
+        """
+        Analyze a job's current description and copy the results onto the job row
+        Called when a job is created or its description changes (caller commits)
+        """
+        if not job.job_description:
+            return None
+
+        analysis = await self.get(db, job.job_description)
+        if analysis is None:
+            self.stats['misses'] += 1
+            analysis = await ats_executor.analyze_job(job.job_description)
+            await self.put(db, job.job_description, analysis)
+
+        job.keywords = analysis['keywords'][:10]
+        job.requirements = {
+            'required_skills': analysis['required_skills'],
+            'preferred_skills': analysis['preferred_skills'],
+            'experience_years': analysis['experience_years'],
+            'education_level': analysis['education_level'],
+            'certifications': analysis['certifications']
+        }
+        job.skill_ids = await skill_dictionary.encode_skills(db, analysis['required_skills'])
+        return analysis
+
+    async def backfill_skill_ids(self, db: AsyncSession) -> int:
+        """
+        Give skill ID arrays to jobs stored before Job.skill_ids existed
+        Returns the number of jobs filled (committed here)
+        """
+        result = await db.execute(
+            select(Job.id, Job.job_description).where(
+                Job.skill_ids.is_(None),
+                Job.job_description.is_not(None),
+                Job.job_description != ''
+            )
+        )
+        rows = result.all()
+        if not rows:
+            return 0
+
+        analyses = await self.get_or_analyze_many(db, [row.job_description for row in rows])
+        values = []
+        for row, analysis in zip(rows, analyses):
+            values.append({
+                'id': row.id,
+                'skill_ids': await skill_dictionary.encode_skills(db, analysis['required_skills'])
+            })
+        # Bulk UPDATE by primary key, one statement for all rows
+        await db.execute(update(Job), values)
+        await db.commit()
+        logger.info(f"Backfilled skill IDs for {len(values)} jobs")
+        return len(values)
+
+    async def scoring_analysis(self, db: AsyncSession, job: Job) -> Optional[Dict[str, Any]]:
+        """
+        A stored job's analysis with its required-skill ID array under
+        'skill_ids', so ATSOptimizer._calculate_ats_score matches on IDs
+        """
+        if not job.job_description:
+            return None
+
+        if job.skill_ids is None:
+            analysis = await self.refresh_job(db, job)
+            await db.commit()
+        else:
+            analysis = await self.get_or_analyze(db, job.job_description)
+            await skill_dictionary.ensure_loaded(db)
+        return {**analysis, 'skill_ids': skill_dictionary.decode(job.skill_ids)}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for monitoring"""
+        return {
+            **self.stats,
+            'memory_entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'analyzer_version': ats_optimizer.ANALYZER_VERSION
+        }
+
+
+# Singleton instance
+job_analysis_cache = JobAnalysisCache()
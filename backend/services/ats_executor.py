@@ -0,0 +1,219 @@
+"""
+ATS Executor - Runs CPU-bound ATS work (spaCy, python-docx) off the event loop
+
+Work is sent to a pool of worker processes, each holding its own preloaded
+spaCy model, so one resume optimization no longer stalls health checks and
+email endpoints. Submissions are bounded: once ATS_MAX_PENDING_TASKS are
+running or queued, new work is rejected with ATSBusyError (503 + Retry-After).
+
+With ATS_WORKER_PROCESSES=0 the same API runs tasks in threads instead, which
+is what tests and single-user setups use.
+
+Workers read the keyword IDF index from disk and reload it whenever the API
+process saves a newer copy, so worker IDF lags by at most one flush interval.
+"""
+
+import asyncio
+import math
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Callable
+
+from backend.core.config import settings
+from backend.core.logging import get_logger
+from backend.services.ats_optimizer import ats_optimizer
+from backend.services.keyword_index import keyword_index
+
+logger = get_logger(__name__)
+
+
+class ATSBusyError(Exception):
+    """Raised when the ATS work queue is full"""
+
+    def __init__(self, retry_after: int, pending: int):
+        super().__init__(f"ATS workers are busy ({pending} tasks pending), retry in {retry_after}s")
+        self.retry_after = retry_after
+        self.pending = pending
+
+
+# ----------------------------------------------------------------------
+# Worker-side tasks (module level so they can be pickled)
+# ----------------------------------------------------------------------
+
+def _init_worker():
+    """Preload the spaCy model and keyword index once per worker process"""
+    ats_optimizer.warm()
+    keyword_index.load()
+
+
+def _warm_task() -> int:
+    return os.getpid()
+
+
+def analyze_job_task(description: str) -> Dict[str, Any]:
+    keyword_index.reload_if_changed()
+    return ats_optimizer.analyze_job_description(description)
+
+
+def analyze_many_task(descriptions: List[str], n_process: int, batch_size: int) -> List[Dict[str, Any]]:
+    keyword_index.reload_if_changed()
+    return ats_optimizer.analyze_many(descriptions, n_process=n_process, batch_size=batch_size)
+
+
+def parse_resume_task(content: bytes, filename: str) -> Dict[str, Any]:
+    """Parse uploaded resume bytes (the extension decides how the file is read)"""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=filename) as tmp:
+        tmp.write(content)
+        tmp_path = tmp.name
+
+    try:
+        return ats_optimizer.parse_resume(tmp_path)
+    finally:
+        os.unlink(tmp_path)
+
+
+def optimize_resume_task(filename: str, job_analysis: Dict[str, Any], output_path: Optional[str],
+                         parsed_resume: Dict[str, Any]) -> Dict[str, Any]:
+    return ats_optimizer.optimize_resume(
+        filename, job_analysis, output_path, parsed_resume=parsed_resume
+    )
+
+
+# ----------------------------------------------------------------------
+# API-side executor
+# ----------------------------------------------------------------------
+
+class ATSExecutor:
+    """Bounded async facade over the ATS worker pool"""
+
+    def __init__(self, workers: int = None, max_pending: int = None):
+        self.workers = settings.ATS_WORKER_PROCESSES if workers is None else workers
+        self.max_pending = max_pending or settings.ATS_MAX_PENDING_TASKS
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.pending = 0
+        self.stats = {
+            'submitted': 0,
+            'completed': 0,
+            'failed': 0,
+            'rejected': 0,
+            'peak_pending': 0
+        }
+        self.avg_task_seconds = 1.0  # Moving average used for Retry-After
+
+    @property
+    def is_running(self) -> bool:
+        return self._pool is not None
+
+    def start(self):
+        """Create the worker pool and start loading models in every worker"""
+        if self._pool is not None or self.workers <= 0:
+            return
+
+        # spawn, not fork: the API process has live threads (aiosqlite, scheduler)
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker
+        )
+        for _ in range(self.workers):
+            self._pool.submit(_warm_task)
+        logger.info(f"Started {self.workers} ATS worker processes")
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            logger.info("ATS worker processes stopped")
+
+    def _retry_after(self) -> int:
+        """Rough time for the current backlog to drain"""
+        return max(1, math.ceil(self.avg_task_seconds * self.pending / max(1, self.workers)))
+
+    def _admit(self, n_tasks: int):
+        if self.pending + n_tasks > self.max_pending:
+            self.stats['rejected'] += 1
+            raise ATSBusyError(self._retry_after(), self.pending)
+        self.pending += n_tasks
+        self.stats['submitted'] += n_tasks
+        self.stats['peak_pending'] = max(self.stats['peak_pending'], self.pending)
+
+    async def _execute(self, fn: Callable, *args):
+        """Run one admitted task in the pool (or a thread) and record its duration"""
+        started = time.perf_counter()
+        try:
+            if self._pool is not None:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(self._pool, fn, *args)
+            else:
+                result = await asyncio.to_thread(fn, *args)
+            self.stats['completed'] += 1
+            return result
+        except Exception:
+            self.stats['failed'] += 1
+            raise
+        finally:
+            self.pending -= 1
+            elapsed = time.perf_counter() - started
+            self.avg_task_seconds = 0.8 * self.avg_task_seconds + 0.2 * elapsed
+
+    async def run(self, fn: Callable, *args):
+        """Run fn(*args) off the event loop, or raise ATSBusyError if the queue is full"""
+        self._admit(1)
+        return await self._execute(fn, *args)
+
+    async def analyze_job(self, description: str) -> Dict[str, Any]:
+        return await self.run(analyze_job_task, description)
+
+    async def analyze_many(self, descriptions: List[str], n_process: int = None,
+                           batch_size: int = None) -> List[Dict[str, Any]]:
+        """
+        Batch job analysis; with a pool the batch is split across the workers
+        (each worker parses its chunk with nlp.pipe), otherwise n_process applies
+        """
+        descriptions = list(descriptions)
+        if not descriptions:
+            return []
+        batch_size = batch_size or settings.ATS_BATCH_SIZE
+
+        if self._pool is None:
+            return await self.run(
+                analyze_many_task, descriptions,
+                n_process or settings.ATS_BATCH_N_PROCESS, batch_size
+            )
+
+        chunk_size = max(batch_size, math.ceil(len(descriptions) / self.workers))
+        chunks = [descriptions[i:i + chunk_size] for i in range(0, len(descriptions), chunk_size)]
+
+        # Admit the whole batch at once so it is never half-submitted
+        self._admit(len(chunks))
+        results = await asyncio.gather(*[
+            self._execute(analyze_many_task, chunk, 1, batch_size) for chunk in chunks
+        ])
+        return [analysis for chunk_result in results for analysis in chunk_result]
+
+    async def parse_resume(self, content: bytes, filename: str) -> Dict[str, Any]:
+        return await self.run(parse_resume_task, content, filename)
+
+    async def optimize_resume(self, filename: str, job_analysis: Dict[str, Any],
+                              parsed_resume: Dict[str, Any],
+                              output_path: Optional[str] = None) -> Dict[str, Any]:
+        return await self.run(optimize_resume_task, filename, job_analysis, output_path, parsed_resume)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth and throughput counters for monitoring"""
+        return {
+            **self.stats,
+            'mode': 'processes' if self._pool is not None else 'threads',
+            'workers': self.workers if self._pool is not None else 0,
+            'pending': self.pending,
+            'queued': max(0, self.pending - self.workers) if self._pool is not None else 0,
+            'max_pending': self.max_pending,
+            'avg_task_seconds': round(self.avg_task_seconds, 3)
+        }
+
+
+# Singleton instance
+ats_executor = ATSExecutor()
@@ -1,20 +1,28 @@
 """
 ATS Optimization Service - Real keyword optimization that improves response rates
 This analyzes job descriptions and optimizes resumes to pass ATS filters
+
+spaCy, scikit-learn and python-docx are imported on first use, so importing
+this module (every API boot, test run and CLI script) stays cheap. Uploaded
+resumes are read with the streaming docx_inspector; python-docx is only
+used to write optimized resumes.
 """
 
 import re
-from typing import Dict, List, Set, Tuple, Any, Optional
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Set, Tuple, Any, Optional, Iterable
 from collections import Counter
-import spacy
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
-from docx import Document
 from pathlib import Path
 import json
 
 from backend.core.logging import get_logger
+from backend.core.phrase_matcher import PhraseMatcher
+from backend.services.docx_inspector import inspect_docx
+from backend.services.keyword_index import keyword_index
+from backend.services.skill_dictionary import skill_dictionary, SKILL_SYNONYMS
+from backend.services.resume_scorer import IncrementalResumeScorer
 
 logger = get_logger(__name__)
 
@@ -24,21 +32,53 @@ class ATSOptimizer:
     This is real optimization that measurably improves response rates
     """
 
+    # Bump whenever extraction logic changes so cached analyses are recomputed
+    ANALYZER_VERSION = "2.4"
+
+    # spaCy components none of the extractors rely on (we only use POS tags and noun chunks)
+    UNUSED_PIPES = ["ner", "lemmatizer"]
+
+    # Section headers recognised in job descriptions, mapped to section keys
+    JOB_SECTION_HEADERS = {
+        'nice to have': ['nice to have', 'nice-to-have', 'bonus points', 'bonus'],
+        'preferred': ['preferred', 'preferred qualifications', 'preferred skills'],
+        'requirements': ['requirements', 'job requirements', 'minimum requirements'],
+        'required': ['required', 'required qualifications', 'required skills',
+                     'qualifications', 'minimum qualifications', 'must have', 'what you need'],
+        'responsibilities': ['responsibilities', 'key responsibilities', 'duties',
+                             'what you will do', "what you'll do"],
+        'about': ['about us', 'about the role', 'about the company', 'overview'],
+        'benefits': ['benefits', 'what we offer', 'perks'],
+    }
+
+    # Known technologies and tools, matched as substrings in one pass
+    TECH_KEYWORDS = [
+        'python', 'java', 'javascript', 'sql', 'excel', 'tableau',
+        'power bi', 'aws', 'azure', 'docker', 'kubernetes', 'git',
+        'agile', 'scrum', 'jira', 'salesforce', 'sap', 'oracle'
+    ]
+    KNOWN_TECHNOLOGIES = [
+        'Python', 'Java', 'JavaScript', 'TypeScript', 'C++', 'C#',
+        'SQL', 'NoSQL', 'MongoDB', 'PostgreSQL', 'MySQL', 'Redis',
+        'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'Jenkins',
+        'Git', 'GitHub', 'GitLab', 'Jira', 'Confluence',
+        'React', 'Angular', 'Vue', 'Node.js', 'Django', 'Flask',
+        'TensorFlow', 'PyTorch', 'Scikit-learn', 'Pandas', 'NumPy'
+    ]
+    TECH_KEYWORD_MATCHER = PhraseMatcher(TECH_KEYWORDS)
+    KNOWN_TECHNOLOGY_MATCHER = PhraseMatcher(KNOWN_TECHNOLOGIES)
+
+    # Where optimize_resume may insert missing terms, and how many candidate edits it tries
+    SKILLS_HEADER_PATTERN = re.compile(r'(Skills?|SKILLS?|Technical Skills?|TECHNICAL SKILLS?)')
+    MAX_EDIT_ANCHORS = 3
+    MAX_TERMS_PER_EDIT = 10
+
     def __init__(self):
-        # Load spaCy model for NLP
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except:
-            logger.warning("spaCy model not found. Installing...")
-            import subprocess
-            subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"])
-            self.nlp = spacy.load("en_core_web_sm")
-
-        self.vectorizer = TfidfVectorizer(
-            max_features=500,
-            ngram_range=(1, 3),
-            stop_words='english'
-        )
+        # NLP model is loaded lazily by warm() on first use
+        self._nlp = None
+        self._load_lock = threading.Lock()
+        self.load_time_seconds: Optional[float] = None
+        self.loaded_at: Optional[datetime] = None
 
         # Common ATS-friendly section headers
         self.standard_sections = {
@@ -52,13 +92,113 @@ class ATSOptimizer:
         # Technical skills database
         self.skill_synonyms = self._load_skill_synonyms()
 
+    @property
+    def nlp(self):
+        """spaCy pipeline, loaded on first access"""
+        if self._nlp is None:
+            self.warm()
+        return self._nlp
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._nlp is not None
+
+    def warm(self) -> float:
+        """
+        Load the spaCy model and keyword analyzer now instead of on the first analysis
+        Safe to call repeatedly and from several threads; returns the load time
+        """
+        with self._load_lock:
+            if self._nlp is not None:
+                return self.load_time_seconds
+
+            started = time.perf_counter()
+
+            import spacy
+
+            # Load spaCy model for NLP (without the components we never read)
+            try:
+                nlp = spacy.load("en_core_web_sm", exclude=self.UNUSED_PIPES)
+            except:
+                logger.warning("spaCy model not found. Installing...")
+                import subprocess
+                subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"])
+                nlp = spacy.load("en_core_web_sm", exclude=self.UNUSED_PIPES)
+
+            keyword_index.warm()
+            self._nlp = nlp
+
+            self.load_time_seconds = time.perf_counter() - started
+            self.loaded_at = datetime.now()
+            logger.info(f"ATS models loaded in {self.load_time_seconds:.2f}s")
+            return self.load_time_seconds
+
+    def get_load_status(self) -> Dict[str, Any]:
+        """Whether the models are loaded and how long loading took"""
+        return {
+            'loaded': self.is_loaded,
+            'load_time_seconds': round(self.load_time_seconds, 3) if self.load_time_seconds else None,
+            'loaded_at': self.loaded_at.isoformat() if self.loaded_at else None,
+            'pipeline': self._nlp.pipe_names if self._nlp is not None else None,
+            'analyzer_version': self.ANALYZER_VERSION
+        }
+
     def analyze_job_description(self, job_description: str) -> Dict[str, Any]:
         """
         Extract key requirements and keywords from job description
         This is the foundation of intelligent matching
         """
-        doc = self.nlp(job_description)
+        return self._build_job_analysis(job_description, self.nlp(job_description))
+
+    def analyze_many(self, descriptions: Iterable[str], n_process: int = 1,
+                     batch_size: int = 64) -> List[Dict[str, Any]]:
+        """
+        Analyze many job descriptions in one pass using nlp.pipe
+        Results are identical to calling analyze_job_description on each one,
+        but parsing is batched and can be spread across n_process workers
+        """
+        descriptions = list(descriptions)
+        if not descriptions:
+            return []
+
+        docs = self.nlp.pipe(descriptions, n_process=n_process, batch_size=batch_size)
+        analyses = [self._build_job_analysis(text, doc) for text, doc in zip(descriptions, docs)]
 
+        logger.info(f"Batch analyzed {len(analyses)} job descriptions (n_process={n_process})")
+        return analyses
+
+    def _skill_sections(self, job_description: str) -> Tuple[str, str]:
+        """Return (required, preferred) section text, falling back to the full description"""
+        sections = self._split_into_sections(job_description)
+
+        required_section = sections.get('requirements', '') + sections.get('required', '')
+        preferred_section = sections.get('preferred', '') + sections.get('nice to have', '')
+
+        return required_section or job_description, preferred_section
+
+    def _skill_section_spans(self, doc) -> Tuple[list, list]:
+        """
+        Return (required, preferred) spans of an already-parsed description,
+        falling back to the whole doc when there is no required section
+        """
+        ranges = self._section_ranges(doc.text)
+
+        def spans_for(*keys):
+            spans = []
+            for key in keys:
+                for start, end in ranges.get(key, []):
+                    span = doc.char_span(start, end, alignment_mode='expand')
+                    if span is not None and len(span):
+                        spans.append(span)
+            return spans
+
+        required_spans = spans_for('requirements', 'required')
+        preferred_spans = spans_for('preferred', 'nice to have')
+
+        return required_spans or [doc[:]], preferred_spans
+
+    def _build_job_analysis(self, job_description: str, doc) -> Dict[str, Any]:
+        """Assemble the job analysis from the one parsed spaCy doc"""
         analysis = {
             'required_skills': [],
             'preferred_skills': [],
@@ -71,17 +211,12 @@ class ATSOptimizer:
             'soft_skills': []
         }
 
-        # Extract sections
-        sections = self._split_into_sections(job_description)
-
-        # Extract required vs preferred skills
-        required_section = sections.get('requirements', '') + sections.get('required', '')
-        preferred_section = sections.get('preferred', '') + sections.get('nice to have', '')
-
-        # Extract skills from each section
-        analysis['required_skills'] = self._extract_skills(required_section or job_description)
+        # Extract skills from each section (section text for patterns, doc spans for noun chunks)
+        required_section, preferred_section = self._skill_sections(job_description)
+        required_spans, preferred_spans = self._skill_section_spans(doc)
+        analysis['required_skills'] = self._extract_skills(required_section, required_spans)
         if preferred_section:
-            analysis['preferred_skills'] = self._extract_skills(preferred_section)
+            analysis['preferred_skills'] = self._extract_skills(preferred_section, preferred_spans)
 
         # Extract years of experience
         experience_pattern = r'(\d+)\+?\s*years?\s*(?:of\s*)?experience'
@@ -126,17 +261,83 @@ class ATSOptimizer:
 
         return analysis
 
+    def _split_into_sections(self, text: str) -> Dict[str, str]:
+        """
+        Split a job description into sections keyed by normalized header
+        Header lines are short lines such as "Requirements:" or "Nice to have"
+        """
+        return {
+            key: '\n'.join(text[start:end] for start, end in ranges).strip()
+            for key, ranges in self._section_ranges(text).items()
+        }
+
+    def _section_ranges(self, text: str) -> Dict[str, List[Tuple[int, int]]]:
+        """Character ranges of each section's lines (inline header text included)"""
+        sections: Dict[str, List[Tuple[int, int]]] = {}
+        current = None
+        offset = 0
+
+        for line in text.split('\n'):
+            header, remainder = self._match_section_header(line)
+            if header:
+                current = header
+                sections.setdefault(current, [])
+                if remainder:
+                    start = offset + line.index(remainder, line.index(':') + 1)
+                    sections[current].append((start, start + len(remainder)))
+            elif current:
+                sections[current].append((offset, offset + len(line)))
+            offset += len(line) + 1
+
+        return sections
+
+    def _match_section_header(self, line: str) -> Tuple[Optional[str], str]:
+        """Return (section key, trailing text) if the line is a section header"""
+        head, sep, remainder = line.partition(':')
+        normalized = head.strip(' \t#*-•').lower()
+
+        if not normalized or len(normalized.split()) > 5:
+            return None, ''
+
+        for key, headers in self.JOB_SECTION_HEADERS.items():
+            if normalized in headers:
+                return key, remainder.strip() if sep else ''
+
+        return None, ''
+
+    def parse_resume(self, resume_path: str) -> Dict[str, Any]:
+        """
+        Read, analyze and format-check a resume file
+        Everything here depends only on the file, so the result is cacheable by content
+        """
+        if resume_path.endswith(('.docx', '.doc')):
+            # Text and format issues come from the same streaming pass
+            inspection = inspect_docx(resume_path)
+            resume_text = inspection['text']
+            format_issues = self._docx_format_issues(inspection)
+        else:
+            resume_text = self._read_resume(resume_path)
+            format_issues = self._check_format_issues(resume_path)
+
+        return {
+            'text': resume_text,
+            'analysis': self._analyze_resume(resume_text),
+            'format_issues': format_issues
+        }
+
     def optimize_resume(self, resume_path: str, job_analysis: Dict[str, Any],
-                       output_path: Optional[str] = None) -> Dict[str, Any]:
+                       output_path: Optional[str] = None,
+                       parsed_resume: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Optimize resume for specific job description
         Returns optimization report and creates optimized version
+        Pass parsed_resume (from parse_resume) to skip re-reading the file
         """
-        # Read current resume
-        resume_text = self._read_resume(resume_path)
+        if parsed_resume is None:
+            parsed_resume = self.parse_resume(resume_path)
 
-        # Analyze current resume
-        resume_analysis = self._analyze_resume(resume_text)
+        resume_text = parsed_resume['text']
+        resume_analysis = parsed_resume['analysis']
 
         # Calculate ATS score
         ats_score = self._calculate_ats_score(resume_analysis, job_analysis)
@@ -151,12 +352,16 @@ class ATSOptimizer:
             'optimized_score': 0
         }
 
-        # Find missing required skills
-        resume_skills = set(resume_analysis['skills'])
-        required_skills = set(job_analysis['required_skills'])
-        missing_skills = required_skills - resume_skills
+        # Find missing required skills (synonyms of a resume skill are not missing)
+        resume_skills = skill_dictionary.canonical_set(resume_analysis['skills'])
+        missing_skills = []
+        for skill in job_analysis['required_skills']:
+            canonical = skill_dictionary.canonical(skill)
+            if canonical and canonical not in resume_skills:
+                resume_skills.add(canonical)
+                missing_skills.append(skill)
 
-        optimization_report['missing_keywords'] = list(missing_skills)
+        optimization_report['missing_keywords'] = missing_skills
 
         # Calculate keyword density
         for keyword in job_analysis['keywords'][:20]:  # Top 20 keywords
@@ -164,7 +369,7 @@ class ATSOptimizer:
             optimization_report['keyword_density'][keyword] = count
 
         # Check format issues
-        optimization_report['format_issues'] = self._check_format_issues(resume_path)
+        optimization_report['format_issues'] = list(parsed_resume['format_issues'])
 
         # Generate recommendations
         recommendations = []
@@ -173,7 +378,7 @@ class ATSOptimizer:
             recommendations.append({
                 'priority': 'HIGH',
                 'action': 'Add missing skills',
-                'details': f"Add these skills to your resume: {', '.join(list(missing_skills)[:5])}"
+                'details': f"Add these skills to your resume: {', '.join(missing_skills[:5])}"
             })
 
         # Check keyword density
@@ -198,24 +403,85 @@ class ATSOptimizer:
 
         optimization_report['recommendations'] = recommendations
 
+        # Score candidate edits incrementally and keep the best one
+        scorer = IncrementalResumeScorer(
+            self, {**resume_analysis, 'format_issues': optimization_report['format_issues']}, job_analysis
+        )
+        best_edit = self._best_edit(scorer, optimization_report)
+        optimization_report['optimized_score'] = best_edit['score'] if best_edit else ats_score
+        optimization_report['best_edit'] = best_edit
+        optimization_report['candidates_evaluated'] = scorer.evaluated
+
         # If output path provided, create optimized version
         if output_path:
-            optimized_text = self._create_optimized_resume(
-                resume_path, resume_text, job_analysis, optimization_report
-            )
+            optimized_text = scorer.apply(best_edit['position'], best_edit['inserted']) if best_edit else resume_text
             self._save_optimized_resume(optimized_text, output_path)
 
-            # Recalculate score for optimized version
-            optimized_analysis = self._analyze_resume(optimized_text)
-            optimization_report['optimized_score'] = self._calculate_ats_score(
-                optimized_analysis, job_analysis
-            )
-
         return optimization_report
 
-    def _extract_skills(self, text: str) -> List[str]:
-        """Extract skills from text using NLP"""
-        doc = self.nlp(text.lower())
+    def _candidate_terms(self, resume_text: str, job_analysis: Dict,
+                         optimization_report: Dict) -> List[List[str]]:
+        """Term pools to insert: missing required skills, then those plus absent top keywords"""
+        skills = optimization_report['missing_keywords'][:self.MAX_TERMS_PER_EDIT]
+        text_lower = resume_text.lower()
+        absent_keywords = [
+            kw for kw in job_analysis['keywords'][:20]
+            if kw.lower() not in text_lower and kw not in skills
+        ]
+
+        pools = [skills] if skills else []
+        with_keywords = (skills + absent_keywords)[:self.MAX_TERMS_PER_EDIT]
+        if with_keywords != skills:
+            pools.append(with_keywords)
+        return pools
+
+    def _best_edit(self, scorer: IncrementalResumeScorer,
+                   optimization_report: Dict) -> Optional[Dict[str, Any]]:
+        """
+        Try inserting every prefix of each term pool after each skills header
+        and return the highest-scoring edit (fewest added terms on ties),
+        or None if no edit raises the score
+        """
+        resume_text = scorer.text
+        anchors = list(self.SKILLS_HEADER_PATTERN.finditer(resume_text))[:self.MAX_EDIT_ANCHORS]
+        if not anchors:
+            return None
+
+        # One batched parse for all pools: every candidate line is a prefix of its pool's line
+        pools = self._candidate_terms(resume_text, scorer.job_analysis, optimization_report)
+        docs = self.nlp.pipe([', '.join(terms) for terms in pools])
+
+        best = None
+        for terms, doc in zip(pools, docs):
+            for count in range(1, len(terms) + 1):
+                section = ', '.join(terms[:count])
+                section_skills = scorer.section_skills(section, doc)
+
+                for anchor in anchors:
+                    inserted = f"\n{section}"
+                    score = scorer.score_insertion(anchor.end(), inserted, section_skills)
+                    if score <= scorer.base_score:
+                        continue
+                    if best is None or score > best['score'] or (
+                        score == best['score'] and count < len(best['added_terms'])
+                    ):
+                        best = {
+                            'score': score,
+                            'position': anchor.end(),
+                            'anchor': anchor.group(0),
+                            'added_terms': terms[:count],
+                            'inserted': inserted
+                        }
+
+        return best
+
+    def _extract_skills(self, text: str, spans=None) -> List[str]:
+        """
+        Extract skills from text using NLP
+        spans are the already-parsed Doc/Spans covering text; parsed here if not given
+        """
+        if spans is None:
+            spans = [self.nlp(text)]
         skills = []
 
         # Common skill patterns
@@ -233,24 +499,18 @@ class ATSOptimizer:
                 skills.extend(items)
 
         # Extract noun phrases that might be skills
-        for chunk in doc.noun_chunks:
-            # Filter for likely skills (2-4 word phrases)
-            if 2 <= len(chunk.text.split()) <= 4:
-                if any(word in chunk.text.lower() for word in
-                      ['analysis', 'management', 'development', 'design',
-                       'testing', 'programming', 'data', 'software']):
-                    skills.append(chunk.text)
+        for span in spans:
+            for chunk in span.noun_chunks:
+                chunk_text = chunk.text.lower()
+                # Filter for likely skills (2-4 word phrases)
+                if 2 <= len(chunk_text.split()) <= 4:
+                    if any(word in chunk_text for word in
+                          ['analysis', 'management', 'development', 'design',
+                           'testing', 'programming', 'data', 'software']):
+                        skills.append(chunk_text)
 
         # Extract known technologies and tools
-        tech_keywords = [
-            'python', 'java', 'javascript', 'sql', 'excel', 'tableau',
-            'power bi', 'aws', 'azure', 'docker', 'kubernetes', 'git',
-            'agile', 'scrum', 'jira', 'salesforce', 'sap', 'oracle'
-        ]
-
-        for tech in tech_keywords:
-            if tech in text.lower():
-                skills.append(tech)
+        skills.extend(self.TECH_KEYWORD_MATCHER.matched(text))
 
         # Clean and deduplicate
         skills = list(set([s.strip() for s in skills if len(s.strip()) > 2]))
@@ -273,19 +533,8 @@ class ATSOptimizer:
             matches = re.findall(pattern, text)
             technologies.extend(matches)
 
-        # Known technology list
-        known_tech = {
-            'Python', 'Java', 'JavaScript', 'TypeScript', 'C++', 'C#',
-            'SQL', 'NoSQL', 'MongoDB', 'PostgreSQL', 'MySQL', 'Redis',
-            'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'Jenkins',
-            'Git', 'GitHub', 'GitLab', 'Jira', 'Confluence',
-            'React', 'Angular', 'Vue', 'Node.js', 'Django', 'Flask',
-            'TensorFlow', 'PyTorch', 'Scikit-learn', 'Pandas', 'NumPy'
-        }
-
-        for tech in known_tech:
-            if tech.lower() in text.lower():
-                technologies.append(tech)
+        # Known technology list (case-insensitive, reported in canonical case)
+        technologies.extend(self.KNOWN_TECHNOLOGY_MATCHER.labels(text))
 
         return list(set(technologies))
 
@@ -308,23 +557,10 @@ class ATSOptimizer:
         return list(set(action_verbs))
 
     def _extract_keywords_tfidf(self, text: str, top_n: int = 30) -> List[str]:
-        """Extract top keywords using TF-IDF"""
+        """Extract top keywords using TF-IDF against the corpus-wide IDF index"""
         try:
-            # Fit and transform the text
-            tfidf_matrix = self.vectorizer.fit_transform([text])
-
-            # Get feature names
-            feature_names = self.vectorizer.get_feature_names_out()
-
-            # Get TF-IDF scores
-            scores = tfidf_matrix.toarray()[0]
-
-            # Create (score, word) pairs and sort
-            word_scores = [(score, word) for word, score in zip(feature_names, scores)]
-            word_scores.sort(reverse=True)
-
-            # Return top keywords
-            return [word for score, word in word_scores[:top_n] if score > 0]
+            # Transform-only: no per-call fitting, so this is safe across threads
+            return keyword_index.top_keywords(text, top_n)
 
         except Exception as e:
             logger.error(f"Error extracting keywords: {e}")
@@ -344,12 +580,21 @@ class ATSOptimizer:
         """
         score = 0
 
-        # Required skills match (40 points)
-        if job_analysis['required_skills']:
-            required_match = len(
-                set(resume_analysis['skills']) & set(job_analysis['required_skills'])
-            ) / len(job_analysis['required_skills'])
-            score += required_match * 40
+        # Required skills match (40 points), compared as canonical skills so synonyms count.
+        # Stored jobs carry their packed skill ID array (see JobAnalysisCache.scoring_analysis);
+        # ad-hoc descriptions have no IDs and compare canonical names
+        job_skill_ids = job_analysis.get('skill_ids')
+        if job_skill_ids is not None:
+            required_count = len(job_skill_ids)
+            hits = skill_dictionary.match_count(
+                job_skill_ids, skill_dictionary.to_array(resume_analysis['skills'])
+            ) if required_count else 0
+        else:
+            required_skills = skill_dictionary.canonical_set(job_analysis['required_skills'])
+            required_count = len(required_skills)
+            hits = len(skill_dictionary.canonical_set(resume_analysis['skills']) & required_skills)
+        if required_count:
+            score += hits / required_count * 40
         else:
             score += 20  # No specific requirements, give partial credit
 
@@ -386,7 +631,7 @@ class ATSOptimizer:
 
         analysis = {
             'text': resume_text,
-            'skills': self._extract_skills(resume_text),
+            'skills': self._extract_skills(resume_text, [doc]),
             'action_verbs': self._extract_action_verbs(doc),
             'education': self._extract_education(resume_text),
             'experience_years': self._extract_experience_years(resume_text),
@@ -447,29 +692,33 @@ class ATSOptimizer:
         # If it's a Word doc, check for problematic elements
         if resume_path.endswith(('.docx', '.doc')):
             try:
-                doc = Document(resume_path)
+                issues.extend(self._docx_format_issues(inspect_docx(resume_path)))
+            except Exception as e:
+                logger.error(f"Error checking format: {e}")
 
-                # Check for tables
-                if doc.tables:
-                    issues.append(f"Contains {len(doc.tables)} tables - may confuse ATS")
+        return issues
 
-                # Check for headers/footers
-                if any(section.header.paragraphs for section in doc.sections):
-                    issues.append("Contains headers - put contact info in main body")
+    def _docx_format_issues(self, inspection: Dict[str, Any]) -> List[str]:
+        """Format issues from a DOCX inspection (see docx_inspector.inspect_docx)"""
+        issues = []
 
-                if any(section.footer.paragraphs for section in doc.sections):
-                    issues.append("Contains footers - avoid footers for ATS")
+        # Check for tables
+        if inspection['tables']:
+            issues.append(f"Contains {inspection['tables']} tables - may confuse ATS")
 
-                # Check for images
-                for paragraph in doc.paragraphs:
-                    if paragraph.runs:
-                        for run in paragraph.runs:
-                            if run._element.xpath('.//a:blip'):
-                                issues.append("Contains images - remove for ATS")
-                                break
+        # Check for headers/footers
+        if inspection['has_headers']:
+            issues.append("Contains headers - put contact info in main body")
 
-            except Exception as e:
-                logger.error(f"Error checking format: {e}")
+        if inspection['has_footers']:
+            issues.append("Contains footers - avoid footers for ATS")
+
+        # Check for images and text boxes
+        if inspection['images']:
+            issues.append("Contains images - remove for ATS")
+
+        if inspection['text_boxes']:
+            issues.append("Contains text boxes - ATS often skips their content")
 
         return issues
 
@@ -480,42 +729,11 @@ class ATSOptimizer:
                 return f.read()
 
         elif resume_path.endswith(('.docx', '.doc')):
-            doc = Document(resume_path)
-            return '\n'.join([paragraph.text for paragraph in doc.paragraphs])
+            return inspect_docx(resume_path)['text']
 
         else:
             raise ValueError(f"Unsupported file format: {resume_path}")
 
-    def _create_optimized_resume(self, original_path: str, original_text: str,
-                                job_analysis: Dict, optimization_report: Dict) -> str:
-        """Create optimized version of resume"""
-        optimized_text = original_text
-
-        # Add missing keywords to skills section
-        if optimization_report['missing_keywords']:
-            # Find skills section
-            skills_section_pattern = r'(Skills?|SKILLS?|Technical Skills?|TECHNICAL SKILLS?)'
-            match = re.search(skills_section_pattern, optimized_text)
-
-            if match:
-                # Add keywords after skills header
-                insert_pos = match.end()
-                keywords_to_add = ', '.join(optimization_report['missing_keywords'][:5])
-                optimized_text = (
-                    optimized_text[:insert_pos] +
-                    f"\n{keywords_to_add}" +
-                    optimized_text[insert_pos:]
-                )
-
-        # Increase keyword density in experience section
-        for keyword in optimization_report['keyword_density']:
-            if optimization_report['keyword_density'][keyword] < 2:
-                # Try to naturally add the keyword
-                # This is simplified - in production, would be more sophisticated
-                pass
-
-        return optimized_text
-
     def _save_optimized_resume(self, optimized_text: str, output_path: str):
         """Save optimized resume to file"""
         if output_path.endswith('.txt'):
@@ -523,6 +741,7 @@ class ATSOptimizer:
                 f.write(optimized_text)
 
         elif output_path.endswith('.docx'):
+            from docx import Document
             doc = Document()
             for line in optimized_text.split('\n'):
                 if line.strip():
@@ -550,17 +769,8 @@ class ATSOptimizer:
         return importance
 
     def _load_skill_synonyms(self) -> Dict[str, List[str]]:
-        """Load skill synonyms for better matching"""
-        return {
-            'python': ['python', 'py', 'python3'],
-            'javascript': ['javascript', 'js', 'es6', 'nodejs', 'node.js'],
-            'machine learning': ['machine learning', 'ml', 'deep learning', 'dl', 'ai'],
-            'data analysis': ['data analysis', 'data analytics', 'analytics'],
-            'project management': ['project management', 'program management', 'pm'],
-            'sql': ['sql', 'mysql', 'postgresql', 'tsql', 't-sql'],
-            'excel': ['excel', 'microsoft excel', 'ms excel', 'spreadsheets'],
-            'communication': ['communication', 'verbal communication', 'written communication'],
-        }
+        """Load skill synonyms for better matching (shared with the skill dictionary)"""
+        return SKILL_SYNONYMS
 
-# Singleton instance
+# Singleton instance (cheap to create - models load on first analysis or warm())
 ats_optimizer = ATSOptimizer()
\ No newline at end of file
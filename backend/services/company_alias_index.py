@@ -0,0 +1,383 @@
+"""
+Company Alias Index - Match recruiting emails to applications with dictionary lookups
+
+Matching an email used to run `Company.website LIKE '%domain%'` or
+`Company.name ILIKE '%name%'` across applications, jobs and companies for
+every message. Neither pattern can use an index, and several matching rows
+made scalar_one_or_none() raise. This index keeps normalized aliases in
+memory instead:
+
+- domain:<registrable domain>  from Company.website and company-site job URLs
+- slug:<label>                 ATS tenant names (acme.wd5.myworkdayjobs.com,
+                               boards.greenhouse.io/acme, acme@myworkday.com)
+                               and the squashed company name
+- name:<normalized name>       company name without punctuation or Inc/LLC
+- token:<word>                 each significant word of the company name
+
+It is loaded once per process and then kept current by SQLAlchemy session
+events: changes to companies, jobs and applications are captured after each
+flush and applied when the transaction commits (dropped on rollback).
+"""
+
+import asyncio
+import re
+from datetime import datetime
+from email.utils import parseaddr
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from backend.core.logging import get_logger
+from backend.models.models import Application, ApplicationStatus, Company, Job
+
+logger = get_logger(__name__)
+
+# Applications an incoming email can still be about
+ACTIVE_STATUSES = {ApplicationStatus.APPLIED, ApplicationStatus.RESPONDED, ApplicationStatus.INTERVIEWING}
+
+# Applicant tracking systems that host many companies as tenants
+ATS_DOMAINS = (
+    'myworkdayjobs.com', 'myworkday.com', 'workday.com', 'greenhouse.io', 'greenhouse-mail.io',
+    'lever.co', 'taleo.net', 'icims.com', 'smartrecruiters.com', 'jobvite.com',
+    'ashbyhq.com', 'successfactors.com', 'bamboohr.com'
+)
+# ATS hosts that put the tenant in the URL path instead of the hostname
+ATS_PATH_TENANTS = ('greenhouse.io', 'lever.co', 'ashbyhq.com', 'smartrecruiters.com', 'jobvite.com')
+# Hosts that never identify the employer
+SHARED_DOMAINS = {
+    'gmail.com', 'yahoo.com', 'outlook.com', 'hotmail.com', 'icloud.com', 'aol.com',
+    'linkedin.com', 'indeed.com', 'indeedemail.com', 'glassdoor.com', 'ziprecruiter.com'
+}
+# Second-level suffixes where the registrable domain has three labels
+COMPOUND_SUFFIXES = {'co.uk', 'org.uk', 'ac.uk', 'com.au', 'co.nz', 'co.in', 'com.br'}
+# Host labels and mailbox names that carry no company information
+GENERIC_LABELS = {
+    'www', 'jobs', 'careers', 'career', 'boards', 'job-boards', 'apply', 'hire', 'recruiting',
+    'talent', 'mail', 'email', 'us', 'eu', 'noreply', 'no-reply', 'donotreply', 'do-not-reply',
+    'notifications', 'notification', 'info', 'hr', 'team', 'jobs-noreply', 'en-us'
+}
+_WORKDAY_SHARD = re.compile(r'^wd\d+$')
+_COMPANY_SUFFIX = re.compile(r'\b(inc|llc|ltd|corp|corporation|company|co|plc|group|holdings)\b\.?', re.IGNORECASE)
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+NAME_STOPWORDS = {'the', 'and', 'of', 'for', 'at', 'a', 'an', 'in'}
+_EPOCH = datetime.min  # Sorts applications without an applied_date last
+
+
+# ----------------------------------------------------------------------
+# Alias normalization
+# ----------------------------------------------------------------------
+
+def normalize_name(name: str) -> str:
+    """'Acme Health, Inc.' -> 'acme health'"""
+    name = _COMPANY_SUFFIX.sub(' ', (name or '').lower().replace('&', ' and '))
+    return ' '.join(_NON_WORD.sub(' ', name).split())
+
+
+def name_tokens(name: str) -> Set[str]:
+    return {t for t in normalize_name(name).split() if len(t) >= 3 and t not in NAME_STOPWORDS}
+
+
+def registrable_domain(host: str) -> Optional[str]:
+    """'careers.acme.co.uk' -> 'acme.co.uk'"""
+    labels = [label for label in (host or '').lower().strip('.').split('.') if label]
+    if len(labels) < 2:
+        return None
+    size = 3 if '.'.join(labels[-2:]) in COMPOUND_SUFFIXES else 2
+    return '.'.join(labels[-size:])
+
+
+def _ats_domain(host: str) -> Optional[str]:
+    for domain in ATS_DOMAINS:
+        if host == domain or host.endswith('.' + domain):
+            return domain
+    return None
+
+
+def _slug(label: str) -> Optional[str]:
+    label = (label or '').lower()
+    for prefix in ('careers-', 'jobs-'):
+        if label.startswith(prefix):
+            label = label[len(prefix):]
+    if not label or label in GENERIC_LABELS or _WORKDAY_SHARD.match(label):
+        return None
+    return _NON_WORD.sub('', label) or None
+
+
+def _ats_tenant(host: str, ats: str, path: str = '') -> Optional[str]:
+    """Tenant slug from an ATS hostname (acme.wd5.myworkdayjobs.com) or path (/acme/jobs/1)"""
+    for label in host[:-len(ats)].rstrip('.').split('.'):
+        slug = _slug(label)
+        if slug:
+            return slug
+    if ats in ATS_PATH_TENANTS:
+        segments = [s for s in path.split('/') if s]
+        if segments:
+            return _slug(segments[0])
+    return None
+
+
+def url_aliases(url: Optional[str]) -> Set[str]:
+    """Aliases of a company website or job posting URL"""
+    if not url:
+        return set()
+    parts = urlsplit(url if '//' in url else f'//{url}')
+    host = (parts.hostname or '').lower()
+    if not host:
+        return set()
+
+    ats = _ats_domain(host)
+    if ats:
+        tenant = _ats_tenant(host, ats, parts.path)
+        return {f'slug:{tenant}'} if tenant else set()
+
+    domain = registrable_domain(host)
+    if not domain or domain in SHARED_DOMAINS:
+        return set()
+    aliases = {f'domain:{domain}'}
+    slug = _slug(domain.split('.')[0])
+    if slug:
+        aliases.add(f'slug:{slug}')
+    return aliases
+
+
+def company_aliases(name: Optional[str], website: Optional[str]) -> Set[str]:
+    aliases = url_aliases(website)
+    normalized = normalize_name(name or '')
+    if normalized:
+        aliases.add(f'name:{normalized}')
+        aliases.add(f"slug:{normalized.replace(' ', '')}")
+        aliases.update(f'token:{token}' for token in name_tokens(normalized))
+    return aliases
+
+
+def sender_keys(sender: str) -> List[str]:
+    """Lookup keys for a From header, most specific first"""
+    address = parseaddr(sender or '')[1].lower()
+    if '@' not in address:
+        return []
+    local, host = address.rsplit('@', 1)
+
+    ats = _ats_domain(host)
+    if ats:
+        # acme@myworkday.com, noreply@acme.greenhouse-mail.io
+        tenant = _ats_tenant(host, ats) or _slug(local)
+        return [f'slug:{tenant}'] if tenant else []
+
+    domain = registrable_domain(host)
+    if not domain or domain in SHARED_DOMAINS:
+        return []
+    keys = [f'domain:{domain}']
+    slug = _slug(domain.split('.')[0])
+    if slug:
+        keys.append(f'slug:{slug}')
+    return keys
+
+
+# ----------------------------------------------------------------------
+# Index
+# ----------------------------------------------------------------------
+
+class CompanyAliasIndex:
+    """Aliases -> companies -> jobs -> the most recent active application"""
+
+    def __init__(self):
+        self._aliases: Dict[str, Set[Tuple[str, int]]] = {}  # alias -> {('company'|'job', id)}
+        self._owner_aliases: Dict[Tuple[str, int], Set[str]] = {}
+        self._job_company: Dict[int, Optional[int]] = {}
+        self._company_jobs: Dict[int, Set[int]] = {}
+        self._job_application: Dict[int, Tuple[int, Any]] = {}  # job_id -> (application_id, applied_date)
+        self._application_job: Dict[int, int] = {}
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        self.stats = {'lookups': 0, 'matches': 0, 'ambiguous': 0}
+
+    # ------------------------------------------------------------------
+    # Mutations (snapshots of plain values, never ORM objects)
+    # ------------------------------------------------------------------
+
+    def _set_aliases(self, owner: Tuple[str, int], aliases: Set[str]):
+        for alias in self._owner_aliases.pop(owner, ()):
+            owners = self._aliases.get(alias)
+            if owners is not None:
+                owners.discard(owner)
+                if not owners:
+                    del self._aliases[alias]
+        if aliases:
+            self._owner_aliases[owner] = aliases
+            for alias in aliases:
+                self._aliases.setdefault(alias, set()).add(owner)
+
+    def put_company(self, company_id: int, name: Optional[str], website: Optional[str]):
+        self._set_aliases(('company', company_id), company_aliases(name, website))
+
+    def remove_company(self, company_id: int):
+        self._set_aliases(('company', company_id), set())
+
+    def put_job(self, job_id: int, company_id: Optional[int], job_url: Optional[str]):
+        old_company = self._job_company.get(job_id)
+        if old_company is not None and old_company != company_id:
+            self._company_jobs.get(old_company, set()).discard(job_id)
+        self._job_company[job_id] = company_id
+        if company_id is not None:
+            self._company_jobs.setdefault(company_id, set()).add(job_id)
+        self._set_aliases(('job', job_id), url_aliases(job_url))
+
+    def remove_job(self, job_id: int):
+        company_id = self._job_company.pop(job_id, None)
+        if company_id is not None:
+            self._company_jobs.get(company_id, set()).discard(job_id)
+        self._set_aliases(('job', job_id), set())
+
+    def put_application(self, application_id: int, job_id: Optional[int], status, applied_date):
+        self.remove_application(application_id)
+        if job_id is None or status not in ACTIVE_STATUSES:
+            return
+        self._application_job[application_id] = job_id
+        self._job_application[job_id] = (application_id, applied_date)
+
+    def remove_application(self, application_id: int):
+        job_id = self._application_job.pop(application_id, None)
+        if job_id is not None and self._job_application.get(job_id, (None,))[0] == application_id:
+            del self._job_application[job_id]
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def _companies(self, alias: str) -> Set[int]:
+        companies = set()
+        for kind, owner_id in self._aliases.get(alias, ()):
+            company_id = owner_id if kind == 'company' else self._job_company.get(owner_id)
+            if company_id is not None:
+                companies.add(company_id)
+        return companies
+
+    def _latest_application(self, companies: Iterable[int]) -> Optional[int]:
+        """Most recently applied active application across the companies' jobs"""
+        best = None
+        for company_id in companies:
+            for job_id in self._company_jobs.get(company_id, ()):
+                entry = self._job_application.get(job_id)
+                if entry is None:
+                    continue
+                if best is None or (entry[1] or _EPOCH) > (best[1] or _EPOCH):
+                    best = entry
+        return best[0] if best else None
+
+    def companies_for_name(self, company_name: str) -> Set[int]:
+        """Exact normalized name, else companies whose name contains every word"""
+        normalized = normalize_name(company_name)
+        if not normalized:
+            return set()
+        exact = self._companies(f'name:{normalized}')
+        if exact:
+            return exact
+        tokens = name_tokens(normalized)
+        if not tokens:
+            return set()
+        return set.intersection(*(self._companies(f'token:{token}') for token in tokens))
+
+    def is_recruiting_sender(self, sender: str) -> bool:
+        """Sender is an applicant tracking system or a company we know about"""
+        address = parseaddr(sender or '')[1].lower()
+        if _ats_domain(address.rsplit('@', 1)[-1]):
+            return True
+        return any(self._companies(key) for key in sender_keys(sender))
+
+    def match(self, sender: str, company_name: Optional[str] = None) -> Optional[int]:
+        """Application ID an email is about: sender domain / ATS tenant first, then company name"""
+        self.stats['lookups'] += 1
+        candidate_sets = [self._companies(key) for key in sender_keys(sender)]
+        if company_name:
+            candidate_sets.append(self.companies_for_name(company_name))
+
+        for companies in candidate_sets:
+            application_id = self._latest_application(companies)
+            if application_id is not None:
+                self.stats['matches'] += 1
+                if len(companies) > 1:
+                    self.stats['ambiguous'] += 1
+                return application_id
+        return None
+
+    # ------------------------------------------------------------------
+    # Loading and session events
+    # ------------------------------------------------------------------
+
+    async def ensure_loaded(self, db: AsyncSession):
+        """Build the index from the database once per process"""
+        if self._loaded:
+            return
+
+        async with self._load_lock:
+            if self._loaded:
+                return
+            companies = await db.execute(select(Company.id, Company.name, Company.website))
+            for row in companies.all():
+                self.put_company(*row)
+            jobs = await db.execute(select(Job.id, Job.company_id, Job.job_url))
+            for row in jobs.all():
+                self.put_job(*row)
+            applications = await db.execute(
+                select(Application.id, Application.job_id, Application.status, Application.applied_date)
+                .where(Application.status.in_(ACTIVE_STATUSES))
+            )
+            for row in applications.all():
+                self.put_application(*row)
+
+            self._loaded = True
+            logger.info(
+                f"Loaded company alias index: {len(self._aliases)} aliases, "
+                f"{len(self._application_job)} active applications"
+            )
+
+    def collect(self, session: Session):
+        """after_flush: snapshot changed rows; applied on commit"""
+        if not self._loaded:
+            return
+        pending = session.info.setdefault('company_alias_changes', [])
+        for obj in list(session.new) + list(session.dirty):
+            if isinstance(obj, Company):
+                pending.append((self.put_company, (obj.id, obj.name, obj.website)))
+            elif isinstance(obj, Job):
+                pending.append((self.put_job, (obj.id, obj.company_id, obj.job_url)))
+            elif isinstance(obj, Application):
+                pending.append((self.put_application, (obj.id, obj.job_id, obj.status, obj.applied_date)))
+        for obj in session.deleted:
+            if isinstance(obj, Company):
+                pending.append((self.remove_company, (obj.id,)))
+            elif isinstance(obj, Job):
+                pending.append((self.remove_job, (obj.id,)))
+            elif isinstance(obj, Application):
+                pending.append((self.remove_application, (obj.id,)))
+
+    def apply(self, session: Session):
+        """after_commit: apply the changes captured since the last commit"""
+        for change, args in session.info.pop('company_alias_changes', ()):
+            change(*args)
+
+    @staticmethod
+    def discard(session: Session, transaction):
+        """after_soft_rollback of the outer transaction: nothing captured was committed"""
+        if not transaction.nested:
+            session.info.pop('company_alias_changes', None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'aliases': len(self._aliases),
+            'companies': sum(1 for kind, _ in self._owner_aliases if kind == 'company'),
+            'active_applications': len(self._application_job),
+            'loaded': self._loaded
+        }
+
+
+# Singleton instance
+company_alias_index = CompanyAliasIndex()
+
+event.listen(Session, 'after_flush', lambda session, context: company_alias_index.collect(session))
+event.listen(Session, 'after_commit', company_alias_index.apply)
+event.listen(Session, 'after_soft_rollback', company_alias_index.discard)
@@ -0,0 +1,175 @@
+"""
+DOCX Inspector - Single streaming pass over a .docx for text and ATS format issues
+
+python-docx builds the whole object model, reads every part (images included)
+into memory, and the old image check ran an XPath query per run. A .docx is a
+zip of XML parts, so this streams only the parts we need with iterparse:
+the main document (text, tables, images, text boxes) plus any header/footer
+parts it references. Image binaries are never read.
+
+Text matches python-docx's '\\n'.join(p.text for p in doc.paragraphs):
+top-level body paragraphs only, runs and hyperlink runs, with tabs, breaks
+and non-breaking hyphens translated the same way.
+"""
+
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Dict, Any, List
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+R_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+PKG_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+A_NS = 'http://schemas.openxmlformats.org/drawingml/2006/main'
+V_NS = 'urn:schemas-microsoft-com:vml'
+
+OFFICE_DOCUMENT_REL = R_NS + '/officeDocument'
+
+
+def _w(tag: str) -> str:
+    return f'{{{W_NS}}}{tag}'
+
+
+BODY = _w('body')
+PARAGRAPH = _w('p')
+RUN = _w('r')
+HYPERLINK = _w('hyperlink')
+TABLE = _w('tbl')
+TEXT = _w('t')
+TEXT_BOX = _w('txbxContent')
+HEADER_REF = _w('headerReference')
+FOOTER_REF = _w('footerReference')
+BREAK = _w('br')
+BREAK_TYPE = _w('type')
+R_ID = f'{{{R_NS}}}id'
+IMAGE_TAGS = {f'{{{A_NS}}}blip', f'{{{V_NS}}}imagedata'}
+
+# Text equivalents of run content, as in python-docx's CT_R.text
+RUN_CHARACTERS = {
+    _w('tab'): '\t',
+    _w('ptab'): '\t',
+    _w('cr'): '\n',
+    _w('noBreakHyphen'): '-',
+}
+
+
+def _relationships(archive: zipfile.ZipFile, part_name: str) -> Dict[str, Dict[str, str]]:
+    """Map relationship id -> {'type', 'target'} for a part (targets resolved to zip names)"""
+    base, name = posixpath.split(part_name)
+    rels_name = posixpath.join(base, '_rels', f'{name}.rels')
+    if rels_name not in archive.namelist():
+        return {}
+
+    with archive.open(rels_name) as f:
+        root = ET.parse(f).getroot()
+
+    rels = {}
+    for rel in root.iter(f'{{{PKG_REL_NS}}}Relationship'):
+        if rel.get('TargetMode') == 'External':
+            continue
+        target = rel.get('Target', '')
+        target = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join(base, target))
+        rels[rel.get('Id')] = {'type': rel.get('Type', ''), 'target': target}
+    return rels
+
+
+def _main_document_part(archive: zipfile.ZipFile) -> str:
+    for rel in _relationships(archive, '').values():
+        if rel['type'] == OFFICE_DOCUMENT_REL:
+            return rel['target']
+    return 'word/document.xml'
+
+
+def _part_has_content(archive: zipfile.ZipFile, part_name: str) -> bool:
+    """True if a header/footer part contains any text or image"""
+    if part_name not in archive.namelist():
+        return False
+
+    with archive.open(part_name) as f:
+        for _, elem in ET.iterparse(f, events=('end',)):
+            if elem.tag == TEXT and elem.text and elem.text.strip():
+                return True
+            if elem.tag in IMAGE_TAGS:
+                return True
+    return False
+
+
+def inspect_docx(path: str) -> Dict[str, Any]:
+    """
+    Stream a .docx once and return its text and format features:
+    {'text', 'tables', 'images', 'text_boxes', 'has_headers', 'has_footers'}
+    Raises zipfile.BadZipFile / KeyError for files that are not valid .docx packages
+    """
+    paragraphs: List[str] = []
+    current: List[str] = []
+    tables = images = text_boxes = 0
+    header_ids: List[str] = []
+    footer_ids: List[str] = []
+
+    with zipfile.ZipFile(path) as archive:
+        document_part = _main_document_part(archive)
+
+        with archive.open(document_part) as f:
+            # Ancestor tags of the element being parsed, so "direct child of a
+            # body-level paragraph" can be told apart from nested content
+            stack: List[str] = []
+
+            for event, elem in ET.iterparse(f, events=('start', 'end')):
+                tag = elem.tag
+
+                if event == 'start':
+                    if tag in IMAGE_TAGS:
+                        images += 1
+                    elif tag == TEXT_BOX:
+                        text_boxes += 1
+                    elif tag == TABLE and stack and stack[-1] == BODY:
+                        tables += 1
+                    stack.append(tag)
+                    continue
+
+                stack.pop()
+                parent = stack[-1] if stack else None
+
+                if parent == RUN and _in_body_paragraph_run(stack):
+                    if tag == TEXT:
+                        current.append(elem.text or '')
+                    elif tag == BREAK:
+                        current.append('\n' if elem.get(BREAK_TYPE, 'textWrapping') == 'textWrapping' else '')
+                    elif tag in RUN_CHARACTERS:
+                        current.append(RUN_CHARACTERS[tag])
+
+                elif tag == HEADER_REF:
+                    header_ids.append(elem.get(R_ID))
+                elif tag == FOOTER_REF:
+                    footer_ids.append(elem.get(R_ID))
+
+                elif parent == BODY:
+                    if tag == PARAGRAPH:
+                        paragraphs.append(''.join(current))
+                        current = []
+                    # Body-level block is finished; drop its subtree to keep memory flat
+                    elem.clear()
+
+        rels = _relationships(archive, document_part)
+        has_headers = any(
+            _part_has_content(archive, rels[rid]['target']) for rid in header_ids if rid in rels
+        )
+        has_footers = any(
+            _part_has_content(archive, rels[rid]['target']) for rid in footer_ids if rid in rels
+        )
+
+    return {
+        'text': '\n'.join(paragraphs),
+        'tables': tables,
+        'images': images,
+        'text_boxes': text_boxes,
+        'has_headers': has_headers,
+        'has_footers': has_footers
+    }
+
+
+def _in_body_paragraph_run(stack: List[str]) -> bool:
+    """stack ends in body/p/r or body/p/hyperlink/r (the runs python-docx reads)"""
+    if len(stack) >= 3 and stack[-2] == PARAGRAPH and stack[-3] == BODY:
+        return True
+    return len(stack) >= 4 and stack[-2] == HYPERLINK and stack[-3] == PARAGRAPH and stack[-4] == BODY
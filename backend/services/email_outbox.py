@@ -0,0 +1,323 @@
+"""
+Email Outbox - Durable, rate-limited queue for outgoing email
+
+Follow-ups used to be sent inline: one blocking Gmail call from whoever
+asked, no retry, no throttling, and a crash between "sent" and "recorded"
+could send the same follow-up again. Callers now write an OutboundEmail row
+(committed with their own transaction) and a single async worker sends due
+rows:
+
+- a token bucket caps sends at OUTBOX_RATE_PER_MINUTE with bursts of
+  OUTBOX_BURST, well under Gmail's per-user sending limits
+- 429/5xx and network errors are retried with exponential backoff
+  (OUTBOX_RETRY_BASE_SECONDS, doubling) up to OUTBOX_MAX_ATTEMPTS; other
+  errors fail the row immediately
+- the idempotency key is unique, so the same logical email is queued once,
+  and a row is marked SENDING (committed) before Gmail is called; a row
+  still SENDING after OUTBOX_SENDING_LEASE_SECONDS had its worker die
+  mid-send and is marked FAILED rather than risk a second copy
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import suppress
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, func
+
+from backend.core.config import settings
+from backend.core.logging import get_logger
+from backend.models.models import OutboundEmail, OutboxStatus
+
+logger = get_logger(__name__)
+
+LATENCY_SAMPLES = 500  # Recent sends kept for latency percentiles
+
+
+def is_retryable(error: Exception) -> bool:
+    """Rate limits, Gmail 5xx and network trouble are worth another attempt"""
+    import httplib2
+    from googleapiclient.errors import HttpError
+    from backend.services.email_service import RETRYABLE_STATUS
+
+    if isinstance(error, HttpError):
+        return error.resp.status in RETRYABLE_STATUS
+    return isinstance(error, (OSError, TimeoutError, httplib2.HttpLib2Error))
+
+
+def _percentiles(samples: Sequence[float]) -> Dict[str, Optional[float]]:
+    if not samples:
+        return {'p50_s': None, 'p95_s': None}
+    ordered = sorted(samples)
+    pick = lambda pct: round(ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))], 3)  # noqa: E731
+    return {'p50_s': pick(50), 'p95_s': pick(95)}
+
+
+class TokenBucket:
+    """rate_per_minute tokens, refilled continuously, at most burst banked"""
+
+    def __init__(self, rate_per_minute: float, burst: int, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.clock = clock
+        self.updated = clock()
+        self.waited_seconds = 0.0
+
+    def delay(self) -> float:
+        """Seconds until a token is available (0.0 if one is now)"""
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    async def acquire(self):
+        while (wait := self.delay()) > 0:
+            self.waited_seconds += wait
+            await asyncio.sleep(wait)
+        self.tokens -= 1
+
+
+class EmailOutbox:
+    """Queue emails in outbound_emails and send them from one background worker"""
+
+    def __init__(self, sender: Optional[Callable[[OutboundEmail], Awaitable[str]]] = None,
+                 session_factory=None):
+        # sender(email) -> Gmail message ID; defaults to email_service.send_message
+        self._sender = sender
+        self._session_factory = session_factory
+        self.bucket = TokenBucket(settings.OUTBOX_RATE_PER_MINUTE, settings.OUTBOX_BURST)
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self.stats = {'enqueued': 0, 'duplicates': 0, 'requeued': 0, 'sent': 0, 'retried': 0, 'failed': 0, 'abandoned': 0}
+        self._queue_latency = deque(maxlen=LATENCY_SAMPLES)  # Enqueue -> sent, seconds
+        self._send_latency = deque(maxlen=LATENCY_SAMPLES)  # Gmail send call, seconds
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    async def enqueue(self, db: AsyncSession, to_address: str, subject: str, body: str,
+                      idempotency_key: str, kind: Optional[str] = None,
+                      application_id: Optional[int] = None,
+                      thread_id: Optional[str] = None,
+                      retry_failed: bool = False) -> Tuple[OutboundEmail, bool]:
+        """
+        Queue an email (committed by the caller, who then calls notify())
+        Returns (row, queued); an existing row with the same key is returned
+        as is with queued False, so a key is only ever sent once. With
+        retry_failed a FAILED row is put back in the queue instead (see
+        requeue) and queued is True
+        """
+        result = await db.execute(
+            select(OutboundEmail).where(OutboundEmail.idempotency_key == idempotency_key)
+        )
+        existing = result.scalar_one_or_none()
+        if existing is not None:
+            if retry_failed and existing.status == OutboxStatus.FAILED:
+                existing.to_address = to_address
+                existing.subject = subject
+                existing.body = body
+                return existing, self.requeue(existing)
+            self.stats['duplicates'] += 1
+            return existing, False
+
+        now = datetime.now()
+        email = OutboundEmail(
+            idempotency_key=idempotency_key,
+            kind=kind,
+            application_id=application_id,
+            to_address=to_address,
+            subject=subject,
+            body=body,
+            thread_id=thread_id,
+            status=OutboxStatus.PENDING,
+            attempts=0,
+            next_attempt_at=now,
+            created_at=now
+        )
+        db.add(email)
+        await db.flush()
+        self.stats['enqueued'] += 1
+        return email, True
+
+    def requeue(self, email: OutboundEmail) -> bool:
+        """
+        Put a FAILED email back in the queue with a fresh attempt budget
+        (committed by the caller). Only for an explicit retry: a row failed
+        by an expired lease may already have been delivered
+        """
+        if email.status != OutboxStatus.FAILED:
+            return False
+        email.status = OutboxStatus.PENDING
+        email.attempts = 0
+        email.next_attempt_at = datetime.now()
+        self.stats['requeued'] += 1
+        logger.info(f"Re-queued failed outbound email {email.id} ({email.idempotency_key})")
+        return True
+
+    def notify(self):
+        """Wake the worker now instead of at its next poll"""
+        if self._wake is not None:
+            self._wake.set()
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name='email-outbox')
+            logger.info("Email outbox worker started")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+            logger.info("Email outbox worker stopped")
+
+    async def _run(self):
+        while True:
+            try:
+                attempted = await self.run_once()
+            except Exception as e:
+                logger.error(f"Email outbox pass failed: {e}")
+                attempted = 0
+            if attempted:
+                continue  # More may be due already
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), settings.OUTBOX_POLL_SECONDS)
+            self._wake.clear()
+
+    def _session(self) -> AsyncSession:
+        if self._session_factory is None:
+            from backend.core.database import AsyncSessionLocal
+            self._session_factory = AsyncSessionLocal
+        return self._session_factory()
+
+    async def run_once(self) -> int:
+        """One worker pass: abandon stale sends, then send every due email; returns emails attempted"""
+        async with self._session() as db:
+            await self._abandon_stale(db)
+            result = await db.execute(
+                select(OutboundEmail)
+                .where(
+                    OutboundEmail.status == OutboxStatus.PENDING,
+                    OutboundEmail.next_attempt_at <= datetime.now()
+                )
+                .order_by(OutboundEmail.next_attempt_at, OutboundEmail.id)
+                .limit(settings.OUTBOX_BATCH_SIZE)
+            )
+            due = result.scalars().all()
+            for email in due:
+                await self.bucket.acquire()
+                await self._deliver(db, email)
+            return len(due)
+
+    async def _abandon_stale(self, db: AsyncSession):
+        cutoff = datetime.now() - timedelta(seconds=settings.OUTBOX_SENDING_LEASE_SECONDS)
+        result = await db.execute(
+            update(OutboundEmail)
+            .where(OutboundEmail.status == OutboxStatus.SENDING, OutboundEmail.next_attempt_at < cutoff)
+            .values(
+                status=OutboxStatus.FAILED,
+                last_error="Send outcome unknown (worker stopped mid-send); not retried to avoid a duplicate"
+            )
+        )
+        if result.rowcount:
+            self.stats['abandoned'] += result.rowcount
+            logger.warning(f"Marked {result.rowcount} interrupted outbound email(s) FAILED")
+            await db.commit()
+
+    async def _send(self, email: OutboundEmail) -> str:
+        if self._sender is not None:
+            return await self._sender(email)
+        from backend.services.email_service import email_service
+        return await email_service.send_message(email.to_address, email.subject, email.body, email.thread_id)
+
+    async def _deliver(self, db: AsyncSession, email: OutboundEmail):
+        # Claim before calling Gmail; next_attempt_at doubles as the lease start
+        email.status = OutboxStatus.SENDING
+        email.attempts = (email.attempts or 0) + 1
+        email.next_attempt_at = datetime.now()
+        await db.commit()
+
+        started = time.perf_counter()
+        try:
+            message_id = await self._send(email)
+        except Exception as e:
+            await self._record_failure(db, email, e)
+            return
+        self._send_latency.append(time.perf_counter() - started)
+
+        email.status = OutboxStatus.SENT
+        email.sent_at = datetime.now()
+        email.gmail_message_id = message_id
+        email.last_error = None
+        await db.commit()
+        self.stats['sent'] += 1
+        if email.created_at:
+            self._queue_latency.append((email.sent_at - email.created_at).total_seconds())
+        logger.info(f"Sent outbound email {email.id} ({email.idempotency_key})")
+
+        await self._after_send(db, email)
+
+    async def _record_failure(self, db: AsyncSession, email: OutboundEmail, error: Exception):
+        email.last_error = f"{type(error).__name__}: {error}"[:2000]
+        if is_retryable(error) and email.attempts < settings.OUTBOX_MAX_ATTEMPTS:
+            delay = settings.OUTBOX_RETRY_BASE_SECONDS * 2 ** (email.attempts - 1)
+            email.status = OutboxStatus.PENDING
+            email.next_attempt_at = datetime.now() + timedelta(seconds=delay)
+            self.stats['retried'] += 1
+            logger.warning(f"Outbound email {email.id} attempt {email.attempts} failed, retrying in {delay:.0f}s: {error}")
+        else:
+            email.status = OutboxStatus.FAILED
+            self.stats['failed'] += 1
+            logger.error(f"Outbound email {email.id} failed after {email.attempts} attempt(s): {error}")
+        await db.commit()
+
+    async def _after_send(self, db: AsyncSession, email: OutboundEmail):
+        """Record the send on whatever queued it"""
+        if email.kind == 'followup' and email.application_id:
+            from backend.services.followup_service import followup_service
+            await followup_service.mark_followup_sent(db, email.application_id)
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    async def get_stats(self, db: AsyncSession) -> Dict[str, Any]:
+        result = await db.execute(
+            select(OutboundEmail.status, func.count(OutboundEmail.id)).group_by(OutboundEmail.status)
+        )
+        depth = {status.value: 0 for status in OutboxStatus}
+        for status, count in result.all():
+            depth[status.value] = count
+
+        oldest = await db.execute(
+            select(func.min(OutboundEmail.created_at)).where(OutboundEmail.status == OutboxStatus.PENDING)
+        )
+        oldest_pending = oldest.scalar()
+
+        return {
+            'queue': depth,
+            'oldest_pending_seconds': (
+                round((datetime.now() - oldest_pending).total_seconds(), 1) if oldest_pending else None
+            ),
+            **self.stats,
+            'queue_latency': _percentiles(self._queue_latency),
+            'send_latency': _percentiles(self._send_latency),
+            'throttled_seconds': round(self.bucket.waited_seconds, 3),
+            'rate_per_minute': settings.OUTBOX_RATE_PER_MINUTE,
+            'worker_running': self._task is not None and not self._task.done()
+        }
+
+
+# Singleton instance
+email_outbox = EmailOutbox()
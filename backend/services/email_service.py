@@ -7,35 +7,145 @@ import os
 import base64
 import re
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, AsyncIterator, Iterable, Tuple
 import asyncio
 import pickle
+import time
 from pathlib import Path
+from urllib.parse import urljoin
 
+import httplib2
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.http import BatchHttpRequest
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select
 
 from backend.core.config import settings
 from backend.core.logging import get_logger
+from backend.core.phrase_matcher import PhraseMatcher
+from backend.services.company_alias_index import company_alias_index
+from backend.services.email_classifier import email_classifier
+from backend.services.gmail_transport import GmailTransport
+from backend.services.raw_message_store import raw_message_store
+from backend.services.system_state import system_state
 from backend.models.models import (
-    EmailTracking, Application, Job, Company,
+    EmailTracking, Application,
     ApplicationStatus, ResponseType
 )
 
 logger = get_logger(__name__)
 
+GMAIL_MAX_BATCH = 100  # Gmail rejects batch requests with more sub-requests
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+GMAIL_SYNC_STATE_KEY = 'gmail_sync'  # system_state key holding the history checkpoint
+# Headers requested in the metadata phase of a two-phase fetch
+METADATA_HEADERS = ['From', 'To', 'Subject', 'Date', 'List-Unsubscribe']
+# Gmail category labels that only hold bulk mail
+BULK_LABELS = {'CATEGORY_PROMOTIONS', 'CATEGORY_SOCIAL', 'CATEGORY_FORUMS', 'SPAM'}
+
+# Classifications that need a reply from the user
+ACTION_REQUIRED = {ResponseType.INTERVIEW, ResponseType.OFFER, ResponseType.INFO_REQUEST}
+
+_END = object()  # Marks the end of a scan pipeline queue
+
+
+def _received_key(email_data: Dict[str, Any]) -> float:
+    """Sort key for "newest message" (parsed dates may be naive, aware or missing)"""
+    date = email_data.get('date')
+    return date.timestamp() if date else 0.0
+
+
+async def _no_pages() -> AsyncIterator[List[str]]:
+    return
+    yield
+
+
+async def _with_retries(retry_ids: List[str], pages: AsyncIterator[List[str]]) -> AsyncIterator[List[str]]:
+    """Earlier scans' failed message IDs (in list-sized pages), then the listing"""
+    size = settings.GMAIL_LIST_PAGE_SIZE
+    for i in range(0, len(retry_ids), size):
+        yield retry_ids[i:i + size]
+    async for page in pages:
+        yield page
+
+
+def _scan_summary(sync_mode: Optional[str]) -> Dict[str, Any]:
+    """Counters for one scan; results keeps only the first GMAIL_SCAN_RESULTS_LIMIT emails"""
+    return {
+        'sync_mode': sync_mode,
+        'emails_listed': 0,
+        'already_processed': 0,
+        'emails_processed': 0,
+        'fetch_errors': 0,
+        'retried': 0,  # Messages that failed in earlier scans, tried again
+        'retry_pending': 0,  # Failed messages the next scan will try again
+        'matched_applications': 0,
+        'threads': 0,  # Distinct threads classified (once per thread per batch)
+        'application_updates': 0,  # Status roll-ups, at most one per thread per commit
+        'by_classification': {},
+        'classifier': None,  # 'model' once trained on confirmed labels, else 'heuristic'
+        'fetch': {
+            'two_phase': False,
+            'metadata_requests': 0,
+            'full_requests': 0,
+            'skipped_by_prefilter': 0,
+            # Gmail's sizeEstimate of the messages downloaded in full / never downloaded
+            'full_bytes_estimate': 0,
+            'skipped_bytes_estimate': 0
+        },
+        'results': []
+    }
+
+
 class EmailAutomationService:
     """Automates email tracking and response detection"""
 
+    # Classification indicators, scored by the share of each list found in an email
+    CLASSIFICATION_KEYWORDS = {
+        # Interview indicators
+        'interview': [
+            'interview', 'phone screen', 'video call', 'meet with',
+            'schedule', 'availability', 'calendar', 'zoom', 'teams',
+            'next steps', 'speak with you', 'conversation', 'discuss'
+        ],
+        # Rejection indicators
+        'rejection': [
+            'unfortunately', 'not selected', 'other candidates',
+            'not moving forward', 'pursue other', 'decided to go',
+            'position has been filled', 'no longer available',
+            'thank you for your interest', 'best of luck', 'future opportunities'
+        ],
+        # Info request indicators
+        'info': [
+            'additional information', 'please provide', 'could you send',
+            'need more details', 'clarification', 'confirm', 'verify'
+        ],
+        # Offer indicators
+        'offer': [
+            'offer', 'compensation', 'salary', 'benefits', 'start date',
+            'pleased to offer', 'congratulations', 'welcome to'
+        ]
+    }
+    CLASSIFICATION_MATCHER = PhraseMatcher.from_groups(CLASSIFICATION_KEYWORDS)
+
+    # Subject phrases that make a message worth downloading in full
+    JOB_SUBJECT_MATCHER = PhraseMatcher([
+        'application', 'applying', 'applied', 'interview', 'candidacy', 'candidate',
+        'position', 'role', 'opportunity', 'offer', 'next steps', 'your interest',
+        'recruit', 'hiring', 'assessment', 'phone screen', 'availability'
+    ])
+
     def __init__(self):
         self.service = None
         self.credentials = None
+        # Scans run their Gmail calls here so they never block the event loop
+        self.transport = GmailTransport(self._new_thread_service)
         self._initialize_gmail()
 
     def _initialize_gmail(self):
@@ -90,111 +200,649 @@ class EmailAutomationService:
                 token.write(creds.to_json())
 
         self.credentials = creds
-        self.service = build('gmail', 'v1', credentials=creds)
+        self.service = self._build_service(credentials=creds)
+        self.transport.reset()
         logger.info("Gmail API initialized successfully")
 
+    def _build_service(self, credentials=None, http=None):
+        """Gmail API client, pointed at GMAIL_API_ENDPOINT when one is configured"""
+        client_options = {'api_endpoint': settings.GMAIL_API_ENDPOINT} if settings.GMAIL_API_ENDPOINT else None
+        return build(
+            'gmail', 'v1',
+            credentials=credentials,
+            http=http,
+            client_options=client_options,
+            cache_discovery=False
+        )
+
+    def _new_thread_service(self):
+        """
+        Gmail client for one transport thread
+        httplib2 connections are not thread-safe, so every thread gets its own
+        """
+        http = httplib2.Http(timeout=settings.GMAIL_HTTP_TIMEOUT)
+        if self.credentials is not None:
+            http = AuthorizedHttp(self.credentials, http=http)
+        return self._build_service(http=http)
+
+    def _new_batch(self, service, callback) -> BatchHttpRequest:
+        """Empty batch request whose callback receives (request_id, response, exception)"""
+        if settings.GMAIL_API_ENDPOINT:
+            # The client applies api_endpoint to regular calls only; the batch
+            # URI comes from the discovery document unless given explicitly
+            return BatchHttpRequest(
+                callback=callback,
+                batch_uri=urljoin(settings.GMAIL_API_ENDPOINT, 'batch/gmail/v1')
+            )
+        return service.new_batch_http_request(callback=callback)
+
+    def _fetch_batch(self, service, message_ids: List[str],
+                     format: str) -> Tuple[Dict[str, Dict], Dict[str, str], List[str]]:
+        """One batch HTTP call (runs on a transport thread): (messages, errors, retryable ids)"""
+        fetched: Dict[str, Dict] = {}
+        errors: Dict[str, str] = {}
+        retry: List[str] = []
+
+        def on_response(request_id, response, exception):
+            if exception is None:
+                fetched[request_id] = response
+                return
+            errors[request_id] = str(exception)
+            if getattr(exception, 'status_code', None) in RETRYABLE_STATUS:
+                retry.append(request_id)
+
+        batch = self._new_batch(service, on_response)
+        for message_id in message_ids:
+            options = {'metadataHeaders': METADATA_HEADERS} if format == 'metadata' else {}
+            batch.add(
+                service.users().messages().get(userId='me', id=message_id, format=format, **options),
+                request_id=message_id
+            )
+        try:
+            batch.execute()
+        except HttpError as e:
+            # The whole batch call failed; every item in it gets the same error
+            errors = {message_id: str(e) for message_id in message_ids}
+            retry = list(message_ids) if e.status_code in RETRYABLE_STATUS else []
+        return fetched, errors, retry
+
+    async def _fetch_messages(self, message_ids: Iterable[str],
+                              format: str = 'full') -> Tuple[Dict[str, Dict], Dict[str, str]]:
+        """
+        Fetch messages with batch requests, at most GMAIL_BATCH_SIZE (<= 100) per HTTP call
+        Batches run concurrently on the transport threads. Returns (messages by id,
+        error by id); items that fail with a rate-limit or server error are
+        retried in up to GMAIL_BATCH_RETRIES further rounds.
+        """
+        batch_size = max(1, min(settings.GMAIL_BATCH_SIZE, GMAIL_MAX_BATCH))
+        fetched: Dict[str, Dict] = {}
+        errors: Dict[str, str] = {}
+        pending = list(dict.fromkeys(message_ids))
+        batches = 0
+
+        for attempt in range(settings.GMAIL_BATCH_RETRIES + 1):
+            chunks = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+            batches += len(chunks)
+            results = await asyncio.gather(*[
+                self.transport.call(lambda service, chunk=chunk: self._fetch_batch(service, chunk, format))
+                for chunk in chunks
+            ])
+
+            retry: List[str] = []
+            for chunk_fetched, chunk_errors, chunk_retry in results:
+                fetched.update(chunk_fetched)
+                for message_id in chunk_fetched:
+                    errors.pop(message_id, None)
+                errors.update(chunk_errors)
+                retry.extend(chunk_retry)
+
+            if not retry or attempt == settings.GMAIL_BATCH_RETRIES:
+                break
+            pending = retry
+            await asyncio.sleep(settings.GMAIL_RETRY_BACKOFF * 2 ** attempt)
+
+        logger.info(
+            f"Fetched {len(fetched)} messages in {batches} batch calls ({len(errors)} failed)"
+        )
+        return fetched, errors
+
+    def _job_query(self, after: str) -> str:
+        """Gmail search for job-related emails received after a date (YYYY/MM/DD) or epoch seconds"""
+        query = f'after:{after} AND ('
+        query += 'from:workday.com OR from:greenhouse.io OR from:lever.co OR '
+        query += 'from:taleo.net OR from:icims.com OR from:myworkdayjobs.com OR '
+        query += 'subject:"application" OR subject:"interview" OR subject:"opportunity" OR '
+        query += 'subject:"position" OR subject:"role" OR subject:"thank you for applying"'
+        query += ')'
+        return query
+
+    async def _list_pages(self, query: str) -> AsyncIterator[List[str]]:
+        """Message IDs matching query, one page at a time, following nextPageToken"""
+        page_token = None
+        while True:
+            results = await self.transport.execute(
+                lambda service, token=page_token: service.users().messages().list(
+                    userId='me',
+                    q=query,
+                    maxResults=settings.GMAIL_LIST_PAGE_SIZE,
+                    pageToken=token
+                )
+            )
+
+            message_ids = [msg['id'] for msg in results.get('messages', [])]
+            if message_ids:
+                yield message_ids
+
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                return
+
+    @staticmethod
+    async def _only(pages: AsyncIterator[List[str]], wanted: set) -> AsyncIterator[List[str]]:
+        async for page in pages:
+            kept = [message_id for message_id in page if message_id in wanted]
+            if kept:
+                yield kept
+
+    async def _history_since(self, history_id: str) -> Optional[Tuple[List[str], str]]:
+        """
+        Messages added to the mailbox since history_id, and the current history ID
+        Returns None when Gmail no longer has history that far back (HTTP 404)
+        """
+        added: List[str] = []
+        latest = history_id
+        page_token = None
+
+        while True:
+            try:
+                response = await self.transport.execute(
+                    lambda service, token=page_token: service.users().history().list(
+                        userId='me',
+                        startHistoryId=history_id,
+                        historyTypes='messageAdded',
+                        pageToken=token
+                    )
+                )
+            except HttpError as e:
+                if e.status_code == 404:
+                    return None
+                raise
+
+            for record in response.get('history', []):
+                for item in record.get('messagesAdded', []):
+                    added.append(item['message']['id'])
+            latest = response.get('historyId', latest)
+
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                return list(dict.fromkeys(added)), latest
+
+    async def _incremental_pages(self, checkpoint: Dict[str, Any]) -> Optional[Tuple[AsyncIterator[List[str]], str]]:
+        """
+        Pages of job-related messages that arrived since the checkpoint, and the new history ID
+        None when the checkpoint has expired and a full scan is needed
+        """
+        history = await self._history_since(checkpoint['history_id'])
+        if history is None:
+            return None
+
+        added, history_id = history
+        if not added:
+            return _no_pages(), history_id
+
+        # History has no search filter: list job-related mail since the last
+        # sync (with a day of slack) and keep only the newly added messages
+        since = datetime.fromisoformat(checkpoint['synced_at']) - timedelta(days=1)
+        pages = self._list_pages(self._job_query(int(since.timestamp())))
+        return self._only(pages, set(added)), history_id
+
     async def scan_for_job_responses(self, db: AsyncSession,
-                                    days_back: int = 30) -> List[Dict[str, Any]]:
+                                    days_back: int = 30,
+                                    incremental: bool = True) -> Dict[str, Any]:
         """
         Scan inbox for job application responses and automatically update database
         This is the core automation that eliminates manual email checking
+
+        With incremental=True and a stored checkpoint, only messages added since
+        the previous scan are fetched (one history call when nothing arrived).
+        Without a checkpoint, or when it has expired, the last days_back days
+        are scanned. Either way the checkpoint moves to the mailbox's current
+        history ID once every page has been processed.
+
+        Messages that fail to fetch, parse or store would never show up in a
+        later history delta, so their IDs are kept with the checkpoint and
+        fetched again by the next GMAIL_FAILED_MESSAGE_RETRIES scans.
+
+        Returns a summary: counts for the whole scan plus the first
+        GMAIL_SCAN_RESULTS_LIMIT processed emails.
         """
         if not self.service:
             logger.error("Gmail service not initialized")
-            return []
+            return _scan_summary(None)
 
         try:
-            # Build search query for job-related emails
-            after_date = (datetime.now() - timedelta(days=days_back)).strftime('%Y/%m/%d')
-            query = f'after:{after_date} AND ('
-            query += 'from:workday.com OR from:greenhouse.io OR from:lever.co OR '
-            query += 'from:taleo.net OR from:icims.com OR from:myworkdayjobs.com OR '
-            query += 'subject:"application" OR subject:"interview" OR subject:"opportunity" OR '
-            query += 'subject:"position" OR subject:"role" OR subject:"thank you for applying"'
-            query += ')'
-
-            # Search for messages
-            results = self.service.users().messages().list(
-                userId='me',
-                q=query,
-                maxResults=100
-            ).execute()
-
-            messages = results.get('messages', [])
-            logger.info(f"Found {len(messages)} potential job-related emails")
-
-            processed_emails = []
-
-            for msg in messages:
-                try:
-                    # Get full message
-                    message = self.service.users().messages().get(
-                        userId='me',
-                        id=msg['id']
-                    ).execute()
+            stored = await system_state.get(db, GMAIL_SYNC_STATE_KEY)
+            checkpoint = stored if incremental else None
+            # message ID -> scans it has failed in so far
+            retry: Dict[str, int] = dict((stored or {}).get('retry', {}))
+            incremental_pages = await self._incremental_pages(checkpoint) if checkpoint else None
+
+            if incremental_pages is not None:
+                pages, history_id = incremental_pages
+                summary = _scan_summary('incremental')
+            else:
+                if checkpoint:
+                    logger.warning("Gmail history checkpoint expired; falling back to a full scan")
+                # Read the history ID before listing so nothing arriving mid-scan is skipped next time
+                profile = await self.transport.execute(lambda service: service.users().getProfile(userId='me'))
+                history_id = profile['historyId']
+                after_date = (datetime.now() - timedelta(days=days_back)).strftime('%Y/%m/%d')
+                pages = self._list_pages(self._job_query(after_date))
+                summary = _scan_summary('full')
+
+            summary['retried'] = len(retry)
+            failed: set = set()
+            await self._run_scan_pipeline(db, _with_retries(list(retry), pages), summary, failed)
+
+            retry = {message_id: retry.get(message_id, 0) + 1 for message_id in failed}
+            given_up = [message_id for message_id, count in retry.items()
+                        if count > settings.GMAIL_FAILED_MESSAGE_RETRIES]
+            if given_up:
+                logger.error(f"Giving up on {len(given_up)} messages that failed in every scan: {given_up}")
+            for message_id in given_up:
+                del retry[message_id]
+            summary['retry_pending'] = len(retry)
+
+            await system_state.set(db, GMAIL_SYNC_STATE_KEY, {
+                'history_id': str(history_id),
+                'synced_at': datetime.now().isoformat(),
+                'retry': retry
+            })
+            await db.commit()
+            logger.info(
+                f"Successfully processed {summary['emails_processed']} new emails "
+                f"of {summary['emails_listed']} listed ({summary['sync_mode']} sync)"
+            )
+            return summary
 
-                    # Extract email data
-                    email_data = self._parse_message(message)
+        except HttpError as error:
+            logger.error(f"Gmail API error: {error}")
+            return _scan_summary(None)
 
-                    # Check if we've already processed this email
-                    existing = await db.execute(
-                        select(EmailTracking).where(
-                            EmailTracking.gmail_id == email_data['gmail_id']
-                        )
-                    )
-                    if existing.scalar_one_or_none():
-                        continue
+    async def _run_scan_pipeline(self, db: AsyncSession, pages: AsyncIterator[List[str]],
+                                 summary: Dict[str, Any], failed: Optional[set] = None):
+        """
+        list pages -> fetch (batched) -> parse/classify/match/persist
 
-                    # Classify the email
-                    classification = self._classify_email(email_data)
-
-                    # Try to match to an application
-                    application = await self._match_to_application(db, email_data)
-
-                    # Create email tracking record
-                    email_tracking = EmailTracking(
-                        gmail_id=email_data['gmail_id'],
-                        thread_id=email_data['thread_id'],
-                        from_address=email_data['from'],
-                        to_address=email_data['to'],
-                        subject=email_data['subject'],
-                        body=email_data['body'][:5000],  # Truncate long emails
-                        received_date=email_data['date'],
-                        classification=classification['type'],
-                        confidence_score=classification['confidence'],
-                        application_id=application.id if application else None,
-                        processed=True,
-                        action_required=classification['action_required']
-                    )
+        Stages are joined by bounded queues, so at most GMAIL_PIPELINE_QUEUE_SIZE
+        pages of IDs and messages are in memory however large the inbox is, and
+        the session is committed every GMAIL_COMMIT_CHUNK emails. Already
+        processed messages are dropped before the fetch, one query per page,
+        and fetched messages are classified in batches of whatever is queued,
+        once per thread (see _classify_threads).
 
-                    db.add(email_tracking)
+        With GMAIL_TWO_PHASE_FETCH the fetch stage first downloads headers only
+        (format=metadata) and fetches full bodies just for messages that pass
+        _is_candidate; the rest are recorded from their headers as OTHER.
 
-                    # Update application status if matched
-                    if application:
-                        await self._update_application_status(
-                            db, application, classification, email_data
-                        )
+        IDs of messages that could not be fetched, parsed or stored are added
+        to failed.
+        """
+        failed = set() if failed is None else failed
+        await company_alias_index.ensure_loaded(db)
+        fetch_stats = summary['fetch']
+        fetch_stats['two_phase'] = settings.GMAIL_TWO_PHASE_FETCH
+        summary['classifier'] = 'model' if email_classifier.is_ready() else 'heuristic'
+
+        id_queue: asyncio.Queue = asyncio.Queue(maxsize=settings.GMAIL_PIPELINE_QUEUE_SIZE)
+        message_queue: asyncio.Queue = asyncio.Queue(
+            maxsize=settings.GMAIL_PIPELINE_QUEUE_SIZE * settings.GMAIL_LIST_PAGE_SIZE
+        )
 
-                    processed_emails.append({
-                        'subject': email_data['subject'],
-                        'from': email_data['from'],
-                        'classification': classification['type'].value,
-                        'matched_application': application.id if application else None
-                    })
+        async def list_stage():
+            try:
+                async for page in pages:
+                    summary['emails_listed'] += len(page)
+                    await id_queue.put(page)
+            finally:
+                await id_queue.put(_END)
+
+        # The fetch and process stages share the session; it allows one operation at a time
+        db_lock = asyncio.Lock()
+        queued: set = set()
+        # thread_id -> newest matched message, applied to its application before each commit
+        thread_updates: Dict[str, Dict[str, Any]] = {}
+
+        async def fetch_stage():
+            try:
+                while (page := await id_queue.get()) is not _END:
+                    async with db_lock:
+                        unseen = await self._unseen_message_ids(db, page, queued)
+                    summary['already_processed'] += len(page) - len(unseen)
+                    if not unseen:
+                        continue
 
-                    logger.info(f"Processed email: {email_data['subject']}")
+                    candidates = unseen
+                    if settings.GMAIL_TWO_PHASE_FETCH:
+                        headers, errors = await self._fetch_messages(unseen, format='metadata')
+                        fetch_stats['metadata_requests'] += len(unseen)
+                        candidates = []
+                        for message_id in unseen:
+                            message = headers.get(message_id)
+                            if message is None:
+                                summary['fetch_errors'] += 1
+                                failed.add(message_id)
+                                logger.error(f"Error fetching message {message_id}: {errors.get(message_id)}")
+                            elif self._is_candidate(message):
+                                candidates.append(message_id)
+                            else:
+                                fetch_stats['skipped_by_prefilter'] += 1
+                                fetch_stats['skipped_bytes_estimate'] += message.get('sizeEstimate', 0)
+                                await message_queue.put((message, False))
+                        if not candidates:
+                            continue
+
+                    # One HTTP round trip per 100 messages instead of one per message
+                    fetched, errors = await self._fetch_messages(candidates)
+                    fetch_stats['full_requests'] += len(candidates)
+                    for message_id in candidates:
+                        message = fetched.get(message_id)
+                        if message is None:
+                            summary['fetch_errors'] += 1
+                            failed.add(message_id)
+                            logger.error(f"Error fetching message {message_id}: {errors.get(message_id)}")
+                            continue
+                        fetch_stats['full_bytes_estimate'] += message.get('sizeEstimate', 0)
+                        await message_queue.put((message, True))
+            finally:
+                await message_queue.put(_END)
+
+        producers = [asyncio.create_task(list_stage()), asyncio.create_task(fetch_stage())]
+        try:
+            uncommitted = 0
+            finished = False
+            while not finished:
+                # Whatever is queued (up to EMAIL_CLASSIFY_BATCH_SIZE) is classified in one call
+                batch = [await message_queue.get()]
+                while len(batch) < settings.EMAIL_CLASSIFY_BATCH_SIZE and not message_queue.empty():
+                    batch.append(message_queue.get_nowait())
+                if _END in batch:
+                    finished = True
+                    batch = batch[:batch.index(_END)]
+
+                prefiltered = [message for message, full in batch if not full]
+                full_messages = [message for message, full in batch if full]
+                parsed = self._parse_messages(full_messages)
+                failed.update(
+                    {message['id'] for message in full_messages} - {message['id'] for message, _ in parsed}
+                )
+                classifications = self._classify_threads([email_data for _, email_data in parsed], summary)
+
+                async with db_lock:
+                    if settings.GMAIL_STORE_RAW_MESSAGES:
+                        await raw_message_store.put_many(db, batch)
+                    for message in prefiltered:
+                        if self._record_prefiltered(db, message):
+                            uncommitted += 1
+                        else:
+                            failed.add(message['id'])
+                    for (message, email_data), classification in zip(parsed, classifications):
+                        if await self._process_message(
+                            db, message, email_data, classification, summary, thread_updates
+                        ):
+                            uncommitted += 1
+                        else:
+                            failed.add(message['id'])
+                    if uncommitted >= settings.GMAIL_COMMIT_CHUNK:
+                        await self._apply_thread_updates(db, thread_updates, summary)
+                        await db.commit()
+                        uncommitted = 0
+            # Surface a failure in the listing or fetch stage
+            await asyncio.gather(*producers)
+            # The caller's final commit carries the last roll-ups
+            await self._apply_thread_updates(db, thread_updates, summary)
+        finally:
+            for task in producers:
+                task.cancel()
+
+    async def reprocess_stored(self, db: AsyncSession, batch_size: int = None) -> Dict[str, Any]:
+        """
+        Re-run parse, classify and match over every stored raw message, without Gmail
+
+        Updates each message's EmailTracking row (body, classification,
+        confidence, action flag, matched application) and commits per batch.
+        Application statuses are left alone: replaying months of mail would
+        move them through every historical state again. Headers-only messages
+        are re-checked against the prefilter; those that would now be fetched
+        in full are counted in needs_full_fetch.
+        """
+        started = time.perf_counter()
+        await company_alias_index.ensure_loaded(db)
+        summary = {
+            'messages': 0,
+            'reprocessed': 0,
+            'reclassified': 0,
+            'rematched': 0,
+            'untracked': 0,
+            'parse_errors': 0,
+            'needs_full_fetch': 0,
+            'by_classification': {},
+            'classifier': 'model' if email_classifier.is_ready() else 'heuristic'
+        }
 
-                except Exception as e:
-                    logger.error(f"Error processing message {msg['id']}: {str(e)}")
-                    continue
+        async for batch in raw_message_store.iter_batches(db, batch_size):
+            summary['messages'] += len(batch)
+            summary['needs_full_fetch'] += sum(
+                1 for message, full in batch if not full and self._is_candidate(message)
+            )
+            parsed = self._parse_messages([message for message, full in batch if full])
+            summary['parse_errors'] += sum(1 for _, full in batch if full) - len(parsed)
+            classifications = self._classify_threads([email_data for _, email_data in parsed])
 
+            result = await db.execute(
+                select(EmailTracking).where(
+                    EmailTracking.gmail_id.in_([email_data['gmail_id'] for _, email_data in parsed])
+                )
+            )
+            tracked = {row.gmail_id: row for row in result.scalars().all()}
+
+            for (_, email_data), classification in zip(parsed, classifications):
+                tracking = tracked.get(email_data['gmail_id'])
+                if tracking is None:
+                    summary['untracked'] += 1
+                    continue
+                application_id = company_alias_index.match(
+                    email_data['from'], self._extract_company_name(email_data)
+                )
+                summary['reclassified'] += tracking.classification != classification['type']
+                summary['rematched'] += tracking.application_id != application_id
+
+                tracking.body = email_data['body'][:5000]
+                tracking.classification = classification['type']
+                tracking.confidence_score = classification['confidence']
+                tracking.action_required = classification['action_required']
+                tracking.application_id = application_id
+                tracking.processed_at = datetime.now()
+
+                kind = classification['type'].value
+                summary['reprocessed'] += 1
+                summary['by_classification'][kind] = summary['by_classification'].get(kind, 0) + 1
             await db.commit()
-            logger.info(f"Successfully processed {len(processed_emails)} new emails")
-            return processed_emails
 
-        except HttpError as error:
-            logger.error(f"Gmail API error: {error}")
-            return []
+        summary['seconds'] = round(time.perf_counter() - started, 3)
+        logger.info(
+            f"Reprocessed {summary['reprocessed']} stored emails in {summary['seconds']}s: "
+            f"{summary['reclassified']} reclassified, {summary['rematched']} rematched"
+        )
+        return summary
+
+    @staticmethod
+    async def _unseen_message_ids(db: AsyncSession, message_ids: List[str], queued: set) -> List[str]:
+        """
+        message_ids not stored in EmailTracking yet (one IN query) and not already
+        queued earlier in this scan; the survivors are added to queued
+        """
+        fresh = [message_id for message_id in dict.fromkeys(message_ids) if message_id not in queued]
+        if fresh:
+            result = await db.execute(
+                select(EmailTracking.gmail_id).where(EmailTracking.gmail_id.in_(fresh))
+            )
+            stored = set(result.scalars().all())
+            fresh = [message_id for message_id in fresh if message_id not in stored]
+        queued.update(fresh)
+        return fresh
+
+    def _is_candidate(self, message: Dict) -> bool:
+        """
+        Phase one: judging by headers and labels only, could this message be
+        about an application? Known company/ATS senders always pass; bulk mail
+        (promotions/social tabs, List-Unsubscribe) never does; anything else
+        passes when its subject reads like a recruiting email.
+        """
+        headers = {h['name'].lower(): h['value'] for h in message.get('payload', {}).get('headers', [])}
+        if company_alias_index.is_recruiting_sender(headers.get('from', '')):
+            return True
+        if BULK_LABELS & set(message.get('labelIds', [])) or 'list-unsubscribe' in headers:
+            return False
+        return bool(self.JOB_SUBJECT_MATCHER.matched(headers.get('subject', '')))
+
+    def _record_prefiltered(self, db: AsyncSession, message: Dict) -> bool:
+        """Track a message ruled out in phase one so later scans skip it too"""
+        try:
+            email_data = self._parse_message(message)
+        except Exception as e:
+            logger.error(f"Error processing message {message.get('id')}: {str(e)}")
+            return False
+
+        db.add(EmailTracking(
+            gmail_id=email_data['gmail_id'],
+            thread_id=email_data['thread_id'],
+            from_address=email_data['from'],
+            to_address=email_data['to'],
+            subject=email_data['subject'],
+            received_date=email_data['date'],
+            classification=ResponseType.OTHER,
+            confidence_score=0.0,
+            processed=True,
+            action_required=False
+        ))
+        return True
+
+    def _parse_messages(self, messages: List[Dict]) -> List[Tuple[Dict, Dict[str, Any]]]:
+        """(message, email_data) for each message that parses; failures are logged and dropped"""
+        parsed = []
+        for message in messages:
+            try:
+                parsed.append((message, self._parse_message(message)))
+            except Exception as e:
+                logger.error(f"Error processing message {message.get('id')}: {str(e)}")
+        return parsed
+
+    async def _process_message(self, db: AsyncSession, message: Dict, email_data: Dict[str, Any],
+                               classification: Dict[str, Any], summary: Dict[str, Any],
+                               thread_updates: Dict[str, Dict[str, Any]]) -> bool:
+        """
+        Store one classified message and queue its application update; False if it failed
+        Only the newest matched message of each thread is kept in thread_updates
+        """
+        try:
+            # Try to match to an application
+            application = await self._match_to_application(db, email_data)
+
+            # Create email tracking record
+            email_tracking = EmailTracking(
+                gmail_id=email_data['gmail_id'],
+                thread_id=email_data['thread_id'],
+                from_address=email_data['from'],
+                to_address=email_data['to'],
+                subject=email_data['subject'],
+                body=email_data['body'][:5000],  # Truncate long emails
+                received_date=email_data['date'],
+                classification=classification['type'],
+                confidence_score=classification['confidence'],
+                application_id=application.id if application else None,
+                processed=True,
+                action_required=classification['action_required']
+            )
+
+            db.add(email_tracking)
+
+            # Update application status if matched (newest message of the thread wins)
+            if application:
+                pending = thread_updates.get(email_data['thread_id'])
+                if pending is None or _received_key(email_data) >= _received_key(pending['email_data']):
+                    thread_updates[email_data['thread_id']] = {
+                        'application_id': application.id,
+                        'classification': classification,
+                        'email_data': email_data
+                    }
+
+            kind = classification['type'].value
+            summary['emails_processed'] += 1
+            summary['by_classification'][kind] = summary['by_classification'].get(kind, 0) + 1
+            if application:
+                summary['matched_applications'] += 1
+            if len(summary['results']) < settings.GMAIL_SCAN_RESULTS_LIMIT:
+                summary['results'].append({
+                    'subject': email_data['subject'],
+                    'from': email_data['from'],
+                    'classification': kind,
+                    'matched_application': application.id if application else None
+                })
+
+            logger.info(f"Processed email: {email_data['subject']}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error processing message {message.get('id')}: {str(e)}")
+            return False
+
+    async def _apply_thread_updates(self, db: AsyncSession, thread_updates: Dict[str, Dict[str, Any]],
+                                    summary: Dict[str, Any]):
+        """
+        Update each pending thread's application once, oldest thread first, so
+        an application in several threads ends in the state of the newest one
+        """
+        for pending in sorted(thread_updates.values(), key=lambda p: _received_key(p['email_data'])):
+            application = await db.get(Application, pending['application_id'])
+            if application is None:
+                continue
+            await self._update_application_status(
+                db, application, pending['classification'], pending['email_data']
+            )
+            summary['application_updates'] += 1
+        thread_updates.clear()
+
+    def _classify_threads(self, emails: List[Dict[str, Any]],
+                          summary: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        One classification per thread, shared by all of its messages in the batch
+
+        Only the newest EMAIL_THREAD_CONTEXT_MESSAGES messages of a thread are
+        classified (all threads in one _classify_batch call). The newest one
+        that isn't OTHER decides, so a bare "thanks!" reply doesn't hide the
+        rejection before it; otherwise the newest message's result stands.
+        """
+        threads: Dict[str, List[int]] = {}
+        for index, email_data in enumerate(emails):
+            threads.setdefault(email_data['thread_id'] or email_data['gmail_id'], []).append(index)
+
+        latest = [
+            sorted(indexes, key=lambda i: _received_key(emails[i]), reverse=True)
+            [:settings.EMAIL_THREAD_CONTEXT_MESSAGES]
+            for indexes in threads.values()
+        ]
+        results = iter(self._classify_batch([emails[i] for indexes in latest for i in indexes]))
+
+        classifications: List[Optional[Dict[str, Any]]] = [None] * len(emails)
+        for indexes, newest_first in zip(threads.values(), latest):
+            candidates = [next(results) for _ in newest_first]
+            decided = next((c for c in candidates if c['type'] != ResponseType.OTHER), candidates[0])
+            for index in indexes:
+                classifications[index] = decided
+        if summary is not None:
+            summary['threads'] += len(threads)
+        return classifications
 
     def _parse_message(self, message: Dict) -> Dict[str, Any]:
         """Extract relevant data from Gmail message"""
@@ -252,7 +900,7 @@ class EmailAutomationService:
                 elif 'parts' in part:
                     # Nested parts
                     body += self._get_message_body(part)
-        elif payload['body'].get('data'):
+        elif payload.get('body', {}).get('data'):
             body = base64.urlsafe_b64decode(
                 payload['body']['data']
             ).decode('utf-8', errors='ignore')
@@ -264,6 +912,34 @@ class EmailAutomationService:
         Classify email as interview, rejection, info request, etc.
         This is where the intelligence happens
         """
+        return self._classify_batch([email_data])[0]
+
+    def _classify_batch(self, emails: List[Dict]) -> List[Dict[str, Any]]:
+        """
+        Classify many emails in one call
+
+        Once the classifier has been trained on confirmed labels every email is
+        scored by the model in one vectorized pass; until then (or if the model
+        fails) each email falls back to the keyword heuristic.
+        """
+        if emails and email_classifier.is_ready():
+            try:
+                return [
+                    {
+                        'type': kind,
+                        'confidence': confidence,
+                        'action_required': kind in ACTION_REQUIRED,
+                        'keywords_found': [],
+                        'source': 'model'
+                    }
+                    for kind, confidence in email_classifier.predict_many(emails)
+                ]
+            except Exception as e:
+                logger.error(f"Email classifier failed, using keyword heuristic: {e}")
+        return [self._heuristic_classification(email_data) for email_data in emails]
+
+    def _heuristic_classification(self, email_data: Dict) -> Dict[str, Any]:
+        """Keyword-share scoring with fixed thresholds (cold-start fallback)"""
         subject = email_data['subject'].lower()
         body = email_data['body'].lower()
         combined_text = subject + ' ' + body
@@ -272,54 +948,16 @@ class EmailAutomationService:
             'type': ResponseType.OTHER,
             'confidence': 0.0,
             'action_required': False,
-            'keywords_found': []
+            'keywords_found': [],
+            'source': 'heuristic'
         }
 
-        # Interview indicators
-        interview_keywords = [
-            'interview', 'phone screen', 'video call', 'meet with',
-            'schedule', 'availability', 'calendar', 'zoom', 'teams',
-            'next steps', 'speak with you', 'conversation', 'discuss'
-        ]
-
-        # Rejection indicators
-        rejection_keywords = [
-            'unfortunately', 'not selected', 'other candidates',
-            'not moving forward', 'pursue other', 'decided to go',
-            'position has been filled', 'no longer available',
-            'thank you for your interest', 'best of luck', 'future opportunities'
-        ]
-
-        # Info request indicators
-        info_keywords = [
-            'additional information', 'please provide', 'could you send',
-            'need more details', 'clarification', 'confirm', 'verify'
-        ]
-
-        # Offer indicators
-        offer_keywords = [
-            'offer', 'compensation', 'salary', 'benefits', 'start date',
-            'pleased to offer', 'congratulations', 'welcome to'
-        ]
-
-        # Score each category
-        scores = {}
-
-        # Interview scoring
-        interview_score = sum(1 for kw in interview_keywords if kw in combined_text)
-        scores['interview'] = interview_score / len(interview_keywords)
-
-        # Rejection scoring
-        rejection_score = sum(1 for kw in rejection_keywords if kw in combined_text)
-        scores['rejection'] = rejection_score / len(rejection_keywords)
-
-        # Info request scoring
-        info_score = sum(1 for kw in info_keywords if kw in combined_text)
-        scores['info'] = info_score / len(info_keywords)
-
-        # Offer scoring
-        offer_score = sum(1 for kw in offer_keywords if kw in combined_text)
-        scores['offer'] = offer_score / len(offer_keywords)
+        # Score each category by the share of its indicators found (one pass over the text)
+        hits = self.CLASSIFICATION_MATCHER.count_by_label(combined_text)
+        scores = {
+            category: hits[category] / len(keywords)
+            for category, keywords in self.CLASSIFICATION_KEYWORDS.items()
+        }
 
         # Determine classification based on highest score
         if scores['offer'] > 0.2:
@@ -346,53 +984,19 @@ class EmailAutomationService:
         """
         Match email to an existing application
         This connects emails to specific job applications automatically
-        """
-        # Extract company name from email
-        from_domain = email_data['from'].split('@')[-1].split('.')[0]
 
-        # Common ATS domain mappings
-        ats_company_mappings = {
-            'workday': None,  # Need to parse company from email
-            'greenhouse': None,
-            'lever': None,
-            'taleo': None,
-            'icims': None
-        }
-
-        # Try to extract company name from subject or body
-        company_name = self._extract_company_name(email_data)
+        Sender domain / ATS tenant and the company name found in the email are
+        looked up in the in-memory alias index; when several active
+        applications match, the most recently applied one wins.
+        """
+        await company_alias_index.ensure_loaded(db)
 
-        if not company_name:
-            # Try to match by email domain
-            result = await db.execute(
-                select(Application).join(Job).join(Company).where(
-                    and_(
-                        Application.status.in_([
-                            ApplicationStatus.APPLIED,
-                            ApplicationStatus.RESPONDED,
-                            ApplicationStatus.INTERVIEWING
-                        ]),
-                        Company.website.like(f'%{from_domain}%')
-                    )
-                ).order_by(Application.applied_date.desc())
-            )
-            return result.scalar_one_or_none()
-
-        # Try to match by company name
-        result = await db.execute(
-            select(Application).join(Job).join(Company).where(
-                and_(
-                    Application.status.in_([
-                        ApplicationStatus.APPLIED,
-                        ApplicationStatus.RESPONDED,
-                        ApplicationStatus.INTERVIEWING
-                    ]),
-                    Company.name.ilike(f'%{company_name}%')
-                )
-            ).order_by(Application.applied_date.desc())
+        application_id = company_alias_index.match(
+            email_data['from'], self._extract_company_name(email_data)
         )
-
-        return result.scalar_one_or_none()
+        if application_id is None:
+            return None
+        return await db.get(Application, application_id)
 
     def _extract_company_name(self, email_data: Dict) -> Optional[str]:
         """Extract company name from email content"""
@@ -444,34 +1048,41 @@ class EmailAutomationService:
 
         logger.info(f"Updated application {application.id} status to {application.status.value}")
 
-    async def send_follow_up(self, to_email: str, subject: str,
-                            body: str, thread_id: Optional[str] = None) -> bool:
-        """Send a follow-up email"""
+    async def send_message(self, to_email: str, subject: str,
+                           body: str, thread_id: Optional[str] = None) -> str:
+        """
+        Send one email and return its Gmail message ID
+        Raises HttpError (or ConnectionError when Gmail isn't set up) instead of
+        swallowing failures, so the outbox can decide whether to retry
+        """
         if not self.service:
-            logger.error("Gmail service not initialized")
-            return False
+            raise ConnectionError("Gmail service not initialized")
+
+        message = {
+            'raw': base64.urlsafe_b64encode(
+                f"To: {to_email}\n"
+                f"Subject: {subject}\n\n"
+                f"{body}".encode()
+            ).decode()
+        }
 
-        try:
-            message = {
-                'raw': base64.urlsafe_b64encode(
-                    f"To: {to_email}\n"
-                    f"Subject: {subject}\n\n"
-                    f"{body}".encode()
-                ).decode()
-            }
-
-            if thread_id:
-                message['threadId'] = thread_id
-
-            sent_message = self.service.users().messages().send(
-                userId='me',
-                body=message
-            ).execute()
+        if thread_id:
+            message['threadId'] = thread_id
 
+        sent_message = await self.transport.execute(
+            lambda service: service.users().messages().send(userId='me', body=message)
+        )
+        return sent_message.get('id')
+
+    async def send_follow_up(self, to_email: str, subject: str,
+                            body: str, thread_id: Optional[str] = None) -> bool:
+        """Send a follow-up email right away (scheduled follow-ups go through the outbox)"""
+        try:
+            await self.send_message(to_email, subject, body, thread_id)
             logger.info(f"Sent follow-up email: {subject}")
             return True
 
-        except HttpError as error:
+        except (HttpError, ConnectionError) as error:
             logger.error(f"Failed to send email: {error}")
             return False
 
@@ -12,9 +12,10 @@ import json
 
 from backend.core.logging import get_logger
 from backend.models.models import (
-    Application, ApplicationStatus, Job, Company, FollowUp
+    Application, ApplicationStatus, Job, Company, FollowUp, OutboxStatus
 )
 from backend.core.config import settings
+from backend.services.email_outbox import email_outbox
 
 logger = get_logger(__name__)
 
@@ -425,21 +426,29 @@ class FollowUpService:
         self,
         db: AsyncSession,
         application_id: int,
-        email_service
+        email_service=None,
+        retry_failed: bool = False
     ) -> Dict[str, Any]:
         """
-        Send follow-up email with safety override
+        Queue a follow-up email with safety override
 
         Uses TEST_RECIPIENT_OVERRIDE to send all emails to the test address
-        Only sends if LIVE_SEND_MODE is True
+        Only queues if LIVE_SEND_MODE is True. The email outbox worker sends
+        it (rate-limited, retried) and marks the follow-up sent once Gmail
+        accepts it; calling again for the same follow-up returns the queued
+        email instead of sending a second one, even if that email FAILED.
+        A FAILED email is only queued again with retry_failed=True (or via
+        POST /email/outbox/{id}/retry): one abandoned mid-send may already
+        have been delivered.
 
         Args:
             db: Async database session
             application_id: Application to follow up on
-            email_service: EmailAutomationService instance
+            email_service: Unused; sending goes through the email outbox
+            retry_failed: Explicitly re-queue this follow-up if its last send FAILED
 
         Returns:
-            Result dictionary with send status
+            Result dictionary with queue status
         """
         try:
             # Get application with related data
@@ -476,38 +485,43 @@ class FollowUpService:
 
             # SAFETY: Always use TEST_RECIPIENT_OVERRIDE
             recipient = settings.TEST_RECIPIENT_OVERRIDE
+            if not recipient:
+                return {'success': False, 'error': 'TEST_RECIPIENT_OVERRIDE is not set'}
             logger.info(
-                f"[SAFETY OVERRIDE] Sending follow-up to TEST address: {recipient} "
+                f"[SAFETY OVERRIDE] Queueing follow-up to TEST address: {recipient} "
                 f"(Application #{application_id}: {app.job.company.name if app.job.company else 'Unknown'})"
             )
 
-            # Send the email
-            success = await email_service.send_follow_up(
-                to_email=recipient,
+            # Queue the email; the key pins it to this application's next follow-up
+            email, queued = await email_outbox.enqueue(
+                db,
+                to_address=recipient,
                 subject=subject,
-                body=body
+                body=body,
+                idempotency_key=f"followup:{application_id}:{(app.follow_ups_sent or 0) + 1}",
+                kind='followup',
+                application_id=application_id,
+                retry_failed=retry_failed
             )
-
-            if success:
-                # Mark as sent in database
-                await self.mark_followup_sent(db, application_id)
-
-                return {
-                    'success': True,
-                    'application_id': application_id,
-                    'recipient': recipient,
-                    'timestamp': datetime.now().isoformat(),
-                    'job_title': app.job.title,
-                    'company': app.job.company.name if app.job.company else 'Unknown'
-                }
-            else:
-                return {
-                    'success': False,
-                    'error': 'Email send failed (check email_service logs)'
-                }
+            await db.commit()
+            email_outbox.notify()
+
+            return {
+                'success': email.status != OutboxStatus.FAILED,
+                'queued': True,
+                'duplicate': not queued,
+                'outbox_id': email.id,
+                'outbox_status': email.status.value,
+                'application_id': application_id,
+                'recipient': recipient,
+                'timestamp': datetime.now().isoformat(),
+                'job_title': app.job.title,
+                'company': app.job.company.name if app.job.company else 'Unknown'
+            }
 
         except Exception as e:
-            logger.error(f"Error sending follow-up email: {e}")
+            logger.error(f"Error queueing follow-up email: {e}")
+            await db.rollback()
             return {'success': False, 'error': str(e)}
 
 
@@ -0,0 +1,296 @@
+"""
+Job Ranker - Score one resume against every open job in a single vectorized pass
+
+Scoring a resume job-by-job means one _calculate_ats_score call per job with
+Python set intersections and substring scans inside. The ranker instead builds
+sparse job x skill and job x keyword matrices once (from cached analyses) and
+computes the same 0-100 ATS score for all jobs with a few matrix products.
+Skill columns are canonical skill IDs from the skill dictionary: each job's
+row is its stored Job.skill_ids array, so synonyms line up and the skill
+strings are never re-resolved.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+
+from backend.core.logging import get_logger
+from backend.core.phrase_matcher import PhraseMatcher
+from backend.models.models import Job, Company
+from backend.services.analysis_cache import job_analysis_cache
+from backend.services.skill_dictionary import skill_dictionary
+
+logger = get_logger(__name__)
+
+# Job statuses considered open for ranking (same set the jobs API treats as active)
+OPEN_JOB_STATUSES = ["new", "researching", "ready"]
+
+
+class JobRanker:
+    """Holds the job matrices for all open jobs and ranks resumes against them"""
+
+    # Weights mirror ATSOptimizer._calculate_ats_score
+    REQUIRED_SKILLS_POINTS = 40
+    NO_REQUIREMENTS_POINTS = 20
+    KEYWORD_POINTS = 30
+    FORMAT_POINTS = 15
+    EXPERIENCE_POINTS = 10
+    EXPERIENCE_PARTIAL_POINTS = 5
+    EDUCATION_POINTS = 5
+    TOP_KEYWORDS = 20
+
+    def __init__(self):
+        self.jobs: List[Dict[str, Any]] = []
+        self.built_at: Optional[float] = None
+        self.build_seconds: Optional[float] = None
+        self._stale = True
+        self._build_lock = asyncio.Lock()
+        self._swap_lock = threading.Lock()
+        self._matrices: Optional[Dict[str, Any]] = None
+
+    def invalidate(self):
+        """Mark the matrices stale (called whenever jobs are created, edited or deleted)"""
+        self._stale = True
+
+    async def ensure_built(self, db: AsyncSession):
+        """Rebuild the matrices if any job changed since the last build"""
+        if not self._stale and self._matrices is not None:
+            return
+
+        async with self._build_lock:
+            if not self._stale and self._matrices is not None:
+                return
+
+            # Clear first so changes made during the rebuild trigger another one
+            self._stale = False
+            started = time.perf_counter()
+            try:
+                await self._rebuild(db)
+            except Exception:
+                self._stale = True
+                raise
+
+            self.build_seconds = time.perf_counter() - started
+            self.built_at = time.time()
+            logger.info(f"Built ranking matrices for {len(self.jobs)} open jobs in {self.build_seconds:.2f}s")
+
+    async def _rebuild(self, db: AsyncSession):
+        """Load open jobs with their cached analyses and swap in fresh matrices"""
+        # Jobs stored before skill_ids existed get their arrays first
+        await job_analysis_cache.backfill_skill_ids(db)
+        await skill_dictionary.ensure_loaded(db)
+
+        result = await db.execute(
+            select(Job.id, Job.title, Company.name, Job.job_description, Job.skill_ids)
+            .join(Company, Job.company_id == Company.id)
+            .where(
+                Job.status.in_(OPEN_JOB_STATUSES),
+                Job.job_description.is_not(None),
+                Job.job_description != ''
+            )
+            .order_by(Job.id)
+        )
+        rows = result.all()
+
+        analyses = await job_analysis_cache.get_or_analyze_many(
+            db, [row.job_description for row in rows]
+        )
+        jobs = [
+            {'id': row.id, 'title': row.title, 'company': row.name, 'analysis': analysis,
+             'skill_ids': skill_dictionary.decode(row.skill_ids)}
+            for row, analysis in zip(rows, analyses)
+        ]
+
+        matrices = await asyncio.to_thread(self._build_matrices, jobs)
+        with self._swap_lock:
+            # Results only need the job identity; the analyses live in the matrices now
+            self.jobs = [{k: v for k, v in job.items() if k not in ('analysis', 'skill_ids')} for job in jobs]
+            self._matrices = matrices
+
+    def _build_matrices(self, jobs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Encode every job's requirements as sparse rows and dense per-job vectors"""
+        import numpy as np
+        from scipy import sparse
+
+        keyword_vocab: Dict[str, int] = {}
+        education_levels: Dict[str, int] = {}
+        skill_arrays = []
+        keyword_rows, keyword_cols = [], []
+
+        n_jobs = len(jobs)
+        required_counts = np.zeros(n_jobs)
+        keyword_counts = np.zeros(n_jobs)
+        experience_years = np.zeros(n_jobs)
+        education_codes = np.full(n_jobs, -1, dtype=np.int64)
+
+        for row, job in enumerate(jobs):
+            analysis = job['analysis']
+
+            skill_ids = job['skill_ids']
+            required_counts[row] = len(skill_ids)
+            skill_arrays.append(skill_ids)
+
+            top_keywords = analysis['keywords'][:self.TOP_KEYWORDS]
+            keyword_counts[row] = len(top_keywords)
+            for keyword in top_keywords:
+                keyword_rows.append(row)
+                keyword_cols.append(keyword_vocab.setdefault(keyword.lower(), len(keyword_vocab)))
+
+            experience_years[row] = analysis.get('experience_years') or 0
+            if analysis.get('education_level'):
+                education_codes[row] = education_levels.setdefault(
+                    analysis['education_level'], len(education_levels)
+                )
+
+        # Each row is a job's sorted skill ID array, so indices/indptr are just the concatenation
+        skill_indptr = np.zeros(n_jobs + 1, dtype=np.int64)
+        np.cumsum([len(ids) for ids in skill_arrays], out=skill_indptr[1:])
+        skill_indices = np.concatenate(skill_arrays) if skill_arrays else np.zeros(0, dtype=np.uint32)
+        # IDs registered by another process since the dictionary loaded still get a column
+        n_skill_columns = max(skill_dictionary.max_id, int(skill_indices.max(initial=0))) + 1
+        skill_matrix = sparse.csr_matrix(
+            (np.ones(len(skill_indices)), skill_indices.astype(np.int32), skill_indptr),
+            shape=(n_jobs, n_skill_columns)
+        )
+
+        # Duplicate (row, col) pairs are summed, matching the per-keyword loop in the scorer
+        keyword_matrix = sparse.csr_matrix(
+            (np.ones(len(keyword_rows)), (keyword_rows, keyword_cols)),
+            shape=(n_jobs, len(keyword_vocab))
+        )
+
+        # Compile here, in the build thread, rather than on the first ranking request
+        keyword_matcher = PhraseMatcher(keyword_vocab)
+        keyword_matcher.regex
+
+        return {
+            'keyword_vocab': keyword_vocab,
+            'keyword_matcher': keyword_matcher,
+            'education_list': list(education_levels),
+            'skill_matrix': skill_matrix,
+            'keyword_matrix': keyword_matrix,
+            'required_counts': required_counts,
+            'keyword_counts': keyword_counts,
+            'experience_years': experience_years,
+            'education_codes': education_codes
+        }
+
+    def score_all(self, resume_analysis: Dict[str, Any]):
+        """
+        ATS score of the resume against every open job (same formula as
+        ATSOptimizer._calculate_ats_score), returned as a float score array
+        plus the per-job component arrays
+        """
+        import numpy as np
+
+        with self._swap_lock:
+            m = self._matrices
+            jobs = self.jobs
+        n_jobs = len(jobs)
+        if m is None or n_jobs == 0:
+            return jobs, np.zeros(0), {}
+
+        # Resume side: one indicator vector per vocabulary (skills registered after
+        # the build can't appear in any job row, so they are dropped)
+        n_skill_columns = m['skill_matrix'].shape[1]
+        skill_ids = skill_dictionary.to_array(resume_analysis['skills'])
+        skill_vector = np.zeros(n_skill_columns)
+        skill_vector[skill_ids[skill_ids < n_skill_columns]] = 1
+
+        # Substring presence of every job keyword in one pass over the resume
+        keyword_vector = np.zeros(len(m['keyword_vocab']))
+        keyword_cols = [m['keyword_vocab'][k] for k in m['keyword_matcher'].matched(resume_analysis['text'])]
+        keyword_vector[keyword_cols] = 1
+
+        # Required skills (40 points), or partial credit when a job lists none
+        has_requirements = m['required_counts'] > 0
+        skill_hits = m['skill_matrix'] @ skill_vector
+        required_match = np.divide(
+            skill_hits, m['required_counts'],
+            out=np.zeros(n_jobs), where=has_requirements
+        )
+        score = np.where(
+            has_requirements,
+            required_match * self.REQUIRED_SKILLS_POINTS,
+            self.NO_REQUIREMENTS_POINTS
+        )
+
+        # Keyword presence (30 points)
+        keyword_hits = m['keyword_matrix'] @ keyword_vector
+        keyword_match = np.divide(
+            keyword_hits, m['keyword_counts'],
+            out=np.zeros(n_jobs), where=m['keyword_counts'] > 0
+        )
+        score = score + keyword_match * self.KEYWORD_POINTS
+
+        # Format compatibility (15 points) - a property of the resume alone
+        format_issues = resume_analysis.get('format_issues', [])
+        score = score + max(0, self.FORMAT_POINTS - len(format_issues) * 3)
+
+        # Experience match (10 points)
+        resume_years = resume_analysis.get('experience_years', 0)
+        score = score + np.where(
+            m['experience_years'] > 0,
+            np.where(resume_years >= m['experience_years'],
+                     self.EXPERIENCE_POINTS, self.EXPERIENCE_PARTIAL_POINTS),
+            0
+        )
+
+        # Education match (5 points) - only a handful of distinct levels to test
+        resume_education = resume_analysis.get('education', '')
+        level_matches = np.array(
+            [level in resume_education for level in m['education_list']] + [False]
+        )
+        # Code -1 (no requirement) indexes the trailing False
+        score = score + np.where(level_matches[m['education_codes']], self.EDUCATION_POINTS, 0)
+
+        components = {
+            'required_skill_match': required_match,
+            'keyword_match': keyword_match,
+            'skill_hits': skill_hits,
+            'keyword_hits': keyword_hits
+        }
+        return jobs, score, components
+
+    def rank(self, resume_analysis: Dict[str, Any], top_k: int = 10) -> List[Dict[str, Any]]:
+        """Top-k open jobs for a resume, best ATS score first"""
+        import numpy as np
+
+        jobs, score, components = self.score_all(resume_analysis)
+        if not jobs:
+            return []
+
+        final_scores = np.minimum(100, score.astype(np.int64))
+
+        # Best score first, ties broken by job order so results are deterministic
+        ordered = np.lexsort((np.arange(len(jobs)), -final_scores))[:top_k]
+
+        return [
+            {
+                'job_id': jobs[i]['id'],
+                'title': jobs[i]['title'],
+                'company': jobs[i]['company'],
+                'ats_score': int(final_scores[i]),
+                'required_skill_match': round(float(components['required_skill_match'][i]), 3),
+                'keyword_match': round(float(components['keyword_match'][i]), 3)
+            }
+            for i in ordered
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        m = self._matrices
+        return {
+            'jobs_indexed': len(self.jobs),
+            'skills': len(skill_dictionary),
+            'keywords': len(m['keyword_vocab']) if m else 0,
+            'stale': self._stale,
+            'build_seconds': round(self.build_seconds, 3) if self.build_seconds else None
+        }
+
+
+# Singleton instance
+job_ranker = JobRanker()
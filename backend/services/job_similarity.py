@@ -0,0 +1,245 @@
+"""
+Job Similarity Index - MinHash signatures and LSH buckets over job descriptions
+
+The same posting arrives from LinkedIn, Indeed and the company site with
+slightly different text. Each description is reduced to a MinHash signature
+(min of N universal hashes over its 3-word shingles), so the fraction of equal
+signature slots estimates the Jaccard similarity of the shingle sets. The
+signature is cut into bands; jobs sharing any band land in the same bucket,
+so a lookup only compares against the few jobs it collides with instead of
+every job in the table.
+
+Signatures are stored on Job.minhash; the bucket tables live in memory and
+are loaded once per process, then kept up to date on create/update/delete.
+"""
+
+import asyncio
+import re
+import zlib
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update
+
+from backend.core.config import settings
+from backend.core.logging import get_logger
+from backend.models.models import Job
+
+logger = get_logger(__name__)
+
+SHINGLE_SIZE = 3
+MERSENNE_PRIME = (1 << 31) - 1  # a * crc32 + b stays below 2**63, so uint64 math never overflows
+HASH_SEED = 20251016  # Fixed so stored signatures stay comparable across restarts
+
+_TOKEN = re.compile(r'\w+')
+
+
+def shingles(text: str) -> Set[str]:
+    """Overlapping word 3-grams of the lowercased text (whole text if shorter)"""
+    words = _TOKEN.findall(text.lower())
+    if len(words) <= SHINGLE_SIZE:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+class JobSimilarityIndex:
+    """MinHash signatures of every job plus banded LSH buckets"""
+
+    def __init__(self, num_perm: int = None, bands: int = None):
+        self.num_perm = num_perm or settings.JOB_MINHASH_PERMUTATIONS
+        self.bands = bands or settings.JOB_LSH_BANDS
+        if self.num_perm % self.bands:
+            raise ValueError(f"{self.bands} bands do not divide {self.num_perm} permutations")
+        self.rows = self.num_perm // self.bands
+
+        # Hash coefficients and the signature matrix need numpy; built on first use
+        # so importing the singleton stays cheap
+        self._a = None
+        self._b = None
+        self._matrix = None
+        self._rows: Dict[int, int] = {}
+        self._free_rows: List[int] = []
+        self._buckets: List[Dict[bytes, Set[int]]] = [{} for _ in range(self.bands)]
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+
+    def _ensure_arrays(self):
+        if self._matrix is not None:
+            return
+        import numpy as np
+
+        rng = np.random.default_rng(HASH_SEED)
+        self._a = rng.integers(1, MERSENNE_PRIME, size=(self.num_perm, 1), dtype=np.uint64)
+        self._b = rng.integers(0, MERSENNE_PRIME, size=(self.num_perm, 1), dtype=np.uint64)
+        # Signatures are rows of one matrix so candidates are scored in a single comparison
+        self._matrix = np.zeros((0, self.num_perm), dtype=np.uint32)
+
+    # ------------------------------------------------------------------
+    # Signatures
+    # ------------------------------------------------------------------
+
+    def signature(self, text: Optional[str]):
+        """uint32 MinHash signature of a description (None when it has no words)"""
+        import numpy as np
+
+        grams = shingles(text or '')
+        if not grams:
+            return None
+        self._ensure_arrays()
+        hashes = np.fromiter(
+            (zlib.crc32(g.encode('utf-8')) for g in grams), dtype=np.uint64, count=len(grams)
+        )
+        # One row per permutation: (a * h + b) mod p, minimized over the shingles
+        permuted = (self._a * hashes + self._b) % MERSENNE_PRIME
+        return permuted.min(axis=1).astype(np.uint32)
+
+    @staticmethod
+    def encode(signature) -> Optional[bytes]:
+        return None if signature is None else signature.tobytes()
+
+    def decode(self, blob: Optional[bytes]):
+        """Stored signature, or None if missing or made with a different length"""
+        import numpy as np
+
+        if not blob or len(blob) != self.num_perm * 4:
+            return None
+        return np.frombuffer(blob, dtype=np.uint32)
+
+    @staticmethod
+    def similarity(sig_a, sig_b) -> float:
+        """Estimated Jaccard similarity of the two shingle sets"""
+        return float((sig_a == sig_b).mean())
+
+    # ------------------------------------------------------------------
+    # LSH buckets
+    # ------------------------------------------------------------------
+
+    def _band_keys(self, signature) -> List[bytes]:
+        return [
+            signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            for band in range(self.bands)
+        ]
+
+    def add(self, job_id: int, signature):
+        """Index (or re-index) a job's signature"""
+        import numpy as np
+
+        self.remove(job_id)
+        if signature is None:
+            return
+        self._ensure_arrays()
+
+        if not self._free_rows:
+            # Grow geometrically so adds stay amortized O(1)
+            capacity = len(self._matrix)
+            grown = np.zeros((max(64, capacity * 2), self.num_perm), dtype=np.uint32)
+            grown[:capacity] = self._matrix
+            self._matrix = grown
+            self._free_rows = list(range(len(grown) - 1, capacity - 1, -1))
+
+        row = self._free_rows.pop()
+        self._matrix[row] = signature
+        self._rows[job_id] = row
+        for buckets, key in zip(self._buckets, self._band_keys(signature)):
+            buckets.setdefault(key, set()).add(job_id)
+
+    def remove(self, job_id: int):
+        row = self._rows.pop(job_id, None)
+        if row is None:
+            return
+        signature = self._matrix[row].copy()
+        self._free_rows.append(row)
+        for buckets, key in zip(self._buckets, self._band_keys(signature)):
+            members = buckets.get(key)
+            if members is not None:
+                members.discard(job_id)
+                if not members:
+                    del buckets[key]
+
+    def candidates(self, signature) -> Set[int]:
+        """Jobs sharing at least one band with the signature"""
+        found: Set[int] = set()
+        for buckets, key in zip(self._buckets, self._band_keys(signature)):
+            found.update(buckets.get(key, ()))
+        return found
+
+    def query(self, signature, min_similarity: float = None, limit: int = 10,
+              exclude: Optional[int] = None) -> List[Tuple[int, float]]:
+        """(job_id, similarity) pairs at or above min_similarity, most similar first"""
+        if signature is None:
+            return []
+        min_similarity = settings.JOB_SIMILAR_THRESHOLD if min_similarity is None else min_similarity
+
+        import numpy as np
+
+        job_ids = [job_id for job_id in self.candidates(signature) if job_id != exclude]
+        if not job_ids:
+            return []
+
+        rows = np.fromiter((self._rows[job_id] for job_id in job_ids), dtype=np.int64, count=len(job_ids))
+        scores = (self._matrix[rows] == signature).mean(axis=1)
+
+        scored = [(job_id, float(score)) for job_id, score in zip(job_ids, scores) if score >= min_similarity]
+        scored.sort(key=lambda pair: (-pair[1], pair[0]))
+        return scored[:limit]
+
+    def find_duplicate(self, signature, exclude: Optional[int] = None) -> Optional[Tuple[int, float]]:
+        """Closest indexed job if it is a near-duplicate, else None"""
+        matches = self.query(signature, settings.JOB_DUPLICATE_THRESHOLD, limit=1, exclude=exclude)
+        return matches[0] if matches else None
+
+    def signature_of(self, job_id: int):
+        row = self._rows.get(job_id)
+        return None if row is None else self._matrix[row].copy()
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    async def ensure_loaded(self, db: AsyncSession):
+        """Load every stored signature once, computing any that are missing"""
+        if self._loaded:
+            return
+
+        async with self._load_lock:
+            if self._loaded:
+                return
+
+            result = await db.execute(select(Job.id, Job.minhash, Job.job_description))
+            backfill = []
+            for job_id, blob, description in result.all():
+                signature = self.decode(blob)
+                if signature is None and description:
+                    backfill.append((job_id, description))
+                else:
+                    self.add(job_id, signature)
+
+            if backfill:
+                signatures = await asyncio.to_thread(
+                    lambda: [(job_id, self.signature(text)) for job_id, text in backfill]
+                )
+                for job_id, signature in signatures:
+                    self.add(job_id, signature)
+                # Bulk UPDATE by primary key, one statement for all rows
+                await db.execute(
+                    update(Job),
+                    [{'id': job_id, 'minhash': self.encode(signature)} for job_id, signature in signatures]
+                )
+                await db.commit()
+                logger.info(f"Computed MinHash signatures for {len(backfill)} jobs")
+
+            self._loaded = True
+            logger.info(f"Loaded {len(self._rows)} job signatures into the similarity index")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'jobs_indexed': len(self._rows),
+            'permutations': self.num_perm,
+            'bands': self.bands,
+            'buckets': sum(len(b) for b in self._buckets),
+            'loaded': self._loaded
+        }
+
+
+# Singleton instance
+job_similarity_index = JobSimilarityIndex()
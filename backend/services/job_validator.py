@@ -12,6 +12,7 @@ import requests
 from urllib.parse import urlparse
 from typing import Dict, Any
 from backend.core.logging import get_logger
+from backend.core.phrase_matcher import PhraseMatcher
 
 logger = get_logger(__name__)
 
@@ -42,6 +43,9 @@ class JobValidator:
         'applications closed', 'hiring complete', 'role filled', 'expired'
     ]
 
+    OPEN_MATCHER = PhraseMatcher(OPEN_KEYWORDS)
+    CLOSED_MATCHER = PhraseMatcher(CLOSED_KEYWORDS)
+
     def validate_job_url(self, job_url: str) -> Dict[str, Any]:
         """
         Perform direct HTTP request to job URL and verify it's real and open
@@ -100,10 +104,10 @@ class JobValidator:
                 text = response.text.lower()
 
                 # Check for OPEN indicators
-                has_apply_button = any(kw in text for kw in self.OPEN_KEYWORDS)
+                has_apply_button = self.OPEN_MATCHER.contains_any(text)
 
                 # Check for CLOSED indicators
-                is_closed = any(kw in text for kw in self.CLOSED_KEYWORDS)
+                is_closed = self.CLOSED_MATCHER.contains_any(text)
 
                 if is_closed:
                     result['appears_open'] = False
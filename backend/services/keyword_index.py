@@ -0,0 +1,254 @@
+"""
+Keyword Document-Frequency Index
+Corpus-wide IDF for TF-IDF keyword extraction
+
+Fitting a TfidfVectorizer on a single description makes IDF constant, so the
+ranking was really term frequency. This index keeps document frequencies for
+every Job.job_description and is updated incrementally as jobs are added,
+edited or deleted; extraction is then transform-only (tokenize + lookup).
+
+Terms are hashed into a fixed number of buckets so memory stays flat
+(16 MB by default) no matter how many 1-3 grams a 10k+ posting corpus has.
+"""
+
+import asyncio
+import math
+import os
+import threading
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+
+from backend.core.config import settings
+from backend.core.logging import get_logger
+from backend.models.models import Job
+
+logger = get_logger(__name__)
+
+
+class KeywordIndex:
+    """Hashed document-frequency table over the job description corpus"""
+
+    # Same tokenization the ATS optimizer has always used for keywords
+    NGRAM_RANGE = (1, 3)
+    STOP_WORDS = 'english'
+
+    def __init__(self, path: Optional[str] = None, n_buckets: int = None):
+        self.path = Path(path or Path(settings.DATA_DIR) / "keyword_df_index.npz")
+        self.n_buckets = n_buckets or settings.ATS_KEYWORD_INDEX_BUCKETS
+        self.n_docs = 0
+        self.dirty = False
+        self._doc_freq = None  # numpy int32 array, created on first use
+        self._analyzer = None
+        self._loaded_mtime: Optional[float] = None
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # Tokenization and lookups
+    # ------------------------------------------------------------------
+
+    @property
+    def analyzer(self):
+        """sklearn's word n-gram analyzer (stateless, so safe to share between threads)"""
+        if self._analyzer is None:
+            from sklearn.feature_extraction.text import TfidfVectorizer
+            self._analyzer = TfidfVectorizer(
+                ngram_range=self.NGRAM_RANGE,
+                stop_words=self.STOP_WORDS
+            ).build_analyzer()
+        return self._analyzer
+
+    @property
+    def doc_freq(self):
+        if self._doc_freq is None:
+            import numpy as np
+            with self._lock:
+                if self._doc_freq is None:
+                    self._doc_freq = np.zeros(self.n_buckets, dtype=np.int32)
+        return self._doc_freq
+
+    def warm(self):
+        """Import sklearn and allocate the table ahead of the first request"""
+        return self.analyzer, self.doc_freq
+
+    def _bucket(self, term: str) -> int:
+        # crc32 is stable across processes, unlike hash()
+        return zlib.crc32(term.encode('utf-8')) % self.n_buckets
+
+    def _buckets(self, text: str) -> List[int]:
+        return list({self._bucket(term) for term in self.analyzer(text)})
+
+    def idf(self, term: str) -> float:
+        """Smoothed IDF, matching TfidfVectorizer(smooth_idf=True)"""
+        df = int(self.doc_freq[self._bucket(term)])
+        return math.log((1 + self.n_docs) / (1 + df)) + 1
+
+    def top_keywords(self, text: str, top_n: int = 30) -> List[str]:
+        """
+        Rank the terms of one document by TF x corpus IDF
+        Read-only: never refits anything, so concurrent calls are safe
+        """
+        term_counts = Counter(self.analyzer(text))
+        doc_freq = self.doc_freq
+        log_docs = math.log(1 + self.n_docs)
+
+        scored = [
+            (count * (log_docs - math.log(1 + int(doc_freq[self._bucket(term)])) + 1), term)
+            for term, count in term_counts.items()
+        ]
+        scored.sort(reverse=True)
+        return [term for score, term in scored[:top_n] if score > 0]
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+
+    def add_document(self, text: Optional[str]):
+        self._apply(text, 1)
+
+    def remove_document(self, text: Optional[str]):
+        self._apply(text, -1)
+
+    def replace_document(self, old_text: Optional[str], new_text: Optional[str]):
+        self.remove_document(old_text)
+        self.add_document(new_text)
+
+    def _apply(self, text: Optional[str], delta: int):
+        if not text:
+            return
+        buckets = self._buckets(text)
+        with self._lock:
+            doc_freq = self.doc_freq
+            doc_freq[buckets] += delta
+            if delta < 0:
+                doc_freq[buckets] = doc_freq[buckets].clip(min=0)
+            self.n_docs = max(0, self.n_docs + delta)
+            self.dirty = True
+
+    def add_many(self, texts: Iterable[Optional[str]]):
+        for text in texts:
+            self.add_document(text)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self):
+        """Write non-zero buckets to disk atomically (sparse, compressed)"""
+        import numpy as np
+
+        with self._lock:
+            doc_freq = self.doc_freq
+            buckets = np.flatnonzero(doc_freq).astype(np.uint32)
+            counts = doc_freq[buckets]
+            n_docs = self.n_docs
+            self.dirty = False
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp.npz')
+        np.savez_compressed(
+            tmp_path,
+            buckets=buckets,
+            counts=counts,
+            n_docs=np.int64(n_docs),
+            n_buckets=np.int64(self.n_buckets)
+        )
+        os.replace(tmp_path, self.path)
+        logger.info(f"Saved keyword index: {n_docs} documents, {len(buckets)} terms")
+
+    def load(self) -> bool:
+        """Load from disk; returns False if there is no usable index file"""
+        import numpy as np
+
+        if not self.path.exists():
+            return False
+
+        try:
+            mtime = self.path.stat().st_mtime
+            with np.load(self.path) as data:
+                if int(data['n_buckets']) != self.n_buckets:
+                    logger.warning("Keyword index bucket count changed, rebuilding")
+                    return False
+                doc_freq = np.zeros(self.n_buckets, dtype=np.int32)
+                doc_freq[data['buckets']] = data['counts']
+                with self._lock:
+                    self._doc_freq = doc_freq
+                    self.n_docs = int(data['n_docs'])
+                    self.dirty = False
+                    self._loaded_mtime = mtime
+        except Exception as e:
+            logger.error(f"Could not load keyword index: {e}")
+            return False
+
+        logger.info(f"Loaded keyword index: {self.n_docs} documents")
+        return True
+
+    def reload_if_changed(self) -> bool:
+        """
+        Pick up a newer index file written by another process
+        Used by ATS worker processes, which read the index but never update it
+        """
+        try:
+            mtime = self.path.stat().st_mtime
+        except OSError:
+            return False
+        if mtime == self._loaded_mtime:
+            return False
+        return self.load()
+
+    async def rebuild(self, db: AsyncSession, chunk_size: int = 500):
+        """Recompute document frequencies from every job description"""
+        import numpy as np
+
+        with self._lock:
+            self._doc_freq = np.zeros(self.n_buckets, dtype=np.int32)
+            self.n_docs = 0
+
+        result = await db.stream(
+            select(Job.job_description).where(Job.job_description.is_not(None))
+        )
+        async for chunk in result.scalars().partitions(chunk_size):
+            await asyncio.to_thread(self.add_many, chunk)
+
+        await asyncio.to_thread(self.save)
+        logger.info(f"Rebuilt keyword index from {self.n_docs} job descriptions")
+
+    async def sync(self, db: AsyncSession):
+        """Load the persisted index, rebuilding if it disagrees with the jobs table"""
+        loaded = await asyncio.to_thread(self.load)
+
+        result = await db.execute(
+            select(func.count(Job.id)).where(
+                Job.job_description.is_not(None),
+                Job.job_description != ''
+            )
+        )
+        corpus_size = result.scalar() or 0
+
+        if not loaded or corpus_size != self.n_docs:
+            logger.info(
+                f"Keyword index out of date ({self.n_docs} indexed, {corpus_size} jobs), rebuilding"
+            )
+            await self.rebuild(db)
+
+    def flush(self):
+        """Persist pending incremental updates"""
+        if self.dirty:
+            self.save()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'documents': self.n_docs,
+            'buckets': self.n_buckets,
+            'occupied_buckets': int((self.doc_freq > 0).sum()) if self._doc_freq is not None else 0,
+            'dirty': self.dirty,
+            'path': str(self.path)
+        }
+
+
+# Singleton instance
+keyword_index = KeywordIndex()
@@ -0,0 +1,185 @@
+"""
+Raw Message Store
+Gmail message resources exactly as fetched, compressed, keyed by gmail_id
+
+EmailTracking keeps only the first 5,000 characters of a body, so improving
+the parser, classifier or matcher used to mean fetching every message from
+Gmail again. Scans now also store each fetched resource here as
+zlib-compressed JSON, with base64 bodies inlined as text first so they
+compress, and EmailAutomationService.reprocess_stored replays
+parse/classify/match from this table at disk speed.
+
+Each row carries the sha256 of its uncompressed JSON: storing a message whose
+content hash is unchanged is a no-op, and a headers-only copy never replaces
+a full one. Rows are added to the caller's session and committed with it,
+like the EmailTracking rows they back.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import zlib
+from typing import Dict, Any, AsyncIterator, List, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, func
+
+from backend.core.config import settings
+from backend.models.models import RawMessage
+
+FULL = 'full'
+METADATA = 'metadata'
+
+
+def _canonical(message: Dict[str, Any]) -> bytes:
+    return json.dumps(message, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+
+def _b64(text: str) -> str:
+    return base64.urlsafe_b64encode(text.encode('utf-8')).decode('ascii')
+
+
+def _inline_bodies(part: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy of a payload part with base64url body data replaced by its text
+    Base64 barely compresses; the text it encodes does. Only applied when
+    the text encodes back to exactly the same data, so decoding is lossless.
+    """
+    part = dict(part)
+    body = part.get('body')
+    if body and isinstance(body.get('data'), str):
+        data = body['data']
+        try:
+            text = base64.urlsafe_b64decode(data + '=' * (-len(data) % 4)).decode('utf-8')
+        except (ValueError, UnicodeDecodeError):
+            text = None
+        if text is not None and _b64(text) in (data, data + '=' * (-len(data) % 4)):
+            body = {key: value for key, value in body.items() if key != 'data'}
+            body['text'] = text
+            body['padded'] = data.endswith('=') or not len(data) % 4
+            part['body'] = body
+    if 'parts' in part:
+        part['parts'] = [_inline_bodies(child) for child in part['parts']]
+    return part
+
+
+def _restore_bodies(part: Dict[str, Any]) -> Dict[str, Any]:
+    body = part.get('body')
+    if body and 'text' in body:
+        data = _b64(body.pop('text'))
+        body['data'] = data if body.pop('padded') else data.rstrip('=')
+    for child in part.get('parts', []):
+        _restore_bodies(child)
+    return part
+
+
+def encode(message: Dict[str, Any]) -> Tuple[str, bytes, int]:
+    """(content hash, compressed bytes, uncompressed size) for one message resource"""
+    raw = _canonical(message)
+    stored = dict(message)
+    if 'payload' in stored:
+        stored['payload'] = _inline_bodies(stored['payload'])
+    return (
+        hashlib.sha256(raw).hexdigest(),
+        zlib.compress(_canonical(stored), settings.RAW_MESSAGE_COMPRESSION_LEVEL),
+        len(raw)
+    )
+
+
+def decode(data: bytes) -> Dict[str, Any]:
+    message = json.loads(zlib.decompress(data))
+    if 'payload' in message:
+        _restore_bodies(message['payload'])
+    return message
+
+
+class RawMessageStore:
+    """Write-through archive of fetched messages in the raw_messages table"""
+
+    async def put_many(self, db: AsyncSession, messages: List[Tuple[Dict[str, Any], bool]]) -> int:
+        """
+        Store (message, full) pairs (committed by the caller); returns rows written
+        One IN query finds existing rows; compression runs off the event loop
+        """
+        if not messages:
+            return 0
+
+        ids = [message['id'] for message, _ in messages]
+        result = await db.execute(
+            select(RawMessage.gmail_id, RawMessage.content_hash, RawMessage.format)
+            .where(RawMessage.gmail_id.in_(ids))
+        )
+        existing = {gmail_id: (content_hash, format) for gmail_id, content_hash, format in result.all()}
+        encoded = await asyncio.to_thread(lambda: [encode(message) for message, _ in messages])
+
+        written = 0
+        for (message, full), (content_hash, data, raw_size) in zip(messages, encoded):
+            format = FULL if full else METADATA
+            values = {
+                'thread_id': message.get('threadId'),
+                'format': format,
+                'content_hash': content_hash,
+                'raw_size': raw_size,
+                'data': data
+            }
+            stored = existing.get(message['id'])
+            if stored is None:
+                db.add(RawMessage(gmail_id=message['id'], **values))
+            elif stored[0] == content_hash or (stored[1] == FULL and format == METADATA):
+                continue
+            else:
+                await db.execute(
+                    update(RawMessage).where(RawMessage.gmail_id == message['id']).values(**values)
+                )
+            existing[message['id']] = (content_hash, format)
+            written += 1
+        return written
+
+    async def get(self, db: AsyncSession, gmail_id: str):
+        """The stored message resource, or None"""
+        row = await db.get(RawMessage, gmail_id)
+        return decode(row.data) if row is not None else None
+
+    async def iter_batches(self, db: AsyncSession,
+                           batch_size: int = None) -> AsyncIterator[List[Tuple[Dict[str, Any], bool]]]:
+        """
+        Every stored message as (message, full) pairs, batch_size rows at a time
+        Keyset-paginated on gmail_id, so the caller may write between batches
+        """
+        batch_size = batch_size or settings.EMAIL_REPROCESS_BATCH_SIZE
+        after = ''
+        while True:
+            result = await db.execute(
+                select(RawMessage.gmail_id, RawMessage.format, RawMessage.data)
+                .where(RawMessage.gmail_id > after)
+                .order_by(RawMessage.gmail_id)
+                .limit(batch_size)
+            )
+            rows = result.all()
+            if not rows:
+                return
+            after = rows[-1].gmail_id
+            yield await asyncio.to_thread(lambda: [(decode(row.data), row.format == FULL) for row in rows])
+
+    async def get_stats(self, db: AsyncSession) -> Dict[str, Any]:
+        result = await db.execute(
+            select(
+                RawMessage.format,
+                func.count(RawMessage.gmail_id),
+                func.coalesce(func.sum(RawMessage.raw_size), 0),
+                func.coalesce(func.sum(func.length(RawMessage.data)), 0)
+            ).group_by(RawMessage.format)
+        )
+        stats = {'messages': 0, 'full': 0, 'metadata': 0, 'raw_bytes': 0, 'stored_bytes': 0}
+        for format, count, raw_bytes, stored_bytes in result.all():
+            stats[format] = count
+            stats['messages'] += count
+            stats['raw_bytes'] += raw_bytes
+            stats['stored_bytes'] += stored_bytes
+        stats['compression_ratio'] = round(stats['raw_bytes'] / stats['stored_bytes'], 2) if stats['stored_bytes'] else None
+        return stats
+
+
+# Singleton instance
+raw_message_store = RawMessageStore()
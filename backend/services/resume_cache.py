@@ -0,0 +1,148 @@
+"""
+Parsed Resume Cache
+Content-addressed cache of resume text, analysis and format issues
+
+The same few resumes are uploaded over and over to /ats/score,
+/ats/optimize-resume and /ats/generate-optimized. Entries are keyed by
+sha256(file bytes) + file extension + ATSOptimizer.ANALYZER_VERSION, so a
+repeat upload skips the tempfile, python-docx and spaCy entirely.
+Held in a bounded in-process LRU, optionally mirrored to JSON files under DATA_DIR.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from backend.core.config import settings
+from backend.core.logging import get_logger
+from backend.services.ats_optimizer import ats_optimizer
+from backend.services.ats_executor import ats_executor
+
+logger = get_logger(__name__)
+
+
+class ResumeCache:
+    """Bounded memory LRU (plus optional disk store) of parsed resumes"""
+
+    def __init__(self, max_entries: int = None, persist: Optional[bool] = None,
+                 cache_dir: Optional[str] = None, max_disk_entries: int = None):
+        self.max_entries = max_entries or settings.RESUME_CACHE_SIZE
+        self.persist = settings.RESUME_CACHE_PERSIST if persist is None else persist
+        self.cache_dir = Path(cache_dir or Path(settings.DATA_DIR) / "resume_cache")
+        self.max_disk_entries = max_disk_entries or settings.RESUME_CACHE_DISK_ENTRIES
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+
+    @staticmethod
+    def content_hash(content: bytes) -> str:
+        """Hash of the uploaded file bytes"""
+        return hashlib.sha256(content).hexdigest()
+
+    def _key(self, content: bytes, filename: str) -> str:
+        # The extension decides how the file is read and which format checks apply
+        suffix = Path(filename or '').suffix
+        return f"{self.content_hash(content)}{suffix}.v{ats_optimizer.ANALYZER_VERSION}"
+
+    def _remember(self, key: str, parsed: Dict[str, Any]):
+        with self._lock:
+            self._entries[key] = parsed
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _disk_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _load_from_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._disk_path(key)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable resume cache entry {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+    def _save_to_disk(self, key: str, parsed: Dict[str, Any]):
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._disk_path(key)
+            tmp_path = path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(parsed, f)
+            os.replace(tmp_path, path)
+            self._prune_disk()
+        except OSError as e:
+            logger.warning(f"Could not persist parsed resume: {e}")
+
+    def _prune_disk(self):
+        """Drop the oldest files once the disk store is over its limit"""
+        files = sorted(self.cache_dir.glob('*.json'), key=lambda p: p.stat().st_mtime)
+        for path in files[:max(0, len(files) - self.max_disk_entries)]:
+            path.unlink(missing_ok=True)
+
+    def get(self, content: bytes, filename: str) -> Optional[Dict[str, Any]]:
+        """Return the cached parse of these file bytes, or None"""
+        key = self._key(content, filename)
+
+        with self._lock:
+            parsed = self._entries.get(key)
+            if parsed is not None:
+                self._entries.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return parsed
+
+        if self.persist:
+            parsed = self._load_from_disk(key)
+            if parsed is not None:
+                self.stats['disk_hits'] += 1
+                self._remember(key, parsed)
+                return parsed
+
+        return None
+
+    async def get_or_parse(self, content: bytes, filename: str) -> Dict[str, Any]:
+        """
+        Read-through lookup returning {'text', 'analysis', 'format_issues'}
+        On a miss the bytes are parsed once by an ATS worker
+        """
+        parsed = self.get(content, filename)
+        if parsed is not None:
+            return parsed
+
+        self.stats['misses'] += 1
+        parsed = await ats_executor.parse_resume(content, filename)
+
+        key = self._key(content, filename)
+        self._remember(key, parsed)
+        if self.persist:
+            self._save_to_disk(key, parsed)
+        return parsed
+
+    def clear(self):
+        """Drop every in-memory entry (disk entries are left in place)"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for monitoring"""
+        lookups = sum(self.stats.values())
+        hits = self.stats['memory_hits'] + self.stats['disk_hits']
+        return {
+            **self.stats,
+            'hit_rate': round(hits / lookups, 3) if lookups else 0.0,
+            'memory_entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'persist': self.persist
+        }
+
+
+# Singleton instance
+resume_cache = ResumeCache()
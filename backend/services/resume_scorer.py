@@ -0,0 +1,74 @@
+"""
+Incremental Resume Scorer - Re-score resume edits without re-analyzing the whole resume
+
+Scoring an edited resume used to mean running _analyze_resume (a full spaCy
+parse plus the regex extractors) over the entire modified text. Resume edits
+made by the optimizer only insert a short block of terms, so the scorer keeps
+the resume's existing analysis and only analyzes the inserted section:
+
+- skills: the resume's skills plus the skills found in the inserted section
+  (parsed on its own) and any dictionary phrase that now spans the seam
+- keywords, education and experience: cheap substring/regex checks, redone
+  exactly on the edited text
+
+Each candidate edit then costs a few string operations and a set union,
+so the optimizer can compare dozens of them per request.
+"""
+
+from typing import Dict, Any, Optional, Set
+
+from backend.services.skill_dictionary import skill_dictionary
+
+
+class IncrementalResumeScorer:
+    """ATS score of a resume with one inserted block, reusing the resume's analysis"""
+
+    # Characters of surrounding text re-scanned for phrases that span the insertion
+    SEAM_MARGIN = 32
+
+    def __init__(self, optimizer, resume_analysis: Dict[str, Any], job_analysis: Dict[str, Any]):
+        self.optimizer = optimizer
+        self.resume_analysis = resume_analysis
+        self.job_analysis = job_analysis
+        self.text = resume_analysis['text']
+        self.base_skills = skill_dictionary.canonical_set(resume_analysis['skills'])
+        self.base_score = optimizer._calculate_ats_score(resume_analysis, job_analysis)
+        self.evaluated = 0
+
+    def section_skills(self, section_text: str, doc=None) -> Set[str]:
+        """
+        Canonical skills found in an inserted section
+        doc may be a parse of a longer text that starts with section_text
+        (several candidate sections that are prefixes of one line share one parse)
+        """
+        if doc is None:
+            doc = self.optimizer.nlp(section_text)
+        span = doc.char_span(0, len(section_text), alignment_mode='contract')
+        spans = [span] if span is not None else []
+        return skill_dictionary.canonical_set(self.optimizer._extract_skills(section_text, spans))
+
+    def apply(self, position: int, inserted: str) -> str:
+        return self.text[:position] + inserted + self.text[position:]
+
+    def score_insertion(self, position: int, inserted: str,
+                        inserted_skills: Optional[Set[str]] = None) -> int:
+        """Score the resume with inserted placed at position"""
+        if inserted_skills is None:
+            inserted_skills = self.section_skills(inserted)
+
+        text = self.apply(position, inserted)
+
+        # Known-technology phrases can straddle either edge of the insertion
+        seam = text[max(0, position - self.SEAM_MARGIN):position + len(inserted) + self.SEAM_MARGIN]
+        seam_skills = skill_dictionary.canonical_set(self.optimizer.TECH_KEYWORD_MATCHER.matched(seam))
+
+        analysis = {
+            **self.resume_analysis,
+            'text': text,
+            'skills': self.base_skills | inserted_skills | seam_skills,
+            'education': self.optimizer._extract_education(text),
+            'experience_years': self.optimizer._extract_experience_years(text)
+        }
+
+        self.evaluated += 1
+        return self.optimizer._calculate_ats_score(analysis, self.job_analysis)
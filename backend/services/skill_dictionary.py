@@ -0,0 +1,182 @@
+"""
+Skill Dictionary - Canonical skill IDs for compact, vectorized skill matching
+
+Every extracted skill string is normalized (case, whitespace, stray
+punctuation) and resolved through the synonym table to one canonical form,
+so 'MySQL', 'sql,' and 'T-SQL' all mean the same skill. Canonical forms get
+stable integer IDs from the skills table; a job's skills are then a sorted
+uint32 array (same layout as array('I')), about 4 bytes per skill instead of
+a Python set of strings, and matching is np.intersect1d.
+
+Canonicalization is pure and works in any process (including ATS workers).
+IDs are only assigned by the API process, through ensure_ids().
+"""
+
+import asyncio
+import re
+from typing import Dict, Any, Iterable, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from backend.core.logging import get_logger
+from backend.models.models import Skill
+
+logger = get_logger(__name__)
+
+# Canonical skill -> surface forms that mean the same thing
+SKILL_SYNONYMS = {
+    'python': ['python', 'py', 'python3'],
+    'javascript': ['javascript', 'js', 'es6', 'nodejs', 'node.js'],
+    'machine learning': ['machine learning', 'ml', 'deep learning', 'dl', 'ai'],
+    'data analysis': ['data analysis', 'data analytics', 'analytics'],
+    'project management': ['project management', 'program management', 'pm'],
+    'sql': ['sql', 'mysql', 'postgresql', 'tsql', 't-sql'],
+    'excel': ['excel', 'microsoft excel', 'ms excel', 'spreadsheets'],
+    'communication': ['communication', 'verbal communication', 'written communication'],
+}
+
+MAX_SKILL_LENGTH = 255  # skills.name column size
+
+_WHITESPACE = re.compile(r'\s+')
+_EDGE_PUNCTUATION = ' \t\n,.;:-*•()[]'
+
+
+def normalize_skill(surface: str) -> str:
+    """Lowercase, collapse whitespace and trim list punctuation"""
+    return _WHITESPACE.sub(' ', surface.lower()).strip(_EDGE_PUNCTUATION)[:MAX_SKILL_LENGTH]
+
+
+class SkillDictionary:
+    """Surface form -> canonical skill -> integer ID"""
+
+    def __init__(self, synonyms: Optional[Dict[str, List[str]]] = None):
+        self.synonyms = synonyms or SKILL_SYNONYMS
+        self._aliases: Dict[str, str] = {}
+        for canonical, surfaces in self.synonyms.items():
+            for surface in surfaces:
+                self._aliases[normalize_skill(surface)] = normalize_skill(canonical)
+
+        self._ids: Dict[str, int] = {}
+        self._names: Dict[int, str] = {}
+        self._loaded = False
+        self._assign_lock = asyncio.Lock()
+
+    # ------------------------------------------------------------------
+    # Canonical forms (pure, usable in any process)
+    # ------------------------------------------------------------------
+
+    def canonical(self, surface: str) -> str:
+        normalized = normalize_skill(surface)
+        return self._aliases.get(normalized, normalized)
+
+    def canonical_set(self, surfaces: Iterable[str]) -> set:
+        return {name for name in map(self.canonical, surfaces) if name}
+
+    # ------------------------------------------------------------------
+    # Integer IDs
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def max_id(self) -> int:
+        return max(self._names) if self._names else 0
+
+    def lookup(self, surface: str) -> Optional[int]:
+        """ID of a surface form, or None if the skill has never been registered"""
+        return self._ids.get(self.canonical(surface))
+
+    def name(self, skill_id: int) -> Optional[str]:
+        return self._names.get(skill_id)
+
+    def to_array(self, surfaces: Iterable[str]):
+        """Sorted unique uint32 IDs of the registered skills among surfaces"""
+        import numpy as np
+
+        ids = {self._ids[name] for name in self.canonical_set(surfaces) if name in self._ids}
+        return np.array(sorted(ids), dtype=np.uint32)
+
+    @staticmethod
+    def encode(ids) -> bytes:
+        """Serialize a sorted ID array for a LargeBinary column"""
+        import numpy as np
+        return np.asarray(ids, dtype=np.uint32).tobytes()
+
+    @staticmethod
+    def decode(blob: Optional[bytes]):
+        import numpy as np
+        if not blob:
+            return np.zeros(0, dtype=np.uint32)
+        return np.frombuffer(blob, dtype=np.uint32)
+
+    @staticmethod
+    def match_count(job_ids, resume_ids) -> int:
+        """Number of shared skills between two sorted ID arrays"""
+        import numpy as np
+        return len(np.intersect1d(job_ids, resume_ids, assume_unique=True))
+
+    def _remember(self, skill_id: int, name: str):
+        self._ids[name] = skill_id
+        self._names[skill_id] = name
+
+    async def load(self, db: AsyncSession):
+        """Read every registered skill into memory"""
+        result = await db.execute(select(Skill.id, Skill.name))
+        for skill_id, name in result.all():
+            self._remember(skill_id, name)
+        self._loaded = True
+        logger.info(f"Loaded {len(self._ids)} canonical skills")
+
+    async def ensure_loaded(self, db: AsyncSession):
+        """Load the registered skills once, before resolving resume skills to IDs"""
+        async with self._assign_lock:
+            if not self._loaded:
+                await self.load(db)
+
+    async def ensure_ids(self, db: AsyncSession, surfaces: Iterable[str]) -> Dict[str, int]:
+        """
+        Canonical name -> ID for every surface form, registering new skills
+        Only the API process calls this (caller commits)
+        """
+        names = self.canonical_set(surfaces)
+
+        async with self._assign_lock:
+            if not self._loaded:
+                await self.load(db)
+
+            missing = sorted(name for name in names if name not in self._ids)
+            for name in missing:
+                try:
+                    async with db.begin_nested():
+                        skill = Skill(name=name)
+                        db.add(skill)
+                    self._remember(skill.id, name)
+                except IntegrityError:
+                    # Registered by another process since we loaded
+                    result = await db.execute(select(Skill.id).where(Skill.name == name))
+                    self._remember(result.scalar_one(), name)
+
+            if missing:
+                logger.debug(f"Registered {len(missing)} new skills")
+
+        return {name: self._ids[name] for name in names}
+
+    async def encode_skills(self, db: AsyncSession, surfaces: Iterable[str]) -> bytes:
+        """Register surfaces if needed and return their packed ID array"""
+        surfaces = list(surfaces)
+        await self.ensure_ids(db, surfaces)
+        return self.encode(self.to_array(surfaces))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'skills': len(self._ids),
+            'aliases': len(self._aliases),
+            'loaded': self._loaded
+        }
+
+
+# Singleton instance
+skill_dictionary = SkillDictionary()
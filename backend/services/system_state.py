@@ -0,0 +1,40 @@
+"""
+System State Store
+Small JSON documents that must survive restarts, keyed by name
+
+Used for checkpoints such as the Gmail history ID, so a new piece of
+persisted state doesn't need its own table or migration. Writes are added
+to the caller's session and committed with the caller's transaction, so a
+checkpoint only moves forward together with the work it describes.
+"""
+
+from typing import Any, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models.models import SystemState
+
+
+class SystemStateStore:
+    """Key/value access to the system_state table"""
+
+    async def get(self, db: AsyncSession, key: str, default: Optional[Any] = None) -> Any:
+        row = await db.get(SystemState, key)
+        return row.value if row is not None else default
+
+    async def set(self, db: AsyncSession, key: str, value: Any):
+        """Insert or replace the value for key (committed by the caller)"""
+        row = await db.get(SystemState, key)
+        if row is None:
+            db.add(SystemState(key=key, value=value))
+        else:
+            row.value = value
+
+    async def delete(self, db: AsyncSession, key: str):
+        row = await db.get(SystemState, key)
+        if row is not None:
+            await db.delete(row)
+
+
+# Singleton instance
+system_state = SystemStateStore()
@@ -0,0 +1,283 @@
+"""
+ATS Engine Benchmark
+
+Measures throughput, p50/p95 latency and peak RSS of the ATS hot paths on a
+deterministic synthetic corpus (benchmarks/corpus.py):
+
+    analyze_job_description, _analyze_resume, _calculate_ats_score, optimize_resume
+
+Each operation runs in its own spawned process so peak RSS is per operation
+and one benchmark's memory doesn't leak into the next. Model loading and
+input preparation happen before timing starts; a few warm-up calls are
+discarded.
+
+Usage:
+    python -m benchmarks.ats_benchmark                       # run, write benchmarks/results/latest.json
+    python -m benchmarks.ats_benchmark --save-baseline       # also store the run as the baseline
+    python -m benchmarks.ats_benchmark --threshold 0.15      # fail (exit 1) on >15% regressions vs baseline
+    python -m benchmarks.ats_benchmark --only optimize_resume --jobs 60
+"""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+# Runnable as a script or with -m from the repo root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.corpus import job_corpus, resume_corpus  # noqa: E402
+
+OPERATIONS = ['analyze_job_description', '_analyze_resume', '_calculate_ats_score', 'optimize_resume']
+
+DEFAULT_RESULTS = Path(__file__).parent / 'results' / 'latest.json'
+DEFAULT_BASELINE = Path(__file__).parent / 'baseline.json'
+
+# Metric -> True if a larger value is worse
+GATED_METRICS = {
+    'p50_ms': True,
+    'p95_ms': True,
+    'throughput_per_s': False,
+    'peak_rss_mb': True,
+}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Linear-interpolated percentile (same as numpy's default), without numpy"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process (ru_maxrss is KB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(peak / divisor, 1)
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, Any]:
+    """Latency list (seconds) -> reported metrics"""
+    return {
+        'calls': len(latencies),
+        'throughput_per_s': round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+    }
+
+
+# ----------------------------------------------------------------------
+# Child process
+# ----------------------------------------------------------------------
+
+def _prepare(operation: str, config: Dict[str, Any]):
+    """Load models and build this operation's inputs; returns a list of zero-arg calls"""
+    from backend.services.ats_optimizer import ats_optimizer
+    from backend.services.keyword_index import keyword_index
+
+    jobs = job_corpus(config['jobs'], config['seed'])
+    resumes = resume_corpus(config['resumes'], config['seed'])
+
+    # Corpus IDF as the API would have it, without touching the on-disk index
+    keyword_index.add_many(jobs)
+    ats_optimizer.warm()
+
+    if operation == 'analyze_job_description':
+        return [lambda text=text: ats_optimizer.analyze_job_description(text) for text in jobs]
+
+    if operation == '_analyze_resume':
+        return [lambda text=text: ats_optimizer._analyze_resume(text) for text in resumes]
+
+    job_analyses = ats_optimizer.analyze_many(jobs)
+    resume_analyses = [ats_optimizer._analyze_resume(text) for text in resumes]
+
+    if operation == '_calculate_ats_score':
+        pairs = [
+            (resume_analyses[i % len(resume_analyses)], job_analyses[i % len(job_analyses)])
+            for i in range(config['score_pairs'])
+        ]
+        return [lambda r=r, j=j: ats_optimizer._calculate_ats_score(r, j) for r, j in pairs]
+
+    if operation == 'optimize_resume':
+        parsed = [
+            {'text': text, 'analysis': analysis, 'format_issues': []}
+            for text, analysis in zip(resumes, resume_analyses)
+        ]
+        return [
+            lambda p=parsed[i % len(parsed)], j=job_analyses[i]:
+                ats_optimizer.optimize_resume('resume.txt', j, parsed_resume=p)
+            for i in range(len(job_analyses))
+        ]
+
+    raise ValueError(f"Unknown operation: {operation}")
+
+
+def run_operation(operation: str, config: Dict[str, Any]) -> Dict[str, Any]:
+    """Time every call of one operation (runs inside the child process)"""
+    calls = _prepare(operation, config)
+    rss_before = peak_rss_mb()
+
+    for call in calls[:config['warmup']]:
+        call()
+
+    latencies = []
+    started = time.perf_counter()
+    for call in calls:
+        t0 = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+
+    return {
+        **summarize(latencies, elapsed),
+        'peak_rss_mb': peak_rss_mb(),
+        'setup_rss_mb': rss_before,
+    }
+
+
+def _child(operation: str, config: Dict[str, Any], queue):
+    try:
+        queue.put(('ok', run_operation(operation, config)))
+    except Exception as e:
+        queue.put(('error', f"{type(e).__name__}: {e}"))
+
+
+def run_isolated(operation: str, config: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one operation in a fresh spawned process"""
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    process = ctx.Process(target=_child, args=(operation, config, queue))
+    process.start()
+    status, payload = queue.get()
+    process.join()
+    if status != 'ok':
+        raise RuntimeError(f"{operation} benchmark failed: {payload}")
+    return payload
+
+
+# ----------------------------------------------------------------------
+# Baseline comparison
+# ----------------------------------------------------------------------
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """
+    Metrics that got worse than the baseline by more than threshold (0.2 = 20%)
+    Operations or metrics missing from either run are skipped
+    """
+    regressions = []
+    for operation, metrics in current['results'].items():
+        base = baseline.get('results', {}).get(operation)
+        if not base:
+            continue
+        for metric, higher_is_worse in GATED_METRICS.items():
+            old, new = base.get(metric), metrics.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (change > threshold) if higher_is_worse else (change < -threshold):
+                regressions.append({
+                    'operation': operation,
+                    'metric': metric,
+                    'baseline': old,
+                    'current': new,
+                    'change': round(change, 3)
+                })
+    return regressions
+
+
+def _environment() -> Dict[str, Any]:
+    from backend.services.ats_optimizer import ATSOptimizer
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'analyzer_version': ATSOptimizer.ANALYZER_VERSION,
+    }
+
+
+def run_benchmarks(config: Dict[str, Any], operations: List[str]) -> Dict[str, Any]:
+    results = {}
+    for operation in operations:
+        print(f"  {operation} ...", end=' ', flush=True)
+        results[operation] = run_isolated(operation, config)
+        r = results[operation]
+        print(f"{r['throughput_per_s']}/s  p50 {r['p50_ms']}ms  p95 {r['p95_ms']}ms  rss {r['peak_rss_mb']}MB")
+    return {'meta': {**_environment(), 'config': config}, 'results': results}
+
+
+def _write_json(path: Path, data: Dict[str, Any]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+
+
+def _load_json(path: Path) -> Optional[Dict[str, Any]]:
+    if not path.exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the ATS engine on a synthetic corpus")
+    parser.add_argument('--jobs', type=int, default=150, help="Synthetic job descriptions")
+    parser.add_argument('--resumes', type=int, default=60, help="Synthetic resumes")
+    parser.add_argument('--score-pairs', type=int, default=5000, help="Resume/job pairs for _calculate_ats_score")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--warmup', type=int, default=3, help="Untimed calls before measuring")
+    parser.add_argument('--only', choices=OPERATIONS, action='append', help="Run only these operations")
+    parser.add_argument('--output', type=Path, default=DEFAULT_RESULTS)
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument('--threshold', type=float, default=0.2, help="Allowed relative regression (0.2 = 20%%)")
+    parser.add_argument('--save-baseline', action='store_true', help="Store this run as the new baseline")
+    args = parser.parse_args(argv)
+
+    config = {
+        'jobs': args.jobs,
+        'resumes': args.resumes,
+        'score_pairs': args.score_pairs,
+        'seed': args.seed,
+        'warmup': args.warmup,
+    }
+
+    print(f"ATS benchmark: {args.jobs} jobs, {args.resumes} resumes, seed {args.seed}")
+    current = run_benchmarks(config, args.only or OPERATIONS)
+    _write_json(args.output, current)
+    print(f"Results written to {args.output}")
+
+    if args.save_baseline:
+        _write_json(args.baseline, current)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    baseline = _load_json(args.baseline)
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+    if baseline.get('meta', {}).get('config') != config:
+        print("Warning: baseline was recorded with a different corpus configuration")
+
+    regressions = compare(current, baseline, args.threshold)
+    if not regressions:
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+        return 0
+
+    print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+    for r in regressions:
+        print(f"  {r['operation']}.{r['metric']}: {r['baseline']} -> {r['current']} ({r['change']:+.1%})")
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,230 @@
+"""
+Deterministic synthetic corpus for ATS benchmarks
+
+Job descriptions and resumes are assembled from fixed vocabularies with a
+seeded random.Random, so the same (seed, index) always yields the same text
+on every machine. Lengths cycle through short / medium / long so latency
+percentiles cover the range real postings and resumes fall in.
+
+Recruiter emails (for the email classifier evaluation) are built the same
+way and carry the classification they were written as.
+"""
+
+import random
+from typing import Dict, List
+
+SIZES = ('short', 'medium', 'long')
+
+# Bullets per section for each size
+BULLETS = {'short': 3, 'medium': 8, 'long': 18}
+# Roles on a resume for each size
+ROLES = {'short': 2, 'medium': 4, 'long': 7}
+
+TITLES = [
+    'Data Analyst', 'Business Analyst', 'Software Engineer', 'Product Manager',
+    'Project Manager', 'Data Engineer', 'Operations Analyst', 'Financial Analyst',
+    'Machine Learning Engineer', 'Business Intelligence Developer'
+]
+DOMAINS = ['healthcare', 'insurance', 'retail', 'logistics', 'banking', 'manufacturing', 'education']
+TOOLS = [
+    'Python', 'SQL', 'Excel', 'Tableau', 'Power BI', 'AWS', 'Azure', 'Docker',
+    'Kubernetes', 'Git', 'Jira', 'Salesforce', 'PostgreSQL', 'MySQL', 'React',
+    'Node.js', 'Pandas', 'NumPy', 'TensorFlow', 'Snowflake', 'Airflow', 'dbt'
+]
+SKILLS = [
+    'data analysis', 'project management', 'machine learning', 'stakeholder management',
+    'requirements gathering', 'data visualization', 'statistical modeling',
+    'process improvement', 'software development', 'agile delivery',
+    'data management and testing', 'financial reporting', 'risk analysis'
+]
+VERBS = [
+    'developed', 'created', 'designed', 'implemented', 'managed', 'led', 'analyzed',
+    'improved', 'increased', 'reduced', 'optimized', 'streamlined', 'automated',
+    'built', 'launched', 'coordinated', 'trained', 'delivered'
+]
+OBJECTS = [
+    'reporting pipelines', 'executive dashboards', 'claims workflows', 'forecasting models',
+    'data quality checks', 'customer segmentation', 'billing processes', 'ETL jobs',
+    'A/B testing framework', 'inventory tracking', 'compliance audits', 'API integrations'
+]
+DEGREES = [
+    "Bachelor's degree in Computer Science", "Bachelor's degree in Economics",
+    "Master's degree in Statistics", "Bachelor's degree in Business Administration",
+    "MBA", "PhD in Operations Research"
+]
+BENEFITS = ['401(k) match', 'remote-first team', 'health insurance', 'learning budget', 'flexible PTO']
+
+
+def _size(index: int) -> str:
+    return SIZES[index % len(SIZES)]
+
+
+def _rng(seed: int, kind: str, index: int) -> random.Random:
+    # String seeds are hashed deterministically by random.Random (not by hash())
+    return random.Random(f"{seed}:{kind}:{index}")
+
+
+def job_description(index: int, seed: int = 42) -> str:
+    """One synthetic job posting with the sections the analyzer looks for"""
+    rng = _rng(seed, 'job', index)
+    bullets = BULLETS[_size(index)]
+    title = rng.choice(TITLES)
+    domain = rng.choice(DOMAINS)
+
+    lines = [
+        f"{title} - {domain.title()}",
+        "About the role",
+        f"We are hiring a {title} to join our {domain} analytics team and partner with "
+        f"{rng.choice(['finance', 'operations', 'product', 'engineering'])} on "
+        f"{rng.choice(OBJECTS)}.",
+        "",
+        "Responsibilities:",
+    ]
+    for _ in range(bullets):
+        lines.append(
+            f"- {rng.choice(VERBS).title()} {rng.choice(OBJECTS)} using {rng.choice(TOOLS)} "
+            f"and {rng.choice(TOOLS)}"
+        )
+
+    lines += ["", "Requirements:"]
+    lines.append(f"- {rng.randint(2, 8)}+ years of experience with {rng.choice(TOOLS)} and {rng.choice(TOOLS)}")
+    for _ in range(max(1, bullets - 1)):
+        tools = rng.sample(TOOLS, 3)
+        lines.append(f"- Proficient in {tools[0]}, {tools[1]}, {tools[2]}")
+        lines.append(f"- Experience with {rng.choice(SKILLS)}")
+    lines.append(f"- {rng.choice(DEGREES)} or equivalent")
+
+    lines += ["", "Nice to have:"]
+    for _ in range(max(1, bullets // 3)):
+        lines.append(f"- Knowledge of {rng.choice(SKILLS)} in {domain}")
+
+    lines += ["", "Benefits:", f"- {', '.join(rng.sample(BENEFITS, 3))}"]
+    return '\n'.join(lines)
+
+
+def resume(index: int, seed: int = 42) -> str:
+    """One synthetic resume with dated roles, bullets, a skills line and education"""
+    rng = _rng(seed, 'resume', index)
+    roles = ROLES[_size(index)]
+    bullets = BULLETS[_size(index)] // 2 + 1
+
+    lines = [
+        f"Candidate {index}",
+        "Summary",
+        f"{rng.choice(TITLES)} with a track record in {rng.choice(SKILLS)} and {rng.choice(SKILLS)}.",
+        "",
+        "Experience",
+    ]
+    year = 2024
+    for _ in range(roles):
+        start = year - rng.randint(1, 4)
+        lines.append(f"{rng.choice(TITLES)}, {rng.choice(DOMAINS).title()} Co  {start} - {year}")
+        for _ in range(bullets):
+            lines.append(
+                f"- {rng.choice(VERBS).title()} {rng.choice(OBJECTS)} with {rng.choice(TOOLS)}, "
+                f"improving throughput by {rng.randint(5, 60)}%"
+            )
+        year = start
+
+    lines += ["", "Skills", ', '.join(rng.sample(TOOLS, 6) + rng.sample(SKILLS, 3))]
+    lines += ["", "Education", rng.choice(DEGREES)]
+    return '\n'.join(lines)
+
+
+def job_corpus(count: int, seed: int = 42) -> List[str]:
+    return [job_description(i, seed) for i in range(count)]
+
+
+def resume_corpus(count: int, seed: int = 42) -> List[str]:
+    return [resume(i, seed) for i in range(count)]
+
+
+# ----------------------------------------------------------------------
+# Recruiter emails
+# ----------------------------------------------------------------------
+
+EMAIL_COMPANIES = ['Acme', 'Globex', 'Initech', 'Umbrella Health', 'Stark Logistics', 'Wayne Financial']
+# Sentences per classification; several are worded without the heuristic's keywords
+EMAIL_SENTENCES = {
+    'INTERVIEW': [
+        "We'd love to set up a 30 minute phone screen with the hiring manager.",
+        "Could you share your availability for a video call next week?",
+        "Please pick a time on my calendar that works for you.",
+        "The team would like to meet with you to talk through the role.",
+        "You have been invited to an onsite loop with four of our engineers.",
+        "Let's find a slot for a quick chat about your background.",
+    ],
+    'REJECTION': [
+        "Unfortunately we have decided not to move forward with your application.",
+        "After careful review we went with a candidate whose experience more closely matches.",
+        "The position has been filled.",
+        "We won't be progressing your candidacy at this time.",
+        "We will keep your resume on file for future openings.",
+        "This was a difficult decision given the strength of the applicant pool.",
+    ],
+    'INFO_REQUEST': [
+        "Could you send us a copy of your portfolio?",
+        "Please provide two professional references.",
+        "Before we continue we need your work authorization status.",
+        "Can you fill out the attached questionnaire by Friday?",
+        "Please confirm your expected salary range.",
+        "We are missing your transcript; could you upload it to the portal?",
+    ],
+    'OFFER': [
+        "We are pleased to extend an offer for the position.",
+        "Attached is your offer letter with the base salary and equity details.",
+        "Congratulations, the team was unanimous.",
+        "Your proposed start date is the first Monday of next month.",
+        "Please sign and return the offer by the end of the week.",
+        "The package includes benefits starting on day one.",
+    ],
+    'OTHER': [
+        "Thanks for applying, we have received your application.",
+        "Here are this week's top jobs picked for you.",
+        "Your account password was changed.",
+        "Join our talent community to hear about new roles.",
+        "Reminder: complete your candidate profile.",
+        "Our newsletter: five tips for remote interviews.",
+    ],
+}
+EMAIL_SUBJECTS = {
+    'INTERVIEW': ['Next steps for the {title} role', 'Interview request - {title}', 'Chat with {company}?'],
+    'REJECTION': ['Your application to {company}', 'Update on the {title} position', '{company} - application status'],
+    'INFO_REQUEST': ['Additional information needed', 'Quick question about your application', 'Documents for {company}'],
+    'OFFER': ['Offer letter - {title}', 'Welcome to {company}!', 'Your offer from {company}'],
+    'OTHER': ['Application received', 'Jobs you may like', '{company} careers newsletter'],
+}
+EMAIL_LABELS = list(EMAIL_SENTENCES)
+# Share of each class in the corpus (rejections and automated mail dominate real inboxes)
+EMAIL_LABEL_WEIGHTS = [0.2, 0.3, 0.1, 0.05, 0.35]
+
+
+def recruiter_email(index: int, seed: int = 42) -> Dict[str, str]:
+    """One synthetic recruiter email: subject, body, from and the label it was written as"""
+    rng = _rng(seed, 'email', index)
+    label = rng.choices(EMAIL_LABELS, weights=EMAIL_LABEL_WEIGHTS)[0]
+    company = rng.choice(EMAIL_COMPANIES)
+    title = rng.choice(TITLES)
+
+    sentences = rng.sample(EMAIL_SENTENCES[label], rng.randint(2, 4))
+    # A stray sentence from another class, as in real mail ("unfortunately the 3pm slot is gone")
+    if rng.random() < 0.3:
+        other = rng.choice([l for l in EMAIL_LABELS if l != label])
+        sentences.insert(rng.randint(0, len(sentences)), rng.choice(EMAIL_SENTENCES[other]))
+
+    body = '\n\n'.join([
+        'Hi there,',
+        f"Thank you for your interest in the {title} position at {company}.",
+        ' '.join(sentences),
+        f"Best regards,\n{company} Recruiting"
+    ])
+    return {
+        'subject': rng.choice(EMAIL_SUBJECTS[label]).format(title=title, company=company),
+        'body': body,
+        'from': f"recruiting@{company.split()[0].lower()}.com",
+        'label': label,
+    }
+
+
+def email_corpus(count: int, seed: int = 42) -> List[Dict[str, str]]:
+    return [recruiter_email(i, seed) for i in range(count)]
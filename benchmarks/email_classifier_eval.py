@@ -0,0 +1,176 @@
+"""
+Email Classifier Evaluation
+
+Trains the email classifier on a held-in split of labeled emails and reports,
+on the held-out split, accuracy and per-class precision/recall for both the
+trained model and the keyword heuristic it replaces, plus emails/sec for
+each (model: one batch call; heuristic: one email at a time, as scans used
+to run it).
+
+Labeled emails come from EmailTracking rows with a confirmed label
+(--source db) or from the synthetic recruiter emails in benchmarks/corpus.py.
+
+Usage:
+    python -m benchmarks.email_classifier_eval                    # synthetic corpus
+    python -m benchmarks.email_classifier_eval --source db        # labeled emails in the database
+    python -m benchmarks.email_classifier_eval --source db --train   # then train on all of them and save
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+# Runnable as a script or with -m from the repo root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.corpus import email_corpus  # noqa: E402
+
+
+def synthetic_examples(count: int, seed: int) -> Tuple[List[Dict[str, Any]], List[Any]]:
+    from backend.models.models import ResponseType
+
+    emails = email_corpus(count, seed)
+    return emails, [ResponseType(email['label']) for email in emails]
+
+
+def database_examples() -> Tuple[List[Dict[str, Any]], List[Any]]:
+    from backend.core.database import AsyncSessionLocal
+    from backend.services.email_classifier import EmailClassifier
+
+    async def load():
+        async with AsyncSessionLocal() as db:
+            return await EmailClassifier.load_labeled(db)
+
+    return asyncio.run(load())
+
+
+def split(emails: Sequence, labels: Sequence, test_fraction: float, seed: int):
+    """Shuffled train/test split, the same for the same seed"""
+    order = list(range(len(emails)))
+    random.Random(seed).shuffle(order)
+    n_test = max(1, int(len(order) * test_fraction))
+    test, train = order[:n_test], order[n_test:]
+    pick = lambda items, idx: [items[i] for i in idx]  # noqa: E731
+    return pick(emails, train), pick(labels, train), pick(emails, test), pick(labels, test)
+
+
+def timed(predict, emails: Sequence[Dict[str, Any]], repeat: int) -> Tuple[List[Any], float]:
+    """Predictions and emails/sec over repeat passes"""
+    predictions = predict(emails)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        predict(emails)
+    elapsed = time.perf_counter() - started
+    return predictions, round(len(emails) * repeat / elapsed, 1) if elapsed else 0.0
+
+
+def score(truth: Sequence[Any], predicted: Sequence[Any]) -> Dict[str, Any]:
+    """Accuracy and per-class precision/recall/support"""
+    from sklearn.metrics import accuracy_score, precision_recall_fscore_support
+
+    classes = sorted({label.value for label in truth} | {label.value for label in predicted})
+    y_true = [label.value for label in truth]
+    y_pred = [label.value for label in predicted]
+    precision, recall, f1, support = precision_recall_fscore_support(
+        y_true, y_pred, labels=classes, zero_division=0
+    )
+    return {
+        'accuracy': round(float(accuracy_score(y_true, y_pred)), 4),
+        'per_class': {
+            label: {
+                'precision': round(float(precision[i]), 3),
+                'recall': round(float(recall[i]), 3),
+                'f1': round(float(f1[i]), 3),
+                'support': int(support[i])
+            }
+            for i, label in enumerate(classes)
+        }
+    }
+
+
+def evaluate(emails: List[Dict[str, Any]], labels: List[Any], test_fraction: float,
+             seed: int, repeat: int) -> Dict[str, Any]:
+    import tempfile
+
+    from backend.services.email_classifier import EmailClassifier
+    from backend.services.email_service import email_service
+
+    train_emails, train_labels, test_emails, test_labels = split(emails, labels, test_fraction, seed)
+
+    # Scratch classifier: evaluation never replaces the model scans use
+    classifier = EmailClassifier(path=Path(tempfile.gettempdir()) / 'email_classifier_eval.joblib')
+    meta = classifier.fit(train_emails, train_labels)
+
+    model_predictions, model_rate = timed(
+        lambda batch: [kind for kind, _ in classifier.predict_many(batch)], test_emails, repeat
+    )
+    heuristic_predictions, heuristic_rate = timed(
+        lambda batch: [email_service._heuristic_classification(email)['type'] for email in batch],
+        test_emails, repeat
+    )
+
+    return {
+        'train_examples': len(train_emails),
+        'test_examples': len(test_emails),
+        'train_seconds': meta['train_seconds'],
+        'model': {**score(test_labels, model_predictions), 'emails_per_s': model_rate},
+        'heuristic': {**score(test_labels, heuristic_predictions), 'emails_per_s': heuristic_rate},
+    }
+
+
+def _print_report(report: Dict[str, Any]):
+    print(f"  train {report['train_examples']}  test {report['test_examples']}  "
+          f"fit {report['train_seconds']}s")
+    for name in ('model', 'heuristic'):
+        r = report[name]
+        print(f"  {name:<9} accuracy {r['accuracy']:.3f}  {r['emails_per_s']} emails/s")
+        for label, m in r['per_class'].items():
+            print(f"      {label:<13} precision {m['precision']:.3f}  recall {m['recall']:.3f}  n={m['support']}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Evaluate the email classifier against the keyword heuristic")
+    parser.add_argument('--source', choices=['synthetic', 'db'], default='synthetic',
+                        help="Labeled emails from the synthetic corpus or the database")
+    parser.add_argument('--emails', type=int, default=2000, help="Synthetic emails")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--test-fraction', type=float, default=0.2)
+    parser.add_argument('--repeat', type=int, default=5, help="Timed passes over the test split")
+    parser.add_argument('--output', type=Path, help="Also write the report as JSON")
+    parser.add_argument('--train', action='store_true',
+                        help="Afterwards train on all examples and save the model scans use")
+    args = parser.parse_args(argv)
+
+    if args.source == 'db':
+        emails, labels = database_examples()
+    else:
+        emails, labels = synthetic_examples(args.emails, args.seed)
+
+    print(f"Email classifier evaluation: {len(emails)} labeled emails ({args.source})")
+    try:
+        report = evaluate(emails, labels, args.test_fraction, args.seed, args.repeat)
+    except ValueError as e:
+        print(f"Cannot train: {e}")
+        return 1
+    _print_report(report)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+    if args.train:
+        from backend.services.email_classifier import email_classifier
+        meta = email_classifier.train(emails, labels)
+        print(f"Saved model trained on {meta['examples']} emails to {email_classifier.path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
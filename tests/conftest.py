@@ -68,8 +68,9 @@ def mock_gmail_service():
 def mock_spacy_nlp():
     """
     Mock spaCy NLP model to speed up tests
+    (ATSOptimizer imports spaCy lazily, so patch the library function)
     """
-    with patch('backend.services.ats_optimizer.spacy.load') as mock_load:
+    with patch('spacy.load') as mock_load:
         mock_nlp = MagicMock()
         mock_load.return_value = mock_nlp
         yield mock_nlp
@@ -0,0 +1,240 @@
+"""
+Local fake of the Gmail REST endpoints used by the email service
+
+Serves messages.list, messages.get, history.list, getProfile and the
+multipart/mixed batch endpoint from an in-memory mailbox on a background
+thread, and counts HTTP round trips so tests can assert how many calls a
+scan makes. Point the service at it with GMAIL_API_ENDPOINT=server.url and
+an unauthenticated httplib2.Http().
+"""
+
+import json
+import re
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit, parse_qs
+
+MESSAGES_PATH = re.compile(r'^/gmail/v1/users/me/messages(?:/(?P<id>[^/?]+))?$')
+HISTORY_PATH = '/gmail/v1/users/me/history'
+PROFILE_PATH = '/gmail/v1/users/me/profile'
+
+
+def make_message(message_id: str, subject: str = 'Interview invitation',
+                 sender: str = 'recruiter@acme.com', body: str = 'We would like to schedule an interview.',
+                 thread_id: Optional[str] = None, labels: Optional[List[str]] = None,
+                 bulk: bool = False, date: str = 'Mon, 13 Oct 2025 10:00:00 +0000') -> Dict:
+    """Gmail API message resource with plain-text body (bulk adds a List-Unsubscribe header)"""
+    import base64
+    headers = [
+        {'name': 'From', 'value': sender},
+        {'name': 'To', 'value': 'me@example.com'},
+        {'name': 'Subject', 'value': subject},
+        {'name': 'Date', 'value': date},
+    ]
+    if bulk:
+        headers.append({'name': 'List-Unsubscribe', 'value': '<mailto:unsubscribe@example.com>'})
+    return {
+        'id': message_id,
+        'threadId': thread_id or f"t-{message_id}",
+        'labelIds': labels or ['INBOX'],
+        'sizeEstimate': 1000 + len(body),
+        'payload': {
+            'headers': headers,
+            'mimeType': 'text/plain',
+            'body': {'data': base64.urlsafe_b64encode(body.encode()).decode()}
+        }
+    }
+
+
+def metadata_view(message: Dict, header_names: List[str]) -> Dict:
+    """The message as format=metadata returns it: requested headers, no body"""
+    wanted = {name.lower() for name in header_names}
+    return {
+        'id': message['id'],
+        'threadId': message['threadId'],
+        'labelIds': message.get('labelIds', []),
+        'sizeEstimate': message.get('sizeEstimate', 0),
+        'payload': {
+            'mimeType': message['payload']['mimeType'],
+            'headers': [h for h in message['payload']['headers'] if not wanted or h['name'].lower() in wanted]
+        }
+    }
+
+
+class FakeGmail:
+    """In-memory mailbox behind a real HTTP server"""
+
+    def __init__(self, messages: List[Dict]):
+        self.messages = {m['id']: m for m in messages}
+        self.order = [m['id'] for m in messages]
+        self.calls = Counter()  # 'list' / 'get' / 'batch' / 'history' / 'profile' -> HTTP round trips
+        # (history id, message id) per delivered message; history before oldest_history is gone
+        self.history_id = 100
+        self.history: List[tuple] = []
+        self.oldest_history = self.history_id
+        self.history_page_size = 2
+        self.batch_sizes: List[int] = []
+        self.formats = Counter()  # messages.get format -> messages served
+        # message id -> statuses to return before succeeding (e.g. [429])
+        self.failures: Dict[str, List[int]] = {}
+        self.list_failures: Dict[int, int] = {}  # list page offset -> status to return once
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    # ------------------------------------------------------------------
+    # API behaviour
+    # ------------------------------------------------------------------
+
+    def deliver(self, message: Dict):
+        """A new message arrives (newest first in listings, recorded in history)"""
+        self.messages[message['id']] = message
+        self.order.insert(0, message['id'])
+        self.history_id += 1
+        self.history.append((self.history_id, message['id']))
+
+    def expire_history(self):
+        """Drop all history so older checkpoints get a 404"""
+        self.history = []
+        self.oldest_history = self.history_id
+
+    def list_messages(self, query: Dict[str, List[str]]):
+        """(status, body) for messages.list, paged by maxResults (search query is ignored)"""
+        limit = int(query.get('maxResults', ['100'])[0])
+        offset = int(query.get('pageToken', ['0'])[0])
+        if offset in self.list_failures:
+            status = self.list_failures.pop(offset)
+            return status, {'error': {'code': status, 'message': 'Injected failure'}}
+        page = self.order[offset:offset + limit]
+        body = {
+            'messages': [{'id': mid, 'threadId': self.messages[mid]['threadId']} for mid in page],
+            'resultSizeEstimate': len(self.order)
+        }
+        if offset + limit < len(self.order):
+            body['nextPageToken'] = str(offset + limit)
+        return 200, body
+
+    def list_history(self, query: Dict[str, List[str]]):
+        """(status, body) for history.list, paged by history_page_size"""
+        start = int(query['startHistoryId'][0])
+        if start < self.oldest_history:
+            return 404, {'error': {'code': 404, 'message': 'Requested entity was not found.'}}
+        offset = int(query.get('pageToken', ['0'])[0])
+        records = [(hid, mid) for hid, mid in self.history if hid > start]
+        page = records[offset:offset + self.history_page_size]
+        body = {'historyId': str(self.history_id)}
+        if page:
+            body['history'] = [
+                {'id': str(hid), 'messagesAdded': [{'message': {'id': mid, 'labelIds': ['INBOX']}}]}
+                for hid, mid in page
+            ]
+        if offset + self.history_page_size < len(records):
+            body['nextPageToken'] = str(offset + self.history_page_size)
+        return 200, body
+
+    def get_message(self, message_id: str, query: Optional[Dict[str, List[str]]] = None):
+        """(status, body) for one messages.get"""
+        pending = self.failures.get(message_id)
+        if pending:
+            status = pending.pop(0)
+            return status, {'error': {'code': status, 'message': 'Injected failure'}}
+        message = self.messages.get(message_id)
+        if message is None:
+            return 404, {'error': {'code': 404, 'message': 'Requested entity was not found.'}}
+        query = query or {}
+        format = query.get('format', ['full'])[0]
+        self.formats[format] += 1
+        if format == 'metadata':
+            return 200, metadata_view(message, query.get('metadataHeaders', []))
+        return 200, message
+
+    def batch(self, content_type: str, body: bytes):
+        """Answer a multipart/mixed batch with one application/http part per sub-request"""
+        boundary = re.search(r'boundary="?([^";]+)"?', content_type).group(1)
+        parts = body.decode('utf-8').split(f'--{boundary}')
+        self.batch_sizes.append(0)
+
+        response_boundary = 'batch_fake_boundary'
+        out = []
+        for part in parts:
+            content_id = re.search(r'Content-ID:\s*<([^>]+)>', part, re.IGNORECASE)
+            request_line = re.search(r'^(GET|POST) (\S+) HTTP/1\.1', part, re.MULTILINE)
+            if not content_id or not request_line:
+                continue
+            self.batch_sizes[-1] += 1
+            url = urlsplit(request_line.group(2))
+            match = MESSAGES_PATH.match(url.path)
+            if match and match.group('id'):
+                status, payload = self.get_message(match.group('id'), parse_qs(url.query))
+            else:
+                status, payload = 404, {'error': {'code': 404, 'message': 'Unknown path'}}
+            out.append(
+                f"--{response_boundary}\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <response-{content_id.group(1)}>\r\n\r\n"
+                f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                "Content-Type: application/json; charset=UTF-8\r\n\r\n"
+                f"{json.dumps(payload)}\r\n"
+            )
+        out.append(f"--{response_boundary}--\r\n")
+        return f'multipart/mixed; boundary={response_boundary}', ''.join(out).encode('utf-8')
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, content_type: str, body: bytes):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_json(self, status: int, payload):
+                self._send(status, 'application/json', json.dumps(payload).encode('utf-8'))
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                if url.path == PROFILE_PATH:
+                    fake.calls['profile'] += 1
+                    return self._send_json(200, {'emailAddress': 'me@example.com', 'historyId': str(fake.history_id)})
+                if url.path == HISTORY_PATH:
+                    fake.calls['history'] += 1
+                    return self._send_json(*fake.list_history(parse_qs(url.query)))
+                match = MESSAGES_PATH.match(url.path)
+                if not match:
+                    return self._send_json(404, {'error': {'code': 404}})
+                if match.group('id'):
+                    fake.calls['get'] += 1
+                    return self._send_json(*fake.get_message(match.group('id'), parse_qs(url.query)))
+                fake.calls['list'] += 1
+                return self._send_json(*fake.list_messages(parse_qs(url.query)))
+
+            def do_POST(self):
+                if urlsplit(self.path).path != '/batch/gmail/v1':
+                    return self._send_json(404, {'error': {'code': 404}})
+                fake.calls['batch'] += 1
+                length = int(self.headers.get('Content-Length', 0))
+                content_type, body = fake.batch(self.headers['Content-Type'], self.rfile.read(length))
+                self._send(200, content_type, body)
+
+        return Handler
@@ -0,0 +1,58 @@
+"""
+Test suite for the ATS benchmark harness
+Only the corpus and the regression gate; the timed runs need the spaCy model
+"""
+
+from benchmarks.ats_benchmark import compare, percentile, summarize
+from benchmarks.corpus import job_corpus, resume_corpus, job_description
+
+
+class TestSyntheticCorpus:
+    """The corpus must be identical on every run and vary in length"""
+
+    def test_same_seed_same_text(self):
+        assert job_corpus(5, seed=7) == job_corpus(5, seed=7)
+        assert resume_corpus(5, seed=7) == resume_corpus(5, seed=7)
+        assert job_description(0, seed=7) != job_description(0, seed=8)
+
+    def test_lengths_cycle_short_medium_long(self):
+        lengths = [len(text) for text in job_corpus(3)]
+
+        assert lengths[0] < lengths[1] < lengths[2]
+
+    def test_jobs_have_sections_the_analyzer_reads(self):
+        text = job_description(1)
+
+        assert 'Requirements:' in text
+        assert 'years of experience' in text
+
+
+class TestRegressionGate:
+    """Only metrics that got worse by more than the threshold are reported"""
+
+    BASELINE = {'results': {'analyze_job_description': {
+        'p50_ms': 40.0, 'p95_ms': 80.0, 'throughput_per_s': 20.0, 'peak_rss_mb': 300.0
+    }}}
+
+    def _run(self, **metrics):
+        return {'results': {'analyze_job_description': {**self.BASELINE['results']['analyze_job_description'], **metrics}}}
+
+    def test_within_threshold_passes(self):
+        assert compare(self._run(p50_ms=44.0, throughput_per_s=17.0), self.BASELINE, 0.2) == []
+
+    def test_slower_latency_and_lower_throughput_fail(self):
+        regressions = compare(self._run(p95_ms=120.0, throughput_per_s=10.0), self.BASELINE, 0.2)
+
+        assert {r['metric'] for r in regressions} == {'p95_ms', 'throughput_per_s'}
+        assert regressions[0]['change'] == 0.5
+
+    def test_improvements_and_new_operations_are_ignored(self):
+        current = self._run(p50_ms=10.0, peak_rss_mb=100.0)
+        current['results']['optimize_resume'] = {'p50_ms': 999.0}
+
+        assert compare(current, self.BASELINE, 0.2) == []
+
+    def test_percentiles_interpolate(self):
+        assert percentile([1, 2, 3, 4], 50) == 2.5
+        assert percentile([5], 95) == 5
+        assert summarize([0.01, 0.02], 0.03)['p50_ms'] == 15.0
@@ -0,0 +1,539 @@
+"""
+Test suite for the ATS Optimizer service
+Covers section splitting, lazy model loading and the analysis cache
+without requiring the spaCy model to be installed
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from backend.services.ats_optimizer import ATSOptimizer
+
+
+JOB_DESCRIPTION = """About the role
+We are hiring a Data Analyst to join our growing team.
+
+Responsibilities:
+- Build dashboards in Tableau
+
+Requirements:
+- 3+ years of experience with SQL and Python
+- Bachelor's degree
+
+Nice to have: Power BI, AWS
+"""
+
+
+class TestSectionSplitting:
+    """Test job description section detection"""
+
+    def setup_method(self):
+        self.optimizer = ATSOptimizer()
+
+    def test_splits_known_headers(self):
+        sections = self.optimizer._split_into_sections(JOB_DESCRIPTION)
+
+        assert set(sections) == {'about', 'responsibilities', 'requirements', 'nice to have'}
+        assert 'SQL and Python' in sections['requirements']
+        assert 'Tableau' not in sections['requirements']
+
+    def test_inline_header_content_is_kept(self):
+        sections = self.optimizer._split_into_sections(JOB_DESCRIPTION)
+
+        assert sections['nice to have'] == 'Power BI, AWS'
+
+    def test_sentence_with_colon_is_not_a_header(self):
+        text = "Experience with the following tools is a plus: Jira, Confluence"
+
+        assert self.optimizer._split_into_sections(text) == {}
+
+    def test_section_ranges_point_into_the_original_text(self):
+        ranges = self.optimizer._section_ranges(JOB_DESCRIPTION)
+
+        start, end = ranges['nice to have'][0]
+        assert JOB_DESCRIPTION[start:end] == 'Power BI, AWS'
+        assert all(
+            '\n' not in JOB_DESCRIPTION[start:end]
+            for section in ranges.values() for start, end in section
+        )
+
+    def test_skill_sections_fall_back_to_full_text(self):
+        text = "Looking for a Python developer."
+
+        required, preferred = self.optimizer._skill_sections(text)
+
+        assert required == text
+        assert preferred == ''
+
+
+class TestLazyLoading:
+    """Models must not load until an analysis actually needs them"""
+
+    def test_construction_does_not_load_models(self):
+        optimizer = ATSOptimizer()
+
+        assert optimizer.is_loaded is False
+        assert optimizer.get_load_status()['loaded'] is False
+
+    def test_first_access_loads_once(self, mock_spacy_nlp):
+        optimizer = ATSOptimizer()
+
+        with patch('spacy.load', return_value=mock_spacy_nlp) as mock_load:
+            assert optimizer.nlp is mock_spacy_nlp
+            assert optimizer.nlp is mock_spacy_nlp
+            optimizer.warm()
+
+        mock_load.assert_called_once()
+        assert mock_load.call_args.kwargs['exclude'] == ATSOptimizer.UNUSED_PIPES
+        assert optimizer.is_loaded is True
+        assert optimizer.load_time_seconds is not None
+
+
+class TestKeywordIndex:
+    """Test corpus-wide document frequencies used for TF-IDF keywords"""
+
+    def setup_method(self, method):
+        from backend.services.keyword_index import KeywordIndex
+        self.index = KeywordIndex(n_buckets=2 ** 16)
+
+    def test_common_terms_rank_below_distinctive_terms(self):
+        corpus = [f"data analyst role number {i} requiring excel reporting" for i in range(20)]
+        self.index.add_many(corpus)
+        self.index.add_document("data analyst with kubernetes experience")
+
+        keywords = self.index.top_keywords("data analyst with kubernetes experience", top_n=5)
+
+        assert 'kubernetes' in keywords
+        assert 'data' not in keywords
+        assert 'analyst' not in keywords
+
+    def test_add_and_remove_are_symmetric(self):
+        self.index.add_document("python sql tableau")
+        self.index.add_document("python excel")
+        self.index.remove_document("python excel")
+
+        assert self.index.n_docs == 1
+        assert self.index.doc_freq[self.index._bucket('python')] == 1
+        assert self.index.doc_freq[self.index._bucket('excel')] == 0
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        from backend.services.keyword_index import KeywordIndex
+        self.index.path = tmp_path / 'index.npz'
+        self.index.add_many(["python sql", "python excel"])
+        self.index.save()
+
+        restored = KeywordIndex(path=str(self.index.path), n_buckets=2 ** 16)
+
+        assert restored.load() is True
+        assert restored.n_docs == 2
+        assert restored.idf('python') == self.index.idf('python')
+        assert restored.idf('python') < restored.idf('excel')
+
+    @pytest.mark.asyncio
+    async def test_failed_job_update_leaves_counts_unchanged(self, mock_async_db_session):
+        from fastapi import HTTPException
+        from backend.api.v1.jobs import JobUpdate, update_job
+        from backend.models.models import Job
+
+        self.index.add_document("python sql")
+        job = Job(id=1, title='Analyst', job_description="python sql")
+        mock_async_db_session.execute.return_value.scalar_one_or_none = MagicMock(return_value=job)
+        mock_async_db_session.commit.side_effect = RuntimeError("database is locked")
+
+        with patch('backend.api.v1.jobs.keyword_index', self.index), \
+                patch('backend.api.v1.jobs.job_analysis_cache.refresh_job', AsyncMock()):
+            with pytest.raises(HTTPException):
+                await update_job(1, JobUpdate(job_description="kubernetes docker"), mock_async_db_session)
+
+        mock_async_db_session.rollback.assert_awaited_once()
+        assert self.index.doc_freq[self.index._bucket('python')] == 1
+        assert self.index.doc_freq[self.index._bucket('kubernetes')] == 0
+
+
+class TestJobAnalysisCache:
+    """Test the in-process LRU in front of the job_analyses table"""
+
+    def setup_method(self):
+        from backend.services.analysis_cache import JobAnalysisCache
+        self.cache = JobAnalysisCache(max_entries=2)
+
+    def test_content_hash_is_stable(self):
+        first = self.cache.content_hash("Senior Analyst role")
+
+        assert first == self.cache.content_hash("Senior Analyst role")
+        assert first != self.cache.content_hash("Senior Analyst role.")
+        assert len(first) == 64
+
+    def test_lru_evicts_least_recently_used(self):
+        for name in ('a', 'b'):
+            self.cache._remember(self.cache._key(name), {'keywords': [name]})
+
+        # Touch 'a' so 'b' becomes the eviction candidate
+        self.cache._entries.move_to_end(self.cache._key('a'))
+        self.cache._remember(self.cache._key('c'), {'keywords': ['c']})
+
+        assert self.cache._key('a') in self.cache._entries
+        assert self.cache._key('b') not in self.cache._entries
+        assert len(self.cache._entries) == 2
+
+    @pytest.mark.asyncio
+    async def test_memory_hit_skips_database(self, mock_async_db_session):
+        self.cache._remember(self.cache._key('cached'), {'keywords': ['sql']})
+
+        analysis = await self.cache.get(mock_async_db_session, 'cached')
+
+        assert analysis == {'keywords': ['sql']}
+        mock_async_db_session.execute.assert_not_called()
+        assert self.cache.stats['memory_hits'] == 1
+
+    @pytest.mark.asyncio
+    async def test_backfill_gives_existing_jobs_skill_ids(self):
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+        from backend.core.database import Base
+        from backend.models.models import Job
+        from backend.services.skill_dictionary import SkillDictionary
+
+        engine = create_async_engine('sqlite+aiosqlite:///:memory:')
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        skills = SkillDictionary()
+
+        async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+            db.add_all([
+                Job(title='Analyst', job_description='SQL and Python role'),
+                Job(title='Untitled', job_description='')
+            ])
+            await self.cache.put(db, 'SQL and Python role', {'required_skills': ['MySQL', 'python']})
+            await db.commit()
+
+            with patch('backend.services.analysis_cache.skill_dictionary', skills):
+                filled = await self.cache.backfill_skill_ids(db)
+                refilled = await self.cache.backfill_skill_ids(db)
+
+            analyst = await db.get(Job, 1)
+            await db.refresh(analyst)
+        await engine.dispose()
+
+        assert (filled, refilled) == (1, 0)
+        assert sorted(skills.name(i) for i in skills.decode(analyst.skill_ids)) == ['python', 'sql']
+        assert self.cache.stats['misses'] == 0
+
+
+class TestSkillDictionary:
+    """Surface forms resolve to one canonical skill and one compact ID array"""
+
+    def setup_method(self):
+        from backend.services.skill_dictionary import SkillDictionary
+        self.skills = SkillDictionary()
+        for skill_id, name in enumerate(['sql', 'python', 'tableau'], 1):
+            self.skills._remember(skill_id, name)
+
+    def test_synonyms_and_formatting_share_a_canonical_form(self):
+        assert self.skills.canonical('MySQL') == 'sql'
+        assert self.skills.canonical(' T-SQL, ') == 'sql'
+        assert self.skills.canonical('Machine   Learning') == 'machine learning'
+        assert self.skills.canonical_set(['Python3', 'py', 'python']) == {'python'}
+
+    def test_arrays_are_sorted_unique_and_round_trip(self):
+        import numpy as np
+
+        ids = self.skills.to_array(['tableau', 'PostgreSQL', 'sql', 'unregistered'])
+
+        assert ids.dtype == np.uint32
+        assert ids.tolist() == [1, 3]
+        assert self.skills.decode(self.skills.encode(ids)).tolist() == [1, 3]
+        assert len(self.skills.decode(None)) == 0
+
+    def test_match_count_intersects_id_arrays(self):
+        job = self.skills.to_array(['sql', 'python', 'tableau'])
+        resume = self.skills.to_array(['mysql', 'py'])
+
+        assert self.skills.match_count(job, resume) == 2
+
+
+def _register_skills(names):
+    """Give test skills IDs in the shared dictionary without a database"""
+    from backend.services.skill_dictionary import skill_dictionary
+    for name in skill_dictionary.canonical_set(names):
+        if skill_dictionary.lookup(name) is None:
+            skill_dictionary._remember(skill_dictionary.max_id + 1, name)
+
+
+class TestJobRanker:
+    """The vectorized ranker must agree with the per-job ATS score"""
+
+    def setup_method(self):
+        from backend.services.job_ranker import JobRanker
+        from backend.services.skill_dictionary import skill_dictionary
+        _register_skills(['sql', 'python', 'tableau', 'kubernetes'])
+        self.ranker = JobRanker()
+        self.jobs = [
+            {'id': 1, 'title': 'Analyst', 'company': 'Acme', 'analysis': {
+                'required_skills': ['sql', 'python', 'tableau'], 'keywords': ['sql', 'dashboards', 'claims'],
+                'experience_years': 3, 'education_level': 'bachelor'}},
+            {'id': 2, 'title': 'Engineer', 'company': 'Beta', 'analysis': {
+                'required_skills': ['kubernetes'], 'keywords': ['docker', 'kubernetes'],
+                'experience_years': 8, 'education_level': 'master'}},
+            {'id': 3, 'title': 'Coordinator', 'company': 'Gamma', 'analysis': {
+                'required_skills': [], 'keywords': [], 'experience_years': 0, 'education_level': None}}
+        ]
+        for job in self.jobs:
+            job['skill_ids'] = skill_dictionary.to_array(job['analysis']['required_skills'])
+        self.ranker.jobs = self.jobs
+        self.ranker._matrices = self.ranker._build_matrices(self.jobs)
+        self.ranker._stale = False
+        self.resume = {
+            'text': 'Built SQL dashboards in Tableau for claims reporting',
+            'skills': ['MySQL', 'tableau', 'excel'], 'format_issues': ['Contains tables'],
+            'experience_years': 4, 'education': 'bachelor'
+        }
+
+    def test_scores_match_calculate_ats_score(self):
+        optimizer = ATSOptimizer()
+
+        ranked = self.ranker.rank(self.resume, top_k=3)
+        expected = {
+            job['id']: optimizer._calculate_ats_score(self.resume, job['analysis'])
+            for job in self.jobs
+        }
+
+        assert {r['job_id']: r['ats_score'] for r in ranked} == expected
+
+    def test_stored_skill_ids_score_like_skill_names(self):
+        optimizer = ATSOptimizer()
+
+        for job in self.jobs:
+            by_ids = optimizer._calculate_ats_score(self.resume, {**job['analysis'], 'skill_ids': job['skill_ids']})
+            assert by_ids == optimizer._calculate_ats_score(self.resume, job['analysis'])
+
+    def test_rank_orders_best_first_and_truncates(self):
+        ranked = self.ranker.rank(self.resume, top_k=2)
+
+        assert len(ranked) == 2
+        assert ranked[0]['job_id'] == 1
+        assert ranked[0]['ats_score'] >= ranked[1]['ats_score']
+
+    def test_invalidate_marks_stale(self):
+        self.ranker.invalidate()
+
+        assert self.ranker.get_stats()['stale'] is True
+
+
+class TestIncrementalResumeScorer:
+    """Candidate edits are scored from the resume's existing analysis"""
+
+    RESUME = "Jane Doe\nSummary\nAnalyst with dashboards experience\nSkills\nExcel\nEducation\nBachelor's degree"
+
+    def setup_method(self):
+        self.optimizer = ATSOptimizer()
+        # No model needed: parses yield no noun chunks, so skills come from the phrase matcher
+        fake_doc = MagicMock()
+        fake_doc.char_span.return_value = None
+        self.optimizer._nlp = MagicMock()
+        self.optimizer._nlp.pipe.side_effect = lambda texts: [fake_doc for _ in texts]
+        self.optimizer._nlp.return_value = fake_doc
+
+        self.resume = {
+            'text': self.RESUME, 'skills': ['excel'], 'action_verbs': [],
+            'education': "Bachelor's degree", 'experience_years': 0, 'format_issues': []
+        }
+        self.job = {
+            'required_skills': ['sql', 'excel', 'tableau'], 'preferred_skills': [],
+            'keywords': ['sql', 'tableau', 'dashboards'], 'action_verbs': [],
+            'experience_years': 0, 'education_level': None
+        }
+
+    def test_insertion_score_matches_full_score_of_edited_resume(self):
+        from backend.services.resume_scorer import IncrementalResumeScorer
+        scorer = IncrementalResumeScorer(self.optimizer, self.resume, self.job)
+        position = self.RESUME.index('Skills') + len('Skills')
+
+        score = scorer.score_insertion(position, '\nSQL, Tableau')
+
+        edited = dict(self.resume, text=scorer.apply(position, '\nSQL, Tableau'),
+                      skills=['excel', 'sql', 'tableau'])
+        assert score == self.optimizer._calculate_ats_score(edited, self.job)
+        assert score > scorer.base_score
+
+    def test_best_edit_adds_only_the_terms_that_help(self):
+        report = self.optimizer.optimize_resume('resume.txt', self.job, parsed_resume={
+            'text': self.RESUME, 'analysis': self.resume, 'format_issues': []
+        })
+
+        edit = report['best_edit']
+        assert sorted(edit['added_terms']) == ['sql', 'tableau']
+        assert edit['anchor'] == 'Skills'
+        assert report['optimized_score'] == edit['score'] > report['current_score']
+        assert report['candidates_evaluated'] > 1
+
+    def test_no_skills_header_means_no_edit(self):
+        text = self.RESUME.replace('Skills', 'Tools')
+        resume = dict(self.resume, text=text)
+
+        report = self.optimizer.optimize_resume('resume.txt', self.job, parsed_resume={
+            'text': text, 'analysis': resume, 'format_issues': []
+        })
+
+        assert report['best_edit'] is None
+        assert report['optimized_score'] == report['current_score']
+
+
+class TestResumeCache:
+    """Repeat uploads of the same file must skip parsing entirely"""
+
+    PARSED = {'text': 'resume', 'analysis': {'skills': ['sql']}, 'format_issues': []}
+
+    def _cache(self, tmp_path, persist=False):
+        from backend.services.resume_cache import ResumeCache
+        return ResumeCache(max_entries=2, persist=persist, cache_dir=str(tmp_path))
+
+    @pytest.mark.asyncio
+    async def test_second_upload_is_a_memory_hit(self, tmp_path):
+        cache = self._cache(tmp_path)
+
+        with patch('backend.services.ats_executor.ats_optimizer.parse_resume',
+                   return_value=self.PARSED) as mock_parse:
+            first = await cache.get_or_parse(b'resume bytes', 'resume.docx')
+            second = await cache.get_or_parse(b'resume bytes', 'resume.docx')
+
+        mock_parse.assert_called_once()
+        assert first is second
+        assert cache.get_stats()['memory_hits'] == 1
+        assert cache.get_stats()['misses'] == 1
+
+    def test_extension_is_part_of_the_key(self, tmp_path):
+        cache = self._cache(tmp_path)
+
+        assert cache._key(b'same', 'a.txt') != cache._key(b'same', 'a.docx')
+        assert cache._key(b'same', 'a.docx') == cache._key(b'same', 'b.docx')
+
+    @pytest.mark.asyncio
+    async def test_persisted_entries_survive_a_restart(self, tmp_path):
+        cache = self._cache(tmp_path, persist=True)
+        with patch('backend.services.ats_executor.ats_optimizer.parse_resume',
+                   return_value=self.PARSED):
+            await cache.get_or_parse(b'resume bytes', 'resume.txt')
+
+        restarted = self._cache(tmp_path, persist=True)
+
+        assert restarted.get(b'resume bytes', 'resume.txt') == self.PARSED
+        assert restarted.get_stats()['disk_hits'] == 1
+
+
+class TestATSExecutor:
+    """Bounded submission and backpressure for CPU-bound ATS work"""
+
+    def setup_method(self):
+        from backend.services.ats_executor import ATSExecutor
+        self.executor = ATSExecutor(workers=0, max_pending=1)
+
+    @pytest.mark.asyncio
+    async def test_runs_work_off_the_event_loop(self):
+        import threading
+
+        thread_name = await self.executor.run(lambda: threading.current_thread().name)
+
+        assert thread_name != threading.current_thread().name
+        assert self.executor.get_stats()['completed'] == 1
+        assert self.executor.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_saturated(self):
+        import asyncio
+        import threading
+        from backend.services.ats_executor import ATSBusyError
+
+        release = threading.Event()
+        running = asyncio.ensure_future(self.executor.run(release.wait))
+        await asyncio.sleep(0)
+
+        with pytest.raises(ATSBusyError) as busy:
+            await self.executor.run(lambda: None)
+
+        release.set()
+        await running
+        assert busy.value.retry_after >= 1
+        assert self.executor.get_stats()['rejected'] == 1
+
+
+class TestDocxInspector:
+    """Streaming DOCX inspection must read text exactly like python-docx"""
+
+    DOCUMENT = (
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" '
+        'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"><w:body>'
+        '<w:p><w:r><w:t>Jane Doe</w:t><w:tab/><w:t>Analyst</w:t></w:r></w:p>'
+        '<w:p><w:r><w:drawing><a:blip r:embed="rId5"/></w:drawing></w:r>'
+        '<w:r><w:pict><w:txbxContent><w:p><w:r><w:t>boxed</w:t></w:r></w:p></w:txbxContent></w:pict></w:r></w:p>'
+        '<w:tbl><w:tr><w:tc><w:p><w:r><w:t>cell</w:t></w:r></w:p></w:tc></w:tr></w:tbl>'
+        '<w:sectPr><w:headerReference w:type="default" r:id="rId1"/>'
+        '<w:footerReference w:type="default" r:id="rId2"/></w:sectPr>'
+        '</w:body></w:document>'
+    )
+
+    def _write_docx(self, path, header_text='Contact', footer_text=''):
+        import zipfile
+        w_ns = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+        rel_ns = 'xmlns="http://schemas.openxmlformats.org/package/2006/relationships"'
+        rel_type = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+        with zipfile.ZipFile(path, 'w') as archive:
+            archive.writestr('_rels/.rels', (
+                f'<Relationships {rel_ns}><Relationship Id="rId1" '
+                f'Type="{rel_type}/officeDocument" Target="word/document.xml"/></Relationships>'
+            ))
+            archive.writestr('word/_rels/document.xml.rels', (
+                f'<Relationships {rel_ns}>'
+                f'<Relationship Id="rId1" Type="{rel_type}/header" Target="header1.xml"/>'
+                f'<Relationship Id="rId2" Type="{rel_type}/footer" Target="footer1.xml"/>'
+                f'</Relationships>'
+            ))
+            archive.writestr('word/document.xml', self.DOCUMENT)
+            archive.writestr('word/header1.xml', f'<w:hdr {w_ns}><w:p><w:r><w:t>{header_text}</w:t></w:r></w:p></w:hdr>')
+            archive.writestr('word/footer1.xml', f'<w:ftr {w_ns}><w:p><w:r><w:t>{footer_text}</w:t></w:r></w:p></w:ftr>')
+        return str(path)
+
+    def test_detects_format_features(self, tmp_path):
+        from backend.services.docx_inspector import inspect_docx
+
+        inspection = inspect_docx(self._write_docx(tmp_path / 'resume.docx'))
+
+        assert inspection['tables'] == 1
+        assert inspection['images'] == 1
+        assert inspection['text_boxes'] == 1
+        assert inspection['has_headers'] is True
+        assert inspection['has_footers'] is False
+
+    def test_text_skips_tables_and_text_boxes(self, tmp_path):
+        from backend.services.docx_inspector import inspect_docx
+
+        inspection = inspect_docx(self._write_docx(tmp_path / 'resume.docx'))
+
+        assert inspection['text'] == 'Jane Doe\tAnalyst\n'
+
+    def test_text_matches_python_docx(self, tmp_path):
+        from docx import Document
+        from backend.services.docx_inspector import inspect_docx
+
+        document = Document()
+        document.add_paragraph('Summary')
+        paragraph = document.add_paragraph('Built dashboards\tin Tableau')
+        paragraph.add_run('line one').add_break()
+        document.add_table(rows=1, cols=1).cell(0, 0).text = 'ignored'
+        document.add_paragraph('  SQL, Python  ')
+        path = str(tmp_path / 'generated.docx')
+        document.save(path)
+
+        expected = '\n'.join(p.text for p in Document(path).paragraphs)
+
+        assert inspect_docx(path)['text'] == expected
+
+    def test_format_issues_use_inspection(self, tmp_path):
+        optimizer = ATSOptimizer()
+
+        issues = optimizer._check_format_issues(self._write_docx(tmp_path / 'resume.docx'))
+
+        assert "Contains 1 tables - may confuse ATS" in issues
+        assert "Contains images - remove for ATS" in issues
+        assert any('text boxes' in issue for issue in issues)
+        assert not any('footers' in issue for issue in issues)
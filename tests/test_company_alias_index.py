@@ -0,0 +1,112 @@
+"""
+Test suite for the company/domain alias index used to match emails to applications
+"""
+
+import pytest
+from datetime import datetime
+
+from backend.models.models import Application, ApplicationStatus, Company, Job
+from backend.services.company_alias_index import (
+    CompanyAliasIndex, normalize_name, sender_keys, url_aliases
+)
+
+
+class TestAliasNormalization:
+    """Senders, websites and ATS URLs reduce to the same keys"""
+
+    def test_normalize_name_drops_suffixes_and_punctuation(self):
+        assert normalize_name('Acme Health, Inc.') == 'acme health'
+        assert normalize_name('Smith & Jones LLC') == 'smith and jones'
+
+    def test_company_site_sender(self):
+        assert sender_keys('Jane Recruiter <jane@careers.acmehealth.com>') == [
+            'domain:acmehealth.com', 'slug:acmehealth'
+        ]
+        assert sender_keys('someone@gmail.com') == []
+
+    def test_ats_tenant_from_sender(self):
+        assert sender_keys('acme@myworkday.com') == ['slug:acme']
+        assert sender_keys('no-reply@acme.greenhouse-mail.io') == ['slug:acme']
+        assert sender_keys('no-reply@us.greenhouse-mail.io') == []
+
+    def test_ats_tenant_from_job_url(self):
+        assert url_aliases('https://acme.wd5.myworkdayjobs.com/en-US/External/job/123') == {'slug:acme'}
+        assert url_aliases('https://boards.greenhouse.io/acme/jobs/42') == {'slug:acme'}
+        assert url_aliases('https://www.linkedin.com/jobs/view/1') == set()
+
+
+class TestCompanyAliasIndex:
+    """Lookups resolve to the most recent active application"""
+
+    def setup_method(self):
+        self.index = CompanyAliasIndex()
+        self.index.put_company(1, 'Acme Health, Inc.', 'https://www.acmehealth.com')
+        self.index.put_company(2, 'Globex', None)
+        self.index.put_job(10, 1, 'https://acme.wd5.myworkdayjobs.com/External/job/10')
+        self.index.put_job(11, 1, None)
+        self.index.put_job(20, 2, 'https://boards.greenhouse.io/globex/jobs/20')
+        self.index.put_application(100, 10, ApplicationStatus.APPLIED, datetime(2025, 9, 1))
+        self.index.put_application(101, 11, ApplicationStatus.INTERVIEWING, datetime(2025, 10, 1))
+        self.index.put_application(200, 20, ApplicationStatus.APPLIED, datetime(2025, 9, 15))
+
+    def test_sender_domain_prefers_latest_application(self):
+        assert self.index.match('recruiting@acmehealth.com') == 101
+
+    def test_ats_tenant_and_name_lookups(self):
+        assert self.index.match('acme@myworkday.com') == 101
+        assert self.index.match('no-reply@us.greenhouse-mail.io', 'Globex') == 200
+        assert self.index.match('someone@gmail.com', 'Acme Health') == 101
+        assert self.index.match('someone@gmail.com', 'Initech') is None
+
+    def test_inactive_and_removed_entries_stop_matching(self):
+        self.index.put_application(101, 11, ApplicationStatus.REJECTED, datetime(2025, 10, 1))
+        assert self.index.match('recruiting@acmehealth.com') == 100
+
+        self.index.remove_job(10)
+        assert self.index.match('recruiting@acmehealth.com') is None
+
+        self.index.put_company(2, 'Globex Corporation', 'globex.io')
+        assert self.index.match('talent@globex.io') == 200
+
+
+class TestAliasIndexSessionEvents:
+    """Committed changes reach the index; rolled back ones don't"""
+
+    @pytest.mark.asyncio
+    async def test_commit_applies_and_rollback_discards(self):
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+        from backend.core.database import Base
+        from backend.services.company_alias_index import company_alias_index
+
+        engine = create_async_engine('sqlite+aiosqlite:///:memory:')
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        company_alias_index.__init__()
+
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                await company_alias_index.ensure_loaded(db)
+
+                company = Company(name='Initech', website='https://initech.com')
+                job = Job(title='Analyst', company=company)
+                application = Application(job=job, status=ApplicationStatus.APPLIED, applied_date=datetime.now())
+                db.add_all([company, job, application])
+                await db.flush()
+                assert company_alias_index.match('hr@initech.com') is None  # not committed yet
+
+                await db.commit()
+                application_id = application.id
+                assert company_alias_index.match('hr@initech.com') == application_id
+
+                application.status = ApplicationStatus.WITHDRAWN
+                await db.flush()
+                await db.rollback()
+                assert company_alias_index.match('hr@initech.com') == application_id
+
+                await db.refresh(application)
+                application.status = ApplicationStatus.REJECTED
+                await db.commit()
+                assert company_alias_index.match('hr@initech.com') is None
+        finally:
+            company_alias_index.__init__()
+            await engine.dispose()
@@ -0,0 +1,106 @@
+"""
+Test suite for the trainable email classifier and the heuristic fallback
+"""
+
+import pytest
+from unittest.mock import patch
+
+from backend.core.config import settings
+from backend.models.models import ResponseType
+from backend.services.email_classifier import EmailClassifier
+from backend.services.email_service import EmailAutomationService
+from benchmarks.corpus import email_corpus
+from benchmarks.email_classifier_eval import evaluate, split
+
+
+def labeled(count, seed=42):
+    emails = email_corpus(count, seed)
+    return emails, [ResponseType(email['label']) for email in emails]
+
+
+@pytest.fixture
+def classifier(tmp_path):
+    return EmailClassifier(path=tmp_path / 'email_classifier.joblib')
+
+
+class TestTraining:
+    """The model learns from confirmed labels and refuses too little data"""
+
+    def test_needs_minimum_examples_and_two_classes(self, classifier):
+        emails, labels = labeled(settings.EMAIL_CLASSIFIER_MIN_EXAMPLES - 1)
+        with pytest.raises(ValueError, match='at least'):
+            classifier.fit(emails, labels)
+
+        emails, _ = labeled(settings.EMAIL_CLASSIFIER_MIN_EXAMPLES)
+        with pytest.raises(ValueError, match='one classification'):
+            classifier.fit(emails, [ResponseType.OTHER] * len(emails))
+        assert not classifier.is_ready()
+
+    def test_batch_prediction_on_held_out_emails(self, classifier):
+        emails, labels = labeled(600)
+        train_emails, train_labels, test_emails, test_labels = split(emails, labels, 0.25, seed=1)
+        classifier.fit(train_emails, train_labels)
+
+        predictions = classifier.predict_many(test_emails)
+
+        assert len(predictions) == len(test_emails)
+        correct = sum(kind == label for (kind, _), label in zip(predictions, test_labels))
+        assert correct / len(test_labels) > 0.9
+        assert all(0.0 < confidence <= 1.0 for _, confidence in predictions)
+
+    def test_saved_model_is_picked_up_by_other_instances(self, classifier):
+        emails, labels = labeled(200)
+        classifier.train(emails, labels)
+        other = EmailClassifier(path=classifier.path)
+
+        assert other.is_ready()
+        assert other.meta['examples'] == 200
+        assert other.predict_many(emails[:5]) == classifier.predict_many(emails[:5])
+
+
+class TestClassifyBatch:
+    """Scans use the model once trained and the keyword heuristic before that"""
+
+    def setup_method(self):
+        with patch('backend.services.email_service.build'):
+            with patch('backend.services.email_service.Credentials'):
+                self.service = EmailAutomationService()
+
+    def teardown_method(self):
+        self.service.transport.shutdown()
+
+    def test_untrained_falls_back_to_heuristic(self, classifier):
+        email = {'subject': 'Offer letter', 'body': 'Congratulations! We are pleased to offer you the role. '
+                 'Your salary, benefits and start date are attached.'}
+
+        with patch('backend.services.email_service.email_classifier', classifier):
+            result = self.service._classify_batch([email])[0]
+
+        assert result['source'] == 'heuristic'
+        assert result['type'] == ResponseType.OFFER
+
+    def test_trained_model_classifies_whole_batch(self, classifier):
+        emails, labels = labeled(300)
+        classifier.train(emails, labels)
+
+        with patch('backend.services.email_service.email_classifier', classifier), \
+                patch.object(classifier, 'predict_many', wraps=classifier.predict_many) as predict:
+            results = self.service._classify_batch(emails[:40])
+
+        predict.assert_called_once()
+        assert [r['source'] for r in results] == ['model'] * 40
+        for result in results:
+            assert result['action_required'] == (result['type'] in {
+                ResponseType.INTERVIEW, ResponseType.OFFER, ResponseType.INFO_REQUEST
+            })
+
+
+def test_evaluation_reports_accuracy_and_throughput():
+    emails, labels = labeled(300)
+
+    report = evaluate(emails, labels, test_fraction=0.2, seed=3, repeat=1)
+
+    assert report['test_examples'] == 60
+    for name in ('model', 'heuristic'):
+        assert 0.0 <= report[name]['accuracy'] <= 1.0
+        assert report[name]['emails_per_s'] > 0
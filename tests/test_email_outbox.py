@@ -0,0 +1,297 @@
+"""
+Test suite for the outgoing email outbox: idempotency, throttling and retries
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import patch, AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+from googleapiclient.errors import HttpError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from backend.core.config import settings
+from backend.core.database import Base
+from backend.models.models import (
+    Application, ApplicationStatus, Company, Job, OutboundEmail, OutboxStatus
+)
+from backend.services.email_outbox import EmailOutbox, TokenBucket
+from backend.services.followup_service import FollowUpService
+
+
+def http_error(status):
+    return HttpError(MagicMock(status=status), b'{}')
+
+
+@pytest_asyncio.fixture
+async def sessions():
+    engine = create_async_engine('sqlite+aiosqlite:///:memory:')
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+def make_outbox(sessions, sender):
+    outbox = EmailOutbox(sender=sender, session_factory=sessions)
+    outbox.bucket = TokenBucket(rate_per_minute=6000, burst=100)
+    return outbox
+
+
+async def queue(outbox, sessions, key='k1'):
+    async with sessions() as db:
+        email, created = await outbox.enqueue(db, 'me@example.com', 'Hello', 'Body', idempotency_key=key)
+        await db.commit()
+    return email, created
+
+
+async def load(sessions, email_id):
+    async with sessions() as db:
+        return await db.get(OutboundEmail, email_id)
+
+
+class TestTokenBucket:
+    """Bursts are allowed up to capacity, then sends are spaced at the rate"""
+
+    @pytest.mark.asyncio
+    async def test_waits_once_burst_is_spent(self):
+        now = [0.0]
+        bucket = TokenBucket(rate_per_minute=60, burst=2, clock=lambda: now[0])
+
+        async def fake_sleep(seconds):
+            now[0] += seconds
+
+        with patch('backend.services.email_outbox.asyncio.sleep', side_effect=fake_sleep):
+            for _ in range(4):
+                await bucket.acquire()
+
+        assert now[0] == pytest.approx(2.0)
+        assert bucket.waited_seconds == pytest.approx(2.0)
+
+
+class TestOutbox:
+    """Each key is sent once; transient failures back off and retry"""
+
+    @pytest.mark.asyncio
+    async def test_enqueue_is_idempotent(self, sessions):
+        sender = AsyncMock(return_value='gmail-1')
+        outbox = make_outbox(sessions, sender)
+
+        first, created = await queue(outbox, sessions)
+        second, created_again = await queue(outbox, sessions)
+        assert created and not created_again
+        assert second.id == first.id
+
+        assert await outbox.run_once() == 1
+        assert await outbox.run_once() == 0
+        sender.assert_awaited_once()
+
+        email = await load(sessions, first.id)
+        assert email.status == OutboxStatus.SENT
+        assert email.gmail_message_id == 'gmail-1'
+
+        async with sessions() as db:
+            stats = await outbox.get_stats(db)
+        assert stats['queue']['SENT'] == 1 and stats['queue']['PENDING'] == 0
+        assert stats['sent'] == 1 and stats['duplicates'] == 1
+        assert stats['queue_latency']['p50_s'] is not None
+
+    @pytest.mark.asyncio
+    async def test_transient_error_retries_with_backoff(self, sessions):
+        sender = AsyncMock(side_effect=[http_error(503), http_error(429), 'gmail-1'])
+        outbox = make_outbox(sessions, sender)
+        queued, _ = await queue(outbox, sessions)
+
+        delays = []
+        for _ in range(2):
+            await outbox.run_once()
+            email = await load(sessions, queued.id)
+            assert email.status == OutboxStatus.PENDING
+            delays.append((email.next_attempt_at - datetime.now()).total_seconds())
+            # Nothing is due until the backoff elapses
+            assert await outbox.run_once() == 0
+            async with sessions() as db:
+                email = await db.get(OutboundEmail, queued.id)
+                email.next_attempt_at = datetime.now()
+                await db.commit()
+
+        base = settings.OUTBOX_RETRY_BASE_SECONDS
+        assert delays[0] == pytest.approx(base, abs=2)
+        assert delays[1] == pytest.approx(base * 2, abs=2)
+
+        await outbox.run_once()
+        email = await load(sessions, queued.id)
+        assert email.status == OutboxStatus.SENT
+        assert email.attempts == 3
+        assert outbox.stats['retried'] == 2
+
+    @pytest.mark.asyncio
+    async def test_permanent_error_fails_without_retry(self, sessions):
+        outbox = make_outbox(sessions, AsyncMock(side_effect=http_error(400)))
+        queued, _ = await queue(outbox, sessions)
+
+        await outbox.run_once()
+
+        email = await load(sessions, queued.id)
+        assert email.status == OutboxStatus.FAILED
+        assert 'HttpError' in email.last_error
+
+    @pytest.mark.asyncio
+    async def test_interrupted_send_is_not_resent(self, sessions):
+        sender = AsyncMock(return_value='gmail-1')
+        outbox = make_outbox(sessions, sender)
+        queued, _ = await queue(outbox, sessions)
+        async with sessions() as db:
+            email = await db.get(OutboundEmail, queued.id)
+            email.status = OutboxStatus.SENDING
+            email.next_attempt_at = datetime.now() - timedelta(seconds=settings.OUTBOX_SENDING_LEASE_SECONDS + 1)
+            await db.commit()
+
+        assert await outbox.run_once() == 0
+
+        sender.assert_not_awaited()
+        assert (await load(sessions, queued.id)).status == OutboxStatus.FAILED
+        assert outbox.stats['abandoned'] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_email_is_only_requeued_on_request(self, sessions):
+        sender = AsyncMock(side_effect=[http_error(400), 'gmail-1'])
+        outbox = make_outbox(sessions, sender)
+        queued, _ = await queue(outbox, sessions)
+        await outbox.run_once()
+
+        _, again = await queue(outbox, sessions)
+        assert not again
+        assert (await load(sessions, queued.id)).status == OutboxStatus.FAILED
+
+        async with sessions() as db:
+            email, requeued = await outbox.enqueue(db, 'me@example.com', 'Hello', 'Body',
+                                                   idempotency_key='k1', retry_failed=True)
+            await db.commit()
+        assert requeued and email.id == queued.id
+        assert email.status == OutboxStatus.PENDING and email.attempts == 0
+
+        assert await outbox.run_once() == 1
+        assert (await load(sessions, queued.id)).status == OutboxStatus.SENT
+        assert outbox.stats['requeued'] == 1
+
+
+class TestFollowUpEnqueue:
+    """send_followup_email_safe queues instead of calling Gmail inline"""
+
+    @pytest.mark.asyncio
+    async def test_followup_is_queued_then_marked_sent(self, sessions):
+        async with sessions() as db:
+            application = Application(
+                job=Job(title='Analyst', company=Company(name='Initech')),
+                status=ApplicationStatus.APPLIED,
+                applied_date=datetime.now() - timedelta(days=10),
+                follow_ups_sent=0
+            )
+            db.add(application)
+            await db.commit()
+            application_id = application.id
+
+        sender = AsyncMock(return_value='gmail-1')
+        outbox = make_outbox(sessions, sender)
+        service = FollowUpService()
+        gmail = MagicMock()
+
+        with patch('backend.services.followup_service.email_outbox', outbox), \
+                patch('backend.services.followup_service.settings.LIVE_SEND_MODE', True), \
+                patch('backend.services.followup_service.settings.TEST_RECIPIENT_OVERRIDE', 'me@example.com'), \
+                patch('backend.services.followup_service.followup_service', service):
+            async with sessions() as db:
+                first = await service.send_followup_email_safe(db, application_id, gmail)
+            async with sessions() as db:
+                again = await service.send_followup_email_safe(db, application_id, gmail)
+            gmail.send_follow_up.assert_not_called()
+            assert first['success'] and first['queued'] and not first['duplicate']
+            assert again['duplicate'] and again['outbox_id'] == first['outbox_id']
+
+            await outbox.run_once()
+
+        sender.assert_awaited_once()
+        async with sessions() as db:
+            application = await db.get(Application, application_id)
+            assert application.follow_ups_sent == 1
+            sent = (await db.execute(select(OutboundEmail))).scalar_one()
+        assert sent.status == OutboxStatus.SENT
+        assert sent.to_address == 'me@example.com'
+
+    @pytest.mark.asyncio
+    async def test_failed_followup_is_queued_again_on_request(self, sessions):
+        async with sessions() as db:
+            application = Application(
+                job=Job(title='Analyst', company=Company(name='Initech')),
+                status=ApplicationStatus.APPLIED,
+                follow_ups_sent=0
+            )
+            db.add(application)
+            await db.commit()
+            application_id = application.id
+
+        sender = AsyncMock(side_effect=[http_error(400), 'gmail-1'])
+        outbox = make_outbox(sessions, sender)
+        service = FollowUpService()
+
+        with patch('backend.services.followup_service.email_outbox', outbox), \
+                patch('backend.services.followup_service.settings.LIVE_SEND_MODE', True), \
+                patch('backend.services.followup_service.settings.TEST_RECIPIENT_OVERRIDE', 'me@example.com'), \
+                patch('backend.services.followup_service.followup_service', service):
+            async with sessions() as db:
+                first = await service.send_followup_email_safe(db, application_id)
+            await outbox.run_once()
+
+            async with sessions() as db:
+                blocked = await service.send_followup_email_safe(db, application_id)
+            async with sessions() as db:
+                retried = await service.send_followup_email_safe(db, application_id, retry_failed=True)
+            await outbox.run_once()
+
+        assert blocked['duplicate'] and not blocked['success']
+        assert retried['success'] and not retried['duplicate']
+        assert retried['outbox_id'] == first['outbox_id']
+        assert sender.await_count == 2
+        async with sessions() as db:
+            assert (await db.get(Application, application_id)).follow_ups_sent == 1
+
+    @pytest.mark.asyncio
+    async def test_abandoned_followup_is_not_requeued_by_a_plain_call(self, sessions):
+        async with sessions() as db:
+            application = Application(
+                job=Job(title='Analyst', company=Company(name='Initech')),
+                status=ApplicationStatus.APPLIED,
+                follow_ups_sent=0
+            )
+            db.add(application)
+            await db.commit()
+            application_id = application.id
+
+        sender = AsyncMock(return_value='gmail-1')
+        outbox = make_outbox(sessions, sender)
+        service = FollowUpService()
+
+        with patch('backend.services.followup_service.email_outbox', outbox), \
+                patch('backend.services.followup_service.settings.LIVE_SEND_MODE', True), \
+                patch('backend.services.followup_service.settings.TEST_RECIPIENT_OVERRIDE', 'me@example.com'), \
+                patch('backend.services.followup_service.followup_service', service):
+            async with sessions() as db:
+                first = await service.send_followup_email_safe(db, application_id)
+            async with sessions() as db:
+                # Worker died mid-send; Gmail may already have the message
+                email = await db.get(OutboundEmail, first['outbox_id'])
+                email.status = OutboxStatus.SENDING
+                email.next_attempt_at = datetime.now() - timedelta(seconds=settings.OUTBOX_SENDING_LEASE_SECONDS + 1)
+                await db.commit()
+            await outbox.run_once()
+
+            async with sessions() as db:
+                again = await service.send_followup_email_safe(db, application_id)
+            await outbox.run_once()
+
+        assert again['duplicate'] and again['outbox_status'] == 'FAILED'
+        sender.assert_not_awaited()
+        assert outbox.stats['requeued'] == 0
+        assert (await load(sessions, first['outbox_id'])).status == OutboxStatus.FAILED
@@ -6,7 +6,8 @@ Tests the Tier 1 critical email classification and parsing functionality
 import pytest
 import base64
 from datetime import datetime
-from unittest.mock import Mock, MagicMock, patch
+from unittest.mock import Mock, MagicMock, AsyncMock, patch
+from backend.core.config import settings
 from backend.services.email_service import EmailAutomationService
 from backend.models.models import ResponseType
 
@@ -430,3 +431,427 @@ def mock_db_session():
 # Test configuration
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--tb=short"])
+
+
+class TestBatchFetch:
+    """Messages are fetched with Gmail batch requests against a local fake endpoint"""
+
+    def setup_method(self):
+        import httplib2
+        from tests.fake_gmail import FakeGmail, make_message
+
+        self.fake = FakeGmail([make_message(f"m{i:03d}") for i in range(250)]).__enter__()
+        self.endpoint = patch('backend.services.email_service.settings.GMAIL_API_ENDPOINT', self.fake.url)
+        self.endpoint.start()
+        with patch('backend.services.email_service.build'):
+            with patch('backend.services.email_service.Credentials'):
+                self.service = EmailAutomationService()
+        self.service.service = self.service._build_service(http=httplib2.Http())
+
+    def teardown_method(self):
+        self.service.transport.shutdown()
+        self.endpoint.stop()
+        self.fake.__exit__(None, None, None)
+
+    @pytest.mark.asyncio
+    async def test_batches_hold_at_most_100_messages(self):
+        ids = [f"m{i:03d}" for i in range(250)]
+
+        fetched, errors = await self.service._fetch_messages(ids)
+
+        assert sorted(fetched) == ids and errors == {}
+        assert self.fake.calls['batch'] == 3 and self.fake.calls['get'] == 0
+        assert sorted(self.fake.batch_sizes) == [50, 100, 100]
+        assert fetched['m042']['payload']['headers'][2]['value'] == 'Interview invitation'
+
+    @pytest.mark.asyncio
+    async def test_missing_message_is_a_per_item_error(self):
+        fetched, errors = await self.service._fetch_messages(['m001', 'gone', 'm002'])
+
+        assert set(fetched) == {'m001', 'm002'}
+        assert set(errors) == {'gone'} and '404' in errors['gone']
+        assert self.fake.calls['batch'] == 1
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_items_are_retried(self):
+        self.fake.failures['m007'] = [429]
+
+        with patch('backend.services.email_service.settings.GMAIL_RETRY_BACKOFF', 0):
+            fetched, errors = await self.service._fetch_messages(['m006', 'm007'])
+
+        assert set(fetched) == {'m006', 'm007'} and errors == {}
+        assert self.fake.batch_sizes == [2, 1]
+
+    @pytest.mark.asyncio
+    async def test_scan_uses_list_plus_batches(self, mock_async_db_session):
+        none_result = MagicMock()
+        none_result.scalar_one_or_none.return_value = None
+        mock_async_db_session.execute.return_value = none_result
+        mock_async_db_session.get = AsyncMock(return_value=None)  # no sync checkpoint yet
+
+        summary = await self.service.scan_for_job_responses(mock_async_db_session)
+
+        assert summary['emails_processed'] == 250
+        # Headers then bodies: three metadata batches and three full batches
+        assert self.fake.calls == {'profile': 1, 'list': 3, 'batch': 6}
+        assert self.fake.formats == {'metadata': 250, 'full': 250}
+        assert summary['results'][0]['classification'] == ResponseType.INTERVIEW.value
+
+
+class TestTwoPhaseFetch:
+    """Only messages whose headers look like recruiting mail are downloaded in full"""
+
+    def setup_method(self):
+        import httplib2
+        from tests.fake_gmail import FakeGmail, make_message
+
+        messages = (
+            [make_message(f"job{i}", subject='Interview invitation') for i in range(3)]
+            + [make_message(f"news{i}", subject='New roles picked for you', sender='alerts@jobboard.com',
+                            bulk=True) for i in range(4)]
+            + [make_message(f"promo{i}", subject='Spring sale', sender='deals@shop.com',
+                            labels=['INBOX', 'CATEGORY_PROMOTIONS']) for i in range(2)]
+            + [make_message('ats', subject='Update', sender='acme@myworkday.com', bulk=True)]
+        )
+        self.fake = FakeGmail(messages).__enter__()
+        self.endpoint = patch('backend.services.email_service.settings.GMAIL_API_ENDPOINT', self.fake.url)
+        self.endpoint.start()
+        with patch('backend.services.email_service.build'):
+            with patch('backend.services.email_service.Credentials'):
+                self.service = EmailAutomationService()
+        self.service.service = self.service._build_service(http=httplib2.Http())
+
+    def teardown_method(self):
+        self.service.transport.shutdown()
+        self.endpoint.stop()
+        self.fake.__exit__(None, None, None)
+
+    @pytest.mark.asyncio
+    async def test_bulk_mail_is_recorded_from_headers_only(self, mock_async_db_session):
+        none_result = MagicMock()
+        none_result.scalar_one_or_none.return_value = None
+        mock_async_db_session.execute.return_value = none_result
+        mock_async_db_session.get = AsyncMock(return_value=None)
+
+        summary = await self.service.scan_for_job_responses(mock_async_db_session)
+
+        assert self.fake.formats == {'metadata': 10, 'full': 4}
+        assert summary['emails_processed'] == 4
+        assert summary['fetch']['skipped_by_prefilter'] == 6
+        assert summary['fetch']['skipped_bytes_estimate'] > 0
+        # Skipped messages are still tracked, so the next scan doesn't fetch them again
+        from backend.models.models import EmailTracking
+        added = [call.args[0] for call in mock_async_db_session.add.call_args_list]
+        tracked = [obj for obj in added if isinstance(obj, EmailTracking)]
+        assert len(tracked) == 10
+        assert {t.classification for t in tracked if t.gmail_id.startswith('news')} == {ResponseType.OTHER}
+
+    @pytest.mark.asyncio
+    async def test_fetched_messages_are_archived_raw(self, mock_async_db_session):
+        from backend.models.models import RawMessage
+        none_result = MagicMock()
+        none_result.scalar_one_or_none.return_value = None
+        mock_async_db_session.execute.return_value = none_result
+        mock_async_db_session.get = AsyncMock(return_value=None)
+
+        await self.service.scan_for_job_responses(mock_async_db_session)
+
+        added = [call.args[0] for call in mock_async_db_session.add.call_args_list]
+        raw = {obj.gmail_id: obj.format for obj in added if isinstance(obj, RawMessage)}
+        assert len(raw) == 10
+        assert raw['job0'] == 'full' and raw['news0'] == 'metadata'
+
+    @pytest.mark.asyncio
+    async def test_single_phase_mode_fetches_everything_in_full(self, mock_async_db_session):
+        none_result = MagicMock()
+        none_result.scalar_one_or_none.return_value = None
+        mock_async_db_session.execute.return_value = none_result
+        mock_async_db_session.get = AsyncMock(return_value=None)
+
+        with patch('backend.services.email_service.settings.GMAIL_TWO_PHASE_FETCH', False):
+            summary = await self.service.scan_for_job_responses(mock_async_db_session)
+
+        assert self.fake.formats == {'full': 10}
+        assert summary['fetch']['full_requests'] == 10 and summary['fetch']['metadata_requests'] == 0
+
+
+class TestScanPipeline:
+    """The scan follows every list page and commits in chunks"""
+
+    def setup_method(self):
+        import httplib2
+        from tests.fake_gmail import FakeGmail, make_message
+
+        self.fake = FakeGmail([make_message(f"m{i:04d}") for i in range(650)]).__enter__()
+        self.patches = [
+            patch('backend.services.email_service.settings.GMAIL_API_ENDPOINT', self.fake.url),
+            patch('backend.services.email_service.settings.GMAIL_COMMIT_CHUNK', 250),
+            patch('backend.services.email_service.settings.GMAIL_SCAN_RESULTS_LIMIT', 10),
+        ]
+        for p in self.patches:
+            p.start()
+        with patch('backend.services.email_service.build'):
+            with patch('backend.services.email_service.Credentials'):
+                self.service = EmailAutomationService()
+        self.service.service = self.service._build_service(http=httplib2.Http())
+
+    def teardown_method(self):
+        self.service.transport.shutdown()
+        for p in self.patches:
+            p.stop()
+        self.fake.__exit__(None, None, None)
+
+    def _db(self, session):
+        none_result = MagicMock()
+        none_result.scalar_one_or_none.return_value = None
+        session.execute.return_value = none_result
+        session.get = AsyncMock(return_value=None)
+        return session
+
+    @pytest.mark.asyncio
+    async def test_every_page_is_processed_with_chunked_commits(self, mock_async_db_session):
+        db = self._db(mock_async_db_session)
+
+        summary = await self.service.scan_for_job_responses(db)
+
+        assert summary['emails_listed'] == summary['emails_processed'] == 650
+        assert self.fake.calls['list'] == 7
+        assert len(summary['results']) == 10
+        assert summary['by_classification'] == {ResponseType.INTERVIEW.value: 650}
+        # Two full chunks of 250, then the final commit with the checkpoint
+        assert db.commit.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_processed_messages_are_not_fetched_again(self, mock_async_db_session):
+        db = self._db(mock_async_db_session)
+        stored = MagicMock()
+        stored.scalars.return_value.all.return_value = list(self.fake.messages)  # everything already tracked
+        db.execute.return_value = stored
+
+        summary = await self.service.scan_for_job_responses(db)
+
+        assert summary['already_processed'] == 650 and summary['emails_processed'] == 0
+        assert self.fake.calls['batch'] == 0
+        assert db.execute.await_count == 7  # one IN query per list page
+
+    @pytest.mark.asyncio
+    async def test_unseen_ids_come_from_one_in_query(self):
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+        from backend.core.database import Base
+        from backend.models.models import EmailTracking
+
+        engine = create_async_engine('sqlite+aiosqlite:///:memory:')
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with async_sessionmaker(engine)() as db:
+            db.add_all([EmailTracking(gmail_id='a'), EmailTracking(gmail_id='b')])
+            await db.commit()
+
+            queued = {'d'}
+            unseen = await self.service._unseen_message_ids(db, ['a', 'c', 'c', 'd', 'b', 'e'], queued)
+
+        await engine.dispose()
+        assert unseen == ['c', 'e']
+        assert queued == {'c', 'd', 'e'}
+
+    @pytest.mark.asyncio
+    async def test_listing_failure_stops_scan_without_checkpoint(self, mock_async_db_session):
+        db = self._db(mock_async_db_session)
+        self.fake.list_failures = {100: 403}  # second page fails
+
+        with patch('backend.services.email_service.system_state') as store:
+            store.get = AsyncMock(return_value=None)
+            store.set = AsyncMock()
+            summary = await self.service.scan_for_job_responses(db)
+
+        assert summary['sync_mode'] is None
+        store.set.assert_not_awaited()
+
+
+class TestThreadRollup:
+    """A thread is classified once from its newest messages and updates its application once"""
+
+    INTERVIEW = 'We would like to schedule an interview. Please share your availability for a Zoom call.'
+    REJECTION = ('Unfortunately we have decided to pursue other candidates and are not moving forward. '
+                 'Best of luck in your search.')
+
+    def setup_method(self):
+        import httplib2
+        from tests.fake_gmail import FakeGmail, make_message
+
+        def reply(message_id, body, day, thread='t1'):
+            return make_message(message_id, subject='Re: Analyst role', body=body, thread_id=thread,
+                                date=f'Mon, {day} Oct 2025 10:00:00 +0000')
+
+        # Newest first, as messages.list returns them
+        self.fake = FakeGmail([
+            reply('m5', 'Thanks for letting me know!', 17),
+            reply('m4', self.REJECTION, 16),
+            reply('m3', self.INTERVIEW, 15),
+            reply('m2', self.INTERVIEW, 14),
+            reply('m1', self.INTERVIEW, 13),
+            reply('solo', self.INTERVIEW, 13, thread='t2'),
+        ]).__enter__()
+        self.endpoint = patch('backend.services.email_service.settings.GMAIL_API_ENDPOINT', self.fake.url)
+        self.endpoint.start()
+        with patch('backend.services.email_service.build'):
+            with patch('backend.services.email_service.Credentials'):
+                self.service = EmailAutomationService()
+        self.service.service = self.service._build_service(http=httplib2.Http())
+
+    def teardown_method(self):
+        self.service.transport.shutdown()
+        self.endpoint.stop()
+        self.fake.__exit__(None, None, None)
+
+    @pytest.mark.asyncio
+    async def test_thread_is_classified_from_newest_messages_and_rolled_up_once(self, mock_async_db_session):
+        from backend.models.models import Application, EmailTracking
+        application = Mock(id=7)
+        db = mock_async_db_session
+        db.execute.return_value = MagicMock()
+        db.get = AsyncMock(side_effect=lambda model, key: application if model is Application else None)
+
+        with patch.object(self.service, '_match_to_application', AsyncMock(return_value=application)), \
+                patch.object(self.service, '_update_application_status', AsyncMock()) as update, \
+                patch.object(self.service, '_classify_batch', wraps=self.service._classify_batch) as classify:
+            summary = await self.service.scan_for_job_responses(db)
+
+        # Newest three of t1 plus t2's only message, in one call
+        assert [len(call.args[0]) for call in classify.call_args_list] == [4]
+        assert summary['threads'] == 2
+        tracked = {obj.gmail_id: obj.classification for obj in
+                   (call.args[0] for call in db.add.call_args_list) if isinstance(obj, EmailTracking)}
+        assert {tracked[f'm{i}'] for i in range(1, 6)} == {ResponseType.REJECTION}
+        assert tracked['solo'] == ResponseType.INTERVIEW
+
+        # Once per thread, older thread first, each with its newest message
+        assert summary['application_updates'] == update.await_count == 2
+        (_, _, first, first_email), (_, _, last, last_email) = [call.args for call in update.await_args_list]
+        assert (first['type'], first_email['gmail_id']) == (ResponseType.INTERVIEW, 'solo')
+        assert (last['type'], last_email['gmail_id']) == (ResponseType.REJECTION, 'm5')
+
+
+class TestIncrementalSync:
+    """Scans resume from the stored Gmail history ID instead of re-listing 30 days"""
+
+    def setup_method(self):
+        import httplib2
+        from tests.fake_gmail import FakeGmail, make_message
+
+        self.make_message = make_message
+        self.fake = FakeGmail([make_message(f"old{i}") for i in range(5)]).__enter__()
+        self.endpoint = patch('backend.services.email_service.settings.GMAIL_API_ENDPOINT', self.fake.url)
+        self.endpoint.start()
+        with patch('backend.services.email_service.build'):
+            with patch('backend.services.email_service.Credentials'):
+                self.service = EmailAutomationService()
+        self.service.service = self.service._build_service(http=httplib2.Http())
+
+        # In-memory stand-in for the system_state table
+        self.state = {}
+        store = MagicMock()
+
+        async def get(db, key, default=None):
+            return self.state.get(key, default)
+
+        async def set_(db, key, value):
+            self.state[key] = value
+
+        store.get, store.set = get, set_
+        self.store = patch('backend.services.email_service.system_state', store)
+        self.store.start()
+
+    def teardown_method(self):
+        self.service.transport.shutdown()
+        self.store.stop()
+        self.endpoint.stop()
+        self.fake.__exit__(None, None, None)
+
+    async def _scan(self, db, **kwargs):
+        none_result = MagicMock()
+        none_result.scalar_one_or_none.return_value = None
+        db.execute.return_value = none_result
+        self.fake.calls.clear()
+        return await self.service.scan_for_job_responses(db, **kwargs)
+
+    @pytest.mark.asyncio
+    async def test_first_scan_is_full_and_stores_checkpoint(self, mock_async_db_session):
+        summary = await self._scan(mock_async_db_session)
+
+        assert summary['emails_processed'] == 5
+        assert summary['sync_mode'] == 'full'
+        assert self.state['gmail_sync']['history_id'] == '100'
+
+    @pytest.mark.asyncio
+    async def test_quiet_inbox_costs_one_history_call(self, mock_async_db_session):
+        await self._scan(mock_async_db_session)
+
+        summary = await self._scan(mock_async_db_session)
+
+        assert summary['emails_processed'] == 0
+        assert summary['sync_mode'] == 'incremental'
+        assert self.fake.calls == {'history': 1}
+
+    @pytest.mark.asyncio
+    async def test_only_new_messages_are_fetched(self, mock_async_db_session):
+        await self._scan(mock_async_db_session)
+        for i in range(3):
+            self.fake.deliver(self.make_message(f"new{i}"))
+
+        summary = await self._scan(mock_async_db_session)
+
+        assert summary['emails_processed'] == 3
+        assert self.fake.batch_sizes[-1] == 3
+        assert self.fake.calls['history'] == 2  # 3 records at 2 per page
+        assert self.state['gmail_sync']['history_id'] == '103'
+
+    @pytest.mark.asyncio
+    async def test_expired_checkpoint_falls_back_to_full_scan(self, mock_async_db_session):
+        await self._scan(mock_async_db_session)
+        self.fake.deliver(self.make_message('new0'))
+        self.fake.expire_history()
+        self.state['gmail_sync']['history_id'] = '50'
+
+        summary = await self._scan(mock_async_db_session)
+
+        assert summary['sync_mode'] == 'full'
+        assert summary['emails_processed'] == 6
+        assert self.state['gmail_sync']['history_id'] == '101'
+
+    @pytest.mark.asyncio
+    async def test_failed_message_is_fetched_by_next_scan(self, mock_async_db_session):
+        await self._scan(mock_async_db_session)
+        self.fake.deliver(self.make_message('new0'))
+        self.fake.deliver(self.make_message('new1'))
+        self.fake.failures['new1'] = [403]
+
+        summary = await self._scan(mock_async_db_session)
+
+        assert summary['emails_processed'] == 1
+        assert summary['fetch_errors'] == 1
+        assert self.state['gmail_sync']['history_id'] == '102'
+        assert self.state['gmail_sync']['retry'] == {'new1': 1}
+
+        # No new history, but the failed message is fetched again
+        summary = await self._scan(mock_async_db_session)
+
+        assert summary['retried'] == 1
+        assert summary['emails_processed'] == 1
+        assert summary['results'][0]['subject'] == 'Interview invitation'
+        assert self.state['gmail_sync']['retry'] == {}
+
+    @pytest.mark.asyncio
+    async def test_message_failing_every_scan_is_given_up(self, mock_async_db_session):
+        await self._scan(mock_async_db_session)
+        self.fake.deliver(self.make_message('bad'))
+        self.fake.failures['bad'] = [403] * 10
+
+        for _ in range(settings.GMAIL_FAILED_MESSAGE_RETRIES):
+            summary = await self._scan(mock_async_db_session)
+            assert summary['retry_pending'] == 1
+
+        summary = await self._scan(mock_async_db_session)
+
+        assert summary['retried'] == 1 and summary['retry_pending'] == 0
+        assert self.state['gmail_sync']['retry'] == {}
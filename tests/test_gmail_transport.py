@@ -0,0 +1,71 @@
+"""
+Test suite for the thread-pool Gmail transport
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.services.gmail_transport import GmailTransport
+
+
+class TestGmailTransport:
+    """Blocking Gmail calls run on pool threads, each with its own client"""
+
+    def setup_method(self):
+        self.built = []
+        self.transport = GmailTransport(self._factory, max_concurrency=2)
+
+    def teardown_method(self):
+        self.transport.shutdown()
+
+    def _factory(self):
+        client = {'thread': threading.current_thread().name}
+        self.built.append(client)
+        return client
+
+    @pytest.mark.asyncio
+    async def test_calls_run_on_pool_threads_with_one_client_each(self):
+        def work(service):
+            time.sleep(0.02)
+            return service['thread']
+
+        threads = await asyncio.gather(*[self.transport.call(work) for _ in range(8)])
+
+        assert all(name.startswith('gmail') for name in threads)
+        assert threading.current_thread().name not in threads
+        assert len(self.built) == len(set(threads)) <= 2
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        await asyncio.gather(*[self.transport.call(lambda s: time.sleep(0.02)) for _ in range(6)])
+
+        assert self.transport.get_stats()['peak_in_flight'] == 2
+        assert self.transport.get_stats()['calls'] == 6
+
+    @pytest.mark.asyncio
+    async def test_event_loop_stays_responsive_during_blocking_call(self):
+        gaps = []
+
+        async def ticker():
+            last = time.perf_counter()
+            for _ in range(15):
+                await asyncio.sleep(0.01)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        await asyncio.gather(self.transport.call(lambda s: time.sleep(0.2)), ticker())
+
+        assert max(gaps) < 0.1
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_and_are_counted(self):
+        def fail(service):
+            raise ValueError('boom')
+
+        with pytest.raises(ValueError):
+            await self.transport.call(fail)
+        assert self.transport.get_stats()['failed'] == 1
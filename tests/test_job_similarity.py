@@ -0,0 +1,92 @@
+"""
+Test suite for the MinHash/LSH job similarity index
+"""
+
+import pytest
+
+from backend.services.job_similarity import JobSimilarityIndex, shingles
+
+
+POSTING = """Senior Data Analyst - Remote. We are looking for an analyst to build
+Tableau dashboards, write SQL against our claims warehouse and partner with
+finance and operations on monthly reporting. Requirements: 3+ years of SQL,
+Python for data cleaning, experience with healthcare claims data, strong
+communication skills and a bachelor's degree in a quantitative field."""
+
+# Same posting as re-listed on another board
+REPOSTED = POSTING.replace("Senior Data Analyst - Remote.", "Sr. Data Analyst (Remote) | Apply on Indeed.")
+
+UNRELATED = """Line cook needed for a busy downtown restaurant. Prepare sauces,
+manage the grill station during dinner service, keep the kitchen clean and
+follow food safety procedures. Weekend availability required."""
+
+
+class TestJobSimilarityIndex:
+    """Near-duplicates must collide in LSH buckets and unrelated jobs must not"""
+
+    def setup_method(self):
+        self.index = JobSimilarityIndex(num_perm=128, bands=32)
+
+    def test_shingles_are_word_trigrams(self):
+        assert shingles('Build SQL dashboards daily') == {'build sql dashboards', 'sql dashboards daily'}
+        assert shingles('SQL') == {'sql'}
+        assert shingles('  ') == set()
+
+    def test_signature_is_deterministic_across_instances(self):
+        other = JobSimilarityIndex(num_perm=128, bands=32)
+
+        assert (self.index.signature(POSTING) == other.signature(POSTING)).all()
+        assert self.index.signature('') is None
+
+    def test_similarity_estimates_jaccard(self):
+        a, b = shingles(POSTING), shingles(REPOSTED)
+        jaccard = len(a & b) / len(a | b)
+
+        estimate = self.index.similarity(self.index.signature(POSTING), self.index.signature(REPOSTED))
+
+        assert abs(estimate - jaccard) < 0.15
+        assert self.index.similarity(self.index.signature(POSTING), self.index.signature(UNRELATED)) < 0.1
+
+    def test_query_finds_near_duplicate_and_skips_self(self):
+        self.index.add(1, self.index.signature(POSTING))
+        self.index.add(2, self.index.signature(UNRELATED))
+
+        matches = self.index.query(self.index.signature(REPOSTED), min_similarity=0.5)
+        assert [job_id for job_id, _ in matches] == [1]
+
+        assert self.index.query(self.index.signature_of(1), min_similarity=0.5, exclude=1) == []
+
+    def test_find_duplicate_uses_threshold(self):
+        self.index.add(1, self.index.signature(POSTING))
+
+        job_id, similarity = self.index.find_duplicate(self.index.signature(POSTING))
+
+        assert job_id == 1 and similarity == 1.0
+        assert self.index.find_duplicate(self.index.signature(UNRELATED)) is None
+
+    def test_remove_clears_buckets(self):
+        self.index.add(1, self.index.signature(POSTING))
+        self.index.remove(1)
+
+        assert self.index.candidates(self.index.signature(POSTING)) == set()
+        assert self.index.get_stats()['buckets'] == 0
+
+    def test_encode_round_trip_and_length_check(self):
+        signature = self.index.signature(POSTING)
+
+        assert (self.index.decode(self.index.encode(signature)) == signature).all()
+        assert JobSimilarityIndex(num_perm=64, bands=16).decode(self.index.encode(signature)) is None
+
+    def test_bands_must_divide_permutations(self):
+        with pytest.raises(ValueError):
+            JobSimilarityIndex(num_perm=128, bands=30)
+
+    def test_arrays_are_built_on_first_use(self):
+        assert self.index._matrix is None
+        self.index.remove(1)
+        assert self.index.query(None) == [] and self.index.get_stats()['jobs_indexed'] == 0
+
+        self.index.add(1, self.index.signature(POSTING))
+
+        assert self.index._matrix is not None
+        assert self.index.query(self.index.signature(POSTING))[0][0] == 1
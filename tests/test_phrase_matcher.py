@@ -0,0 +1,66 @@
+"""
+Test suite for the shared phrase matcher
+Results must match the `kw in text` scans it replaces
+"""
+
+import random
+
+from backend.core.phrase_matcher import PhraseMatcher, PhraseMatch
+
+
+class TestPhraseMatcher:
+    """Test single-pass dictionary matching"""
+
+    def test_overlapping_phrases_are_all_reported(self):
+        matcher = PhraseMatcher(['java', 'javascript', 'script'])
+
+        assert matcher.matched('We use JavaScript daily') == {'java', 'javascript', 'script'}
+
+    def test_find_all_returns_offsets(self):
+        matcher = PhraseMatcher(['sql', 'power bi'])
+
+        hits = matcher.find_all('SQL and Power BI, then more sql')
+
+        assert hits == [
+            PhraseMatch(0, 3, 'sql'),
+            PhraseMatch(8, 16, 'power bi'),
+            PhraseMatch(28, 31, 'sql')
+        ]
+
+    def test_labels_keep_original_case(self):
+        matcher = PhraseMatcher(['Node.js', 'C++'])
+
+        assert matcher.labels('experience with node.js and c++') == {'Node.js', 'C++'}
+
+    def test_count_by_label_counts_distinct_phrases(self):
+        matcher = PhraseMatcher.from_groups({
+            'offer': ['offer', 'pleased to offer', 'salary'],
+            'interview': ['interview']
+        })
+
+        counts = matcher.count_by_label('We are pleased to offer you... offer letter attached')
+
+        assert counts['offer'] == 2
+        assert counts['interview'] == 0
+
+    def test_empty_matcher_matches_nothing(self):
+        matcher = PhraseMatcher()
+
+        assert matcher.contains_any('anything') is False
+        assert matcher.find_all('anything') == []
+
+    def test_agrees_with_substring_scan(self):
+        rng = random.Random(7)
+        alphabet = 'ab c.+'
+
+        for _ in range(200):
+            phrases = [
+                ''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 5)))
+                for _ in range(rng.randint(1, 12))
+            ]
+            text = ''.join(rng.choice(alphabet + 'AB') for _ in range(rng.randint(0, 50)))
+            matcher = PhraseMatcher(phrases)
+
+            expected = {p.lower() for p in phrases if p.lower() in text.lower()}
+            assert matcher.matched(text) == expected
+            assert matcher.contains_any(text) == bool(expected)
@@ -0,0 +1,102 @@
+"""
+Test suite for the compressed raw-message store and offline reprocessing
+"""
+
+import pytest
+import pytest_asyncio
+from unittest.mock import patch
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from backend.core.database import Base
+from backend.models.models import EmailTracking, RawMessage, ResponseType
+from backend.services.email_service import EmailAutomationService
+from backend.services.raw_message_store import RawMessageStore, decode, encode
+from tests.fake_gmail import make_message, metadata_view
+
+
+@pytest_asyncio.fixture
+async def db():
+    engine = create_async_engine('sqlite+aiosqlite:///:memory:')
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+class TestRawMessageStore:
+    """Messages round-trip exactly and are only rewritten when they change"""
+
+    def test_encoding_is_lossless_and_compressed(self):
+        message = make_message('m1', body='We would like to schedule an interview. ' * 50)
+
+        content_hash, data, raw_size = encode(message)
+
+        assert decode(data) == message
+        assert len(data) < raw_size / 4
+        assert encode(dict(reversed(message.items())))[0] == content_hash
+
+    @pytest.mark.asyncio
+    async def test_put_and_iterate_in_batches(self, db):
+        store = RawMessageStore()
+        messages = [make_message(f"m{i}") for i in range(5)]
+
+        assert await store.put_many(db, [(m, True) for m in messages]) == 5
+        await db.commit()
+
+        batches = [batch async for batch in store.iter_batches(db, batch_size=2)]
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert [m for batch in batches for m, full in batch] == messages
+        assert await store.get(db, 'm3') == messages[3]
+
+    @pytest.mark.asyncio
+    async def test_unchanged_and_headers_only_copies_are_skipped(self, db):
+        store = RawMessageStore()
+        full = make_message('m1')
+        await store.put_many(db, [(metadata_view(full, []), False)])
+        await db.commit()
+
+        assert await store.put_many(db, [(full, True)]) == 1
+        await db.commit()
+        assert await store.put_many(db, [(full, True)]) == 0
+        assert await store.put_many(db, [(metadata_view(full, []), False)]) == 0
+
+        row = await db.get(RawMessage, 'm1')
+        assert row.format == 'full'
+        stats = await store.get_stats(db)
+        assert stats['messages'] == stats['full'] == 1
+
+
+class TestReprocess:
+    """Stored messages are reclassified and rematched without Gmail"""
+
+    def setup_method(self):
+        with patch('backend.services.email_service.build'):
+            with patch('backend.services.email_service.Credentials'):
+                self.service = EmailAutomationService()
+
+    def teardown_method(self):
+        self.service.transport.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_reprocess_updates_tracking_rows(self, db):
+        store = RawMessageStore()
+        long_body = 'We would like to schedule an interview. Please share your availability. ' + 'x' * 6000
+        interview = make_message('m1', body=long_body)
+        bulk = make_message('m2', subject='Interview tips newsletter', sender='news@site.com', bulk=True)
+        await store.put_many(db, [(interview, True), (metadata_view(bulk, []), False)])
+        db.add(EmailTracking(gmail_id='m1', body='truncated', classification=ResponseType.OTHER))
+        await db.commit()
+
+        with patch.object(self.service, '_fetch_messages') as fetch:
+            summary = await self.service.reprocess_stored(db)
+
+        fetch.assert_not_called()
+        assert summary['messages'] == 2
+        assert summary['reprocessed'] == summary['reclassified'] == 1
+        assert summary['needs_full_fetch'] == 0
+        row = (await db.execute(select(EmailTracking).where(EmailTracking.gmail_id == 'm1'))).scalar_one()
+        assert row.classification == ResponseType.INTERVIEW
+        assert row.action_required is True
+        assert len(row.body) == 5000